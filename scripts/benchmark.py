@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks for AutoBlog
+
+Three benchmarks, all over synthetic data in throwaway directories.
+Nothing is pushed and the real repo and index are never touched.
+
+- Pipeline: runs the full backfill pipeline (index update, context, four
+  generation passes, save), usually with the FakeLLMBackend, and reports
+  throughput and latency by stage.
+- Scaling: times the transcript-handling operations (session discovery,
+  index update, context building, sync and sanitization) at several corpus
+  sizes and in both transcript layouts, with peak Python memory for each.
+- Index formats: file size and load and save time of the project index in
+  each snapshot format (see index_format.py) at several index sizes.
+"""
+
+import contextlib
+import gc
+import io
+import logging
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from llm_backend import LLMBackend
+from run_metrics import percentile
+from synthetic_corpus import LAYOUTS, generate_corpus, generate_index, generate_sessions
+
+DEFAULT_SCALES = (100, 1000, 10000)
+
+SCALING_OPERATIONS = ("find_all_sessions", "update_index", "get_context_for_blog",
+                      "sync_transcripts", "sanitize_directory")
+
+DEFAULT_INDEX_SCALES = (1000, 10000, 100000)
+
+
+@dataclass
+class BenchResult:
+    """Outcome of one pipeline benchmark."""
+    backend: str
+    dates: int
+    sessions: int
+    workers: int
+    posts: int
+    failed_dates: List[str]
+    wall: float
+    posts_per_hour: float
+    llm_calls: int
+    stages: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    llm: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def run_pipeline_bench(backend: LLMBackend, days: int = 7, projects: int = 3,
+                       sessions_per_day: int = 2, turns: int = 20, workers: int = 1,
+                       skip_summaries: bool = False,
+                       llm_calls_per_minute: Optional[float] = None,
+                       seed: int = 0, work_dir: Optional[Path] = None) -> BenchResult:
+    """
+    Generate a synthetic corpus and backfill a post for every day of it.
+
+    Args:
+        backend: LLM backend for summaries and generation passes
+        days, projects, sessions_per_day, turns: Corpus shape (see generate_corpus)
+        workers: Dates generated concurrently
+        skip_summaries: Skip per-day summaries
+        llm_calls_per_minute: Optional shared rate limit
+        seed: Corpus seed
+        work_dir: Where to build the corpus and repo (default: a temp dir)
+
+    Returns:
+        BenchResult with throughput and per-stage / per-pass latencies
+    """
+    # Imported here so importing this module doesn't import the whole CLI
+    from daily_blog import DailyBlogRunner
+
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="autoblog-bench-")))
+        work_dir = Path(work_dir)
+
+        corpus = generate_corpus(work_dir / "transcript", days=days, projects=projects,
+                                 sessions_per_day=sessions_per_day, turns=turns, seed=seed)
+        repo_dir = work_dir / "repo"
+        (repo_dir / "scripts" / "data").mkdir(parents=True, exist_ok=True)
+
+        runner = DailyBlogRunner(repo_dir=repo_dir, llm_calls_per_minute=llm_calls_per_minute,
+                                 llm_backend=backend)
+        runner.memory.transcript_dir = corpus.root
+
+        # Keep the per-pass progress output out of the report
+        previous_level = runner.logger.level
+        runner.logger.setLevel(logging.WARNING)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = runner.run_backfill(corpus.dates, skip_push=True,
+                                              skip_summaries=skip_summaries, workers=workers)
+        finally:
+            runner.logger.setLevel(previous_level)
+
+        record = runner.history.load(command="backfill")[-1]
+
+    posts = record["counters"].get("posts_saved", 0)
+    wall = record["wall"]
+
+    llm: Dict[str, Dict[str, Any]] = {}
+    by_label: Dict[str, List[float]] = {}
+    for call in record["llm"]["calls"]:
+        by_label.setdefault(call["label"], []).append(call["wall"])
+    for label, walls in by_label.items():
+        llm[label] = {"calls": len(walls), "p50": percentile(walls, 50),
+                      "p95": percentile(walls, 95)}
+
+    return BenchResult(
+        backend=backend.name,
+        dates=len(corpus.dates),
+        sessions=corpus.sessions,
+        workers=workers,
+        posts=posts,
+        failed_dates=[date for date, ok in results.items() if not ok],
+        wall=wall,
+        posts_per_hour=posts / wall * 3600 if wall > 0 else 0.0,
+        llm_calls=record["llm"]["total_calls"],
+        stages={name: {"wall": entry["wall"], "count": entry["count"]}
+                for name, entry in record["stages"].items()},
+        llm=llm,
+    )
+
+
+def format_bench_result(result: BenchResult) -> str:
+    """Human-readable report for the bench command."""
+    lines = [
+        "AutoBlog Pipeline Benchmark",
+        "=" * 40,
+        f"Backend: {result.backend}   Workers: {result.workers}",
+        f"Corpus: {result.dates} days, {result.sessions} sessions",
+        f"Posts: {result.posts} in {result.wall:.2f}s ({result.posts_per_hour:.0f} posts/hour)",
+        f"LLM calls: {result.llm_calls}",
+    ]
+    if result.failed_dates:
+        lines.append(f"Failed dates: {', '.join(result.failed_dates)}")
+
+    lines += ["", "Stage time (summed across workers)", "-" * 40]
+    for name, entry in result.stages.items():
+        lines.append(f"{name:<16} {entry['wall']:8.2f}s  (x{entry['count']})")
+
+    lines += ["", "LLM latency by pass", "-" * 40]
+    for label, entry in result.llm.items():
+        lines.append(f"{label:<16} p50 {entry['p50']:6.3f}s  p95 {entry['p95']:6.3f}s  "
+                     f"(n={entry['calls']})")
+    return "\n".join(lines)
+
+
+@dataclass
+class ScalingMeasurement:
+    """Time and memory of one operation on one corpus."""
+    operation: str
+    layout: str
+    sessions: int
+    corpus_bytes: int
+    wall: float
+    peak_bytes: Optional[int] = None
+    # Memory still held by the operation's result (e.g. the session list)
+    retained_bytes: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _measure(operation: Callable[[], Any], trace_memory: bool) -> tuple:
+    """
+    Run `operation` once.
+
+    Returns:
+        (wall seconds, peak traced bytes, bytes retained by the result);
+        the memory figures are None without tracing
+    """
+    gc.collect()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = operation()
+    wall = time.perf_counter() - start
+    if not trace_memory:
+        return wall, None, None
+    current, peak = tracemalloc.get_traced_memory()
+    del result
+    return wall, peak - baseline, current - baseline
+
+
+def run_scaling_bench(scales: Sequence[int] = DEFAULT_SCALES,
+                      layouts: Sequence[str] = LAYOUTS, projects: int = 10,
+                      turns: int = 20, secret_density: float = 0.01,
+                      trace_memory: bool = True, seed: int = 0,
+                      work_dir: Optional[Path] = None,
+                      progress: Optional[Callable[[ScalingMeasurement], None]] = None
+                      ) -> List[ScalingMeasurement]:
+    """
+    Time the transcript operations at several corpus sizes.
+
+    For each layout and scale a fresh corpus is generated, then measured in
+    order: find_all_sessions, update_index (without summaries, so no LLM
+    calls), get_context_for_blog for the last day, and sanitize_directory.
+    The local layout also measures sync_transcripts (copy, pre-process and
+    sanitize into a repo), as that is the only layout sync reads.
+
+    Peak and retained memory (what the result still holds, e.g. bytes per
+    session for find_all_sessions) come from tracemalloc, which slows
+    Python-heavy code down; pass trace_memory=False for timings without
+    that overhead.
+
+    Args:
+        scales: Approximate session counts
+        layouts: Transcript layouts to measure ("local", "repo")
+        projects, turns, secret_density, seed: Corpus shape (see generate_corpus)
+        trace_memory: Record peak Python memory per operation
+        work_dir: Where to build the corpora (default: a temp dir)
+        progress: Called with each measurement as it is taken
+
+    Returns:
+        One ScalingMeasurement per (layout, scale, operation)
+    """
+    # Imported here so importing this module doesn't import the whole CLI
+    from daily_blog import DailyBlogRunner
+    from project_memory import ProjectMemory
+    from sanitize_transcripts import sanitize_directory
+
+    measurements: List[ScalingMeasurement] = []
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="autoblog-scale-")))
+        work_dir = Path(work_dir)
+        if started_tracing:
+            tracemalloc.start()
+            stack.callback(tracemalloc.stop)
+
+        for layout in layouts:
+            for scale in scales:
+                base = work_dir / f"{layout}-{scale}"
+                corpus = generate_sessions(base / "transcript", scale, projects=projects,
+                                           turns=turns, turns_jitter=0.5,
+                                           secret_density=secret_density,
+                                           layout=layout, seed=seed)
+                memory = ProjectMemory(index_path=base / "index.json", transcript_dir=corpus.root)
+                operations = [
+                    ("find_all_sessions", memory.find_all_sessions),
+                    ("update_index", lambda: memory.update_index(use_claude_for_summaries=False)),
+                    ("get_context_for_blog", lambda: memory.get_context_for_blog(corpus.dates[-1])),
+                ]
+
+                if layout == "local":
+                    runner = DailyBlogRunner(repo_dir=base / "repo")
+                    runner.logger.setLevel(logging.WARNING)
+                    runner.transcript_source_dir = corpus.root
+                    # Sync keeps sessions newer than now - days; cover the whole corpus
+                    first = datetime.strptime(corpus.dates[0], '%Y-%m-%d')
+                    sync_days = (datetime.now() - first).days + 1
+                    operations.append(("sync_transcripts",
+                                       lambda: runner.sync_transcripts(days=sync_days)))
+
+                # Last, since it redacts the corpus in place
+                operations.append(("sanitize_directory",
+                                   lambda: sanitize_directory(corpus.root, dry_run=False)))
+
+                for name, operation in operations:
+                    wall, peak, retained = _measure(operation, trace_memory)
+                    measurement = ScalingMeasurement(
+                        operation=name, layout=layout, sessions=corpus.sessions,
+                        corpus_bytes=corpus.bytes_written, wall=wall, peak_bytes=peak,
+                        retained_bytes=retained,
+                    )
+                    measurements.append(measurement)
+                    if progress is not None:
+                        progress(measurement)
+
+    return measurements
+
+
+def format_scaling_results(measurements: List[ScalingMeasurement]) -> str:
+    """Human-readable table for the bench-scaling command."""
+    lines = [
+        "AutoBlog Scaling Benchmark",
+        "=" * 84,
+        f"{'operation':<22} {'layout':<6} {'sessions':>9} {'corpus MB':>10} "
+        f"{'wall s':>9} {'peak MB':>9} {'held B/sess':>12}",
+        "-" * 84,
+    ]
+    for m in measurements:
+        peak = f"{m.peak_bytes / 1e6:9.1f}" if m.peak_bytes is not None else f"{'-':>9}"
+        held = (f"{m.retained_bytes / m.sessions:12.0f}" if m.retained_bytes is not None
+                else f"{'-':>12}")
+        lines.append(f"{m.operation:<22} {m.layout:<6} {m.sessions:>9} "
+                     f"{m.corpus_bytes / 1e6:10.1f} {m.wall:9.3f} {peak} {held}")
+    return "\n".join(lines)
+
+
+@dataclass
+class IndexFormatMeasurement:
+    """Size and speed of one snapshot format at one index size."""
+    format: str
+    sessions: int
+    file_bytes: int
+    load: float
+    save: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def run_index_format_bench(scales: Sequence[int] = DEFAULT_INDEX_SCALES,
+                           formats: Optional[Sequence[str]] = None, projects: int = 10,
+                           repeat: int = 5, seed: int = 0, work_dir: Optional[Path] = None,
+                           progress: Optional[Callable[[IndexFormatMeasurement], None]] = None
+                           ) -> List[IndexFormatMeasurement]:
+    """
+    Time reading and writing the index snapshot in each format.
+
+    Load is read_index() (open, map or read, decode); save is a snapshot
+    write as compaction does it (encode, write, fsync, rename). Both are
+    the best of `repeat` runs.
+
+    Args:
+        scales: Approximate session counts (see synthetic_corpus.generate_index)
+        formats: Format names (default: every available one; msgpack needs msgpack)
+        projects, seed: Index shape
+        repeat: Best-of repeats per measurement
+        work_dir: Where to write the files (default: a temp dir)
+        progress: Called with each measurement as it is taken
+
+    Returns:
+        One IndexFormatMeasurement per (scale, format)
+    """
+    from index_format import FORMATS, MSGPACK_AVAILABLE, read_index
+    from index_store import IndexStore
+
+    suffixes = {name: suffix for suffix, name in FORMATS.items()}
+    if formats is None:
+        formats = [name for name in suffixes if name != "msgpack" or MSGPACK_AVAILABLE]
+
+    def best(operation: Callable[[], Any]) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            operation()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    measurements: List[IndexFormatMeasurement] = []
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="autoblog-index-")))
+        work_dir = Path(work_dir)
+
+        for scale in scales:
+            index = generate_index(scale, projects=projects, seed=seed)
+            sessions = sum(p["total_sessions"] for p in index["projects"].values())
+            for fmt in formats:
+                path = work_dir / f"index-{scale}{suffixes[fmt]}"
+                store = IndexStore(path)
+                save = best(lambda: store.compact(index))
+                load = best(lambda: read_index(path))
+                measurement = IndexFormatMeasurement(format=fmt, sessions=sessions,
+                                                     file_bytes=path.stat().st_size,
+                                                     load=load, save=save)
+                measurements.append(measurement)
+                if progress is not None:
+                    progress(measurement)
+
+    return measurements
+
+
+def format_index_format_results(measurements: List[IndexFormatMeasurement]) -> str:
+    """Human-readable table for the bench-index command, with load speedups over JSON."""
+    json_load = {m.sessions: m.load for m in measurements if m.format == "json"}
+    lines = [
+        "AutoBlog Index Format Benchmark",
+        "=" * 66,
+        f"{'format':<8} {'sessions':>9} {'file KB':>9} {'load ms':>9} {'save ms':>9} "
+        f"{'load vs json':>13}",
+        "-" * 66,
+    ]
+    for m in measurements:
+        baseline = json_load.get(m.sessions)
+        speedup = f"{baseline / m.load:12.2f}x" if baseline and m.load else f"{'-':>13}"
+        lines.append(f"{m.format:<8} {m.sessions:>9} {m.file_bytes / 1024:9.0f} "
+                     f"{m.load * 1000:9.2f} {m.save * 1000:9.2f} {speedup}")
+    return "\n".join(lines)
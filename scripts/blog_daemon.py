@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+AutoBlog Daemon
+
+Long-running alternative to the launchd one-shot. Holds a DailyBlogRunner
+(project index, generator, LLM clients) in memory and accepts jobs over a
+local Unix socket, so triggers don't pay the cold start and can't collide
+with each other.
+
+Protocol: one JSON object per line in each direction.
+    {"job": "generate", "args": {"date": "2026-01-14"}, "wait": true}
+    -> {"ok": true, "job": {"id": 3, "kind": "generate", "status": "done", ...}}
+
+Job kinds: sync, update, generate, backfill (queued) and ping, status, jobs,
+shutdown (answered immediately).
+
+Each job kind declares the resources it needs. Jobs sharing a resource are
+serialized; jobs with disjoint resources run in parallel, up to max_parallel.
+Only the most recent finished jobs are kept for the jobs request.
+"""
+
+import itertools
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+DEFAULT_SOCKET_PATH = Path.home() / ".autoblog.sock"
+
+# Resources each queued job kind holds while running
+JOB_RESOURCES = {
+    "sync": ["transcripts"],
+    "update": ["index"],
+    "generate": ["index", "llm"],
+    "backfill": ["index", "llm"],
+}
+
+# How many jobs may hold each resource at once
+DEFAULT_RESOURCE_LIMITS = {
+    "transcripts": 1,
+    "index": 1,
+    "llm": 1,
+}
+
+# Finished jobs (with their args and results) kept for the jobs request
+KEEP_FINISHED_JOBS = 50
+
+
+@dataclass
+class Job:
+    """A unit of work submitted to the daemon."""
+    id: int
+    kind: str
+    args: Dict[str, Any]
+    status: str = "queued"
+    result: Any = None
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "args": self.args,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class BlogDaemon:
+    """Job queue around a single in-memory DailyBlogRunner."""
+
+    def __init__(self, runner, max_parallel: int = 2,
+                 resource_limits: Optional[Dict[str, int]] = None,
+                 keep_finished: int = KEEP_FINISHED_JOBS):
+        self.runner = runner
+        self.keep_finished = keep_finished
+        self.logger = runner.logger
+        limits = dict(DEFAULT_RESOURCE_LIMITS, **(resource_limits or {}))
+        self._resources = {name: threading.Semaphore(n) for name, n in limits.items()}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_parallel))
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, Job] = {}
+        self._lock = threading.Lock()
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "sync": self._job_sync,
+            "update": self._job_update,
+            "generate": self._job_generate,
+            "backfill": self._job_backfill,
+        }
+
+    def _job_sync(self, args: Dict[str, Any]) -> bool:
+        return self.runner.sync_transcripts(days=int(args.get("days", 7)))
+
+    def _job_update(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        self.runner.memory.refresh_index()
+        return self.runner.memory.update_index(
+            use_claude_for_summaries=not args.get("skip_summaries", False)
+        )
+
+    def _job_generate(self, args: Dict[str, Any]) -> bool:
+        self.runner.memory.refresh_index()
+        return self.runner.run(
+            date=args.get("date"),
+            skip_push=args.get("skip_push", False),
+            skip_summaries=args.get("skip_summaries", False)
+        )
+
+    def _job_backfill(self, args: Dict[str, Any]) -> Dict[str, bool]:
+        if "dates" in args:
+            dates = list(args["dates"])
+        elif "start" in args:
+            start = datetime.strptime(args["start"], '%Y-%m-%d')
+            end = datetime.strptime(args.get("end", args["start"]), '%Y-%m-%d')
+            dates = [(start + timedelta(days=i)).strftime('%Y-%m-%d')
+                     for i in range((end - start).days + 1)]
+        else:
+            days = int(args.get("days", 7))
+            dates = [(datetime.now() - timedelta(days=d)).strftime('%Y-%m-%d')
+                     for d in range(days, 0, -1)]
+
+        self.runner.memory.refresh_index()
+        return self.runner.run_backfill(
+            dates,
+            skip_push=args.get("skip_push", False),
+            skip_summaries=args.get("skip_summaries", False),
+            workers=int(args.get("workers", 1))
+        )
+
+    def submit(self, kind: str, args: Optional[Dict[str, Any]] = None) -> Job:
+        """Queue a job. Raises ValueError for unknown job kinds."""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job: {kind}")
+
+        job = Job(id=next(self._ids), kind=kind, args=args or {})
+        with self._lock:
+            self._jobs[job.id] = job
+        self.logger.info(f"Queued job {job.id}: {kind} {job.args}")
+        self._executor.submit(self._execute, job)
+        return job
+
+    def _execute(self, job: Job) -> None:
+        # Acquire in a fixed order so jobs can never deadlock on each other
+        resources = sorted(JOB_RESOURCES.get(job.kind, []))
+        acquired = []
+        try:
+            for name in resources:
+                self._resources[name].acquire()
+                acquired.append(name)
+
+            job.status = "running"
+            job.started = time.time()
+            self.logger.info(f"Running job {job.id}: {job.kind}")
+            job.result = self._handlers[job.kind](job.args)
+            job.status = "done"
+        except Exception as e:
+            self.logger.error(f"Job {job.id} ({job.kind}) failed: {e}", exc_info=True)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            for name in reversed(acquired):
+                self._resources[name].release()
+            job.finished = time.time()
+            job.done.set()
+            self._prune_jobs()
+
+    def _prune_jobs(self) -> None:
+        """Forget all but the newest keep_finished finished jobs."""
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.done.is_set()]
+            for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+                del self._jobs[job_id]
+
+    def get_job(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle one decoded request and return the response object."""
+        kind = request.get("job")
+
+        if kind == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if kind == "status":
+            return {"ok": True, "status": self.runner.get_status()}
+        if kind == "jobs":
+            if "id" in request:
+                job = self.get_job(int(request["id"]))
+                if job is None:
+                    return {"ok": False, "error": f"No such job: {request['id']}"}
+                return {"ok": True, "job": job.to_dict()}
+            return {"ok": True, "jobs": self.list_jobs()}
+
+        try:
+            job = self.submit(kind, request.get("args"))
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+
+        if request.get("wait"):
+            job.done.wait(request.get("timeout"))
+        return {"ok": job.status != "failed", "job": job.to_dict()}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"ok": False, "error": f"Invalid request: {e}"}
+        else:
+            if request.get("job") == "shutdown":
+                response = {"ok": True}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                response = self.server.blog_daemon.handle_request(request)
+        self.wfile.write((json.dumps(response, default=str) + "\n").encode('utf-8'))
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server dispatching requests to a BlogDaemon."""
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, daemon: BlogDaemon):
+        self.socket_path = Path(socket_path)
+        self.blog_daemon = daemon
+        if self.socket_path.exists():
+            if is_daemon_running(self.socket_path):
+                raise RuntimeError(f"AutoBlog daemon already running on {self.socket_path}")
+            # Stale socket left behind by a crashed daemon
+            self.socket_path.unlink()
+        super().__init__(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def serve(runner, socket_path: Path = DEFAULT_SOCKET_PATH, max_parallel: int = 2,
+          resource_limits: Optional[Dict[str, int]] = None) -> None:
+    """Run the daemon until a shutdown request (or Ctrl-C)."""
+    daemon = BlogDaemon(runner, max_parallel=max_parallel, resource_limits=resource_limits)
+    server = DaemonServer(socket_path, daemon)
+    runner.logger.info(f"AutoBlog daemon listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.shutdown(wait=True)
+        runner.logger.info("AutoBlog daemon stopped")
+
+
+def send_request(request: Dict[str, Any], socket_path: Path = DEFAULT_SOCKET_PATH,
+                 timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Send one request to a running daemon and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall((json.dumps(request) + "\n").encode('utf-8'))
+        with sock.makefile('rb') as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("Daemon closed the connection without a response")
+    return json.loads(line)
+
+
+def is_daemon_running(socket_path: Path = DEFAULT_SOCKET_PATH) -> bool:
+    """Whether a daemon answers on the socket."""
+    if not Path(socket_path).exists():
+        return False
+    try:
+        return send_request({"job": "ping"}, socket_path, timeout=2).get("ok", False)
+    except (OSError, ValueError):
+        return False
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Lazy Transcript Content for AutoBlog
+
+A ContentHandle stands in for a transcript's text in the blog context: it
+knows where the text lives and how big it is, and reads it (or just its
+first N characters, or a byte range) only when asked. Prompt building reads
+no more than it keeps, so peak memory follows prompt size rather than
+transcript size.
+
+Handles serialize to a small JSON dict (path, archive member, size, mtime)
+so that pipeline fingerprints change when a transcript changes and stored
+contexts can be read again on a resumed run. Handles rebuilt for bundle
+members share a few open archives, so each read does not reopen (for
+.tar.zst, decompress) the whole bundle.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+# Bundles kept open for handles rebuilt from JSON
+ARCHIVE_CACHE_SIZE = 4
+
+_archives: "OrderedDict[Tuple[str, int, int], Any]" = OrderedDict()
+_archives_lock = threading.Lock()
+
+
+class ContentHandle:
+    """A transcript on disk or in a bundle, read on demand."""
+
+    __slots__ = ("path", "member", "size", "mtime_ns", "_reader", "_range_reader")
+
+    def __init__(self, path: str, size: int, reader: Callable[[Optional[int]], str],
+                 member: Optional[str] = None, mtime_ns: Optional[int] = None,
+                 range_reader: Optional[Callable[[int, int], bytes]] = None):
+        self.path = path
+        self.member = member
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._reader = reader
+        self._range_reader = range_reader
+
+    @classmethod
+    def for_file(cls, path: Path) -> Optional["ContentHandle"]:
+        """Handle for a transcript file, or None if it is missing or empty."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size == 0:
+            return None
+        return cls(str(path), st.st_size, lambda limit: _read_file(path, limit),
+                   mtime_ns=st.st_mtime_ns,
+                   range_reader=lambda start, length: _read_file_range(path, start, length))
+
+    @classmethod
+    def for_text(cls, text: str) -> "ContentHandle":
+        """Handle over text already in memory (e.g. a context built by hand)."""
+        data = text.encode('utf-8')
+        return cls("<text>", len(data), lambda limit: text if limit is None else text[:limit],
+                   range_reader=lambda start, length: data[start:start + length])
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "ContentHandle":
+        """Rebuild a handle from to_json() output (e.g. a stored pipeline context)."""
+        path, member = data["path"], data.get("member")
+        if member is None:
+            reader = lambda limit: _read_file(Path(path), limit)  # noqa: E731
+            range_reader = lambda start, length: _read_file_range(Path(path), start, length)  # noqa: E731
+        else:
+            reader = lambda limit: _read_member(Path(path), member, limit)  # noqa: E731
+            range_reader = lambda start, length: _read_member_range(Path(path), member, start, length)  # noqa: E731
+        return cls(path, data.get("size", 0), reader, member=member,
+                   mtime_ns=data.get("mtime_ns"), range_reader=range_reader)
+
+    def read(self, limit: Optional[int] = None) -> str:
+        """The text, or only its first `limit` characters (bytes for bundle members)."""
+        return self._reader(limit)
+
+    def read_at(self, start: int, length: int) -> str:
+        """
+        Up to `length` bytes from byte offset `start`, decoded as UTF-8.
+
+        Seeks instead of reading from the beginning when the handle has a
+        range reader. A character split at either end decodes as U+FFFD.
+        """
+        if self._range_reader is not None:
+            return self._range_reader(start, length).decode('utf-8', errors='replace')
+        data = self.read(start + length).encode('utf-8', errors='replace')
+        return data[start:start + length].decode('utf-8', errors='replace')
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"path": self.path, "member": self.member, "size": self.size,
+                "mtime_ns": self.mtime_ns}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, text: str) -> bool:
+        return text in self.read()
+
+    def __repr__(self) -> str:
+        where = f"{self.path}!{self.member}" if self.member else self.path
+        return f"ContentHandle({where!r}, size={self.size})"
+
+
+def _read_file(path: Path, limit: Optional[int]) -> str:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read(limit)
+    except OSError:
+        return ""
+
+
+def _read_file_range(path: Path, start: int, length: int) -> bytes:
+    try:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            return f.read(length)
+    except OSError:
+        return b""
+
+
+def _open_archive(archive_path: Path):
+    """
+    The bundle at `archive_path`, opened once and shared (least recently
+    used first out). A bundle rewritten on disk is opened again.
+    """
+    from transcript_archive import TranscriptArchive
+    st = os.stat(archive_path)
+    key = (str(archive_path), st.st_mtime_ns, st.st_size)
+    with _archives_lock:
+        archive = _archives.get(key)
+        if archive is not None:
+            _archives.move_to_end(key)
+            return archive
+    archive = TranscriptArchive(archive_path)
+    with _archives_lock:
+        # Another thread may have opened it meanwhile; either copy works
+        _archives[key] = archive
+        _archives.move_to_end(key)
+        while len(_archives) > ARCHIVE_CACHE_SIZE:
+            # Not closed here: a reader may still hold it. Its files close
+            # when the last reference goes away.
+            _archives.popitem(last=False)
+    return archive
+
+
+def _read_member(archive_path: Path, member: str, limit: Optional[int]) -> str:
+    try:
+        archive = _open_archive(archive_path)
+    except OSError:
+        return ""
+    return archive.read_text(member, limit) if member in archive else ""
+
+
+def _read_member_range(archive_path: Path, member: str, start: int, length: int) -> bytes:
+    try:
+        archive = _open_archive(archive_path)
+    except OSError:
+        return b""
+    return archive.read_range(member, start, length) if member in archive else b""
+
+
+def read_content(content: Union[str, ContentHandle, Dict[str, Any], None],
+                 limit: Optional[int] = None) -> str:
+    """
+    Text of a context entry's "content", however it is represented.
+
+    Args:
+        content: A string, a ContentHandle, or a handle's to_json() dict
+        limit: Read at most this many characters
+
+    Returns:
+        The (possibly truncated) text
+    """
+    if not content:
+        return ""
+    if isinstance(content, str):
+        return content if limit is None else content[:limit]
+    return as_handle(content).read(limit)
+
+
+def as_handle(content: Union[str, ContentHandle, Dict[str, Any]]) -> ContentHandle:
+    """A ContentHandle for a context entry's "content", however it is represented."""
+    if isinstance(content, ContentHandle):
+        return content
+    if isinstance(content, dict):
+        return ContentHandle.from_json(content)
+    return ContentHandle.for_text(content or "")
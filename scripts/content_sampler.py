@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Stratified Transcript Sampling for AutoBlog Daily Summaries
+
+A day's summary prompt has room for a few thousand characters. Taking
+the start of the first few sessions spends all of it on how each session
+began. sample_day() spreads a fixed budget over every session of the day
+instead. Each session's excerpts are:
+
+- head: how the session started (what was asked)
+- probes: one excerpt per equal-width stratum of the middle, taken from
+  the most telling line near it (errors first, then edits, then user turns)
+- tail: how the session ended
+
+Files and bundle members are read with seeks (ContentHandle.read_at), so
+the bytes read per session are bounded by the number of strata times
+PROBE_BYTES, however long the transcript is.
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+from content_handle import ContentHandle
+
+# Shares of a session's budget for its first and last lines; probes get the rest
+HEAD_SHARE = 0.3
+TAIL_SHARE = 0.15
+# Target length of one middle excerpt
+EXCERPT_CHARS = 500
+# Bytes read from the start of each stratum to look for a telling line: all
+# of a medium-sized transcript is scanned, a small fraction of a huge one
+PROBE_BYTES = 16 * 1024
+# A session gets at least this much, or is left out for the day
+MIN_SESSION_CHARS = 400
+
+GAP = "\n[...]\n"
+
+# Line scores: higher is more worth a probe's excerpt
+_ERROR = re.compile(r"Traceback|Error\b|error:|Exception|FAILED|failed|panic", re.IGNORECASE)
+_EDIT = re.compile(r"^\[Tool: (?:Edit|MultiEdit|Write|NotebookEdit)\]|^[-+]{3} |^@@ ")
+_USER_TURN = re.compile(r"^(?:## User\b|\*\*User\*\*:)")
+
+
+def _line_score(line: str) -> int:
+    if _ERROR.search(line):
+        return 3
+    if _EDIT.search(line):
+        return 2
+    if _USER_TURN.search(line):
+        return 1
+    return 0
+
+
+def _probe(handle: ContentHandle, start: int, end: int, chars: int) -> str:
+    """The best excerpt of about `chars` characters starting on a line in [start, end)."""
+    window = handle.read_at(start, min(PROBE_BYTES, end - start))
+    # The first line is usually cut off by the seek
+    lines = window.split("\n")
+    if start > 0 and len(lines) > 1:
+        lines = lines[1:]
+    best, best_score = 0, -1
+    for i, line in enumerate(lines):
+        score = _line_score(line)
+        if score > best_score:
+            best, best_score = i, score
+            if score == 3:
+                break
+    return "\n".join(lines[best:])[:chars]
+
+
+def sample_session(handle: ContentHandle, budget: int) -> str:
+    """
+    Head, spread-out middle excerpts and tail of one transcript.
+
+    Args:
+        handle: The transcript
+        budget: Maximum characters to return
+
+    Returns:
+        The excerpts, separated by "[...]" lines; the whole text if it fits
+    """
+    size = handle.size
+    if size <= budget:
+        return handle.read_at(0, size)
+
+    head_chars = int(budget * HEAD_SHARE)
+    tail_chars = int(budget * TAIL_SHARE)
+    head = handle.read_at(0, head_chars)
+    head = head[:head.rfind("\n") + 1] or head
+    tail = handle.read_at(size - tail_chars, tail_chars)
+    tail = tail[tail.find("\n") + 1:] or tail
+
+    middle_start, middle_end = len(head.encode('utf-8')), size - tail_chars
+    middle_chars = budget - len(head) - len(tail) - 2 * len(GAP)
+    strata = max(1, middle_chars // (EXCERPT_CHARS + len(GAP)))
+    excerpt_chars = middle_chars // strata - len(GAP)
+
+    parts = [head.rstrip("\n")]
+    width = (middle_end - middle_start) / strata
+    for i in range(strata):
+        start = middle_start + int(i * width)
+        end = middle_start + int((i + 1) * width)
+        if end - start <= 0 or excerpt_chars <= 0:
+            continue
+        excerpt = _probe(handle, start, end, excerpt_chars).strip("\n")
+        if excerpt:
+            parts.append(excerpt)
+    parts.append(tail.strip("\n"))
+    return GAP.join(parts)[:budget]
+
+
+def sample_day(handles: Sequence[Optional[ContentHandle]], budget: int) -> List[str]:
+    """
+    Excerpts from every session of a day, within one character budget.
+
+    The budget is shared equally; what a short session doesn't need goes to
+    the longer ones. When there are too many sessions for each to get
+    MIN_SESSION_CHARS, an evenly spaced subset of them is sampled.
+
+    Args:
+        handles: The day's transcripts in session order (None entries are skipped)
+        budget: Total characters across all excerpts
+
+    Returns:
+        One excerpt string per sampled session, in session order
+    """
+    present = [h for h in handles if h is not None and h.size > 0]
+    if not present:
+        return []
+    most = max(1, budget // MIN_SESSION_CHARS)
+    if len(present) > most:
+        step = len(present) / most
+        present = [present[int(i * step)] for i in range(most)]
+
+    # Water-filling: smallest sessions first, each capped at an equal share of what's left
+    shares = {}
+    remaining = budget
+    by_size = sorted(range(len(present)), key=lambda i: present[i].size)
+    for done, i in enumerate(by_size):
+        share = min(present[i].size, remaining // (len(present) - done))
+        shares[i] = share
+        remaining -= share
+
+    samples = [sample_session(present[i], shares[i]) for i in range(len(present))]
+    return [sample for sample in samples if sample]
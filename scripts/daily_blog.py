@@ -6,13 +6,13 @@ Main entry point for the automated blog generation system.
 Coordinates project memory updates, blog generation, and Git operations.
 """
 
-import os
+import json
 import re
-import subprocess
 import sys
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 import argparse
 import logging
 
@@ -23,6 +23,12 @@ DRAFT_ONLY_PROJECTS = [
     "derivux",
 ]
 
+# Stages of a single-date run, in execution order (see DailyBlogRunner._build_pipeline)
+PIPELINE_STAGES = [
+    "sync", "sanitize", "update_index", "summaries", "context",
+    "draft", "review", "revise", "polish", "save", "publish",
+]
+
 
 def process_transcript(content: str) -> str:
     """
@@ -105,10 +111,26 @@ def process_transcript(content: str) -> str:
 # Add scripts directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sanitize_transcripts import sanitize_directory, print_report
+# Only the light modules `status` needs are imported up front. Memory,
+# generator, publisher, pipeline and sanitizer are imported on first use so
+# that quick commands don't pay for them (see DailyBlogRunner's properties).
+from file_lock import LockTimeout, RunLock
+from post_catalog import PostCatalog
+from rate_limiter import TokenBucket
+from run_metrics import RunHistory, RunMetrics
+
+if TYPE_CHECKING:
+    from generate_post import BlogGenerator, GenerationResult
+    from git_publisher import GitPublisher
+    from llm_backend import LLMBackend
+    from pipeline import Pipeline
+    from project_memory import ProjectMemory
+
+LLM_BACKEND_HELP = ("LLM backend: claude (default), claude-cli, api, or "
+                    "fake[:latency=S,jitter=S,failure_rate=F,words=N,seed=N]")
 
-from project_memory import ProjectMemory
-from generate_post import BlogGenerator
+PROFILE_HELP = ("Write per-stage cProfile stats and collapsed stacks for flame graphs "
+                "(default dir: scripts/data/profiles/<command>-<time>)")
 
 
 # Setup logging
@@ -139,7 +161,9 @@ def setup_logging(log_file: Optional[Path] = None) -> logging.Logger:
 class DailyBlogRunner:
     """Orchestrates the daily blog generation process."""
 
-    def __init__(self, repo_dir: Optional[Path] = None, log_file: Optional[Path] = None):
+    def __init__(self, repo_dir: Optional[Path] = None, log_file: Optional[Path] = None,
+                 llm_calls_per_minute: Optional[float] = None,
+                 llm_backend: Optional["LLMBackend"] = None):
         self.repo_dir = repo_dir or Path(__file__).parent.parent
         self.posts_dir = self.repo_dir / "_posts"
         self.drafts_dir = self.repo_dir / "_drafts"
@@ -147,20 +171,121 @@ class DailyBlogRunner:
         self.log_file = log_file
         self.logger = setup_logging(log_file)
 
-        self.memory = ProjectMemory(
-            index_path=self.scripts_dir / "data" / "project_index.json"
+        # Local Claude Code transcripts that `sync` copies into the repo
+        self.transcript_source_dir = Path.home() / "transcript"
+
+        # One bucket shared by summaries and every generation pass (CLI or API)
+        self.rate_limiter = (
+            TokenBucket.per_minute(llm_calls_per_minute) if llm_calls_per_minute else None
         )
-        self.generator = BlogGenerator(posts_dir=self.posts_dir)
+
+        # Used for summaries and generation; None means the real Claude backends
+        self.llm_backend = llm_backend
+
+        # Created on first access; see the properties below
+        self._memory: Optional["ProjectMemory"] = None
+        self._generator: Optional["BlogGenerator"] = None
+        self._publisher: Optional["GitPublisher"] = None
+        self.catalog = PostCatalog(self.posts_dir, self.drafts_dir)
+        self.pipeline_cache_dir = self.scripts_dir / "data" / "pipeline_cache"
+        self.history = RunHistory(self.scripts_dir / "data" / "run_history.jsonl")
+        # Held for a whole run or backfill so two runners never duplicate LLM work
+        self.run_lock = RunLock(self.scripts_dir / "data" / "run.lock")
+        # Seconds to wait for another run to finish before giving up (0: give up at once)
+        self.lock_wait = 0.0
+        # Draft large days from per-session digests (see session_digest.py)
+        self.map_reduce = False
+        self.metrics: Optional[RunMetrics] = None
+        self.profiler = None
+
+    @property
+    def memory(self) -> "ProjectMemory":
+        """Project memory; its index is itself only read when first needed."""
+        if self._memory is None:
+            from project_memory import ProjectMemory
+            self._memory = ProjectMemory(
+                index_path=self.scripts_dir / "data" / "project_index.json",
+                rate_limiter=self.rate_limiter,
+                llm_backend=self.llm_backend
+            )
+            self._memory.profiler = self.profiler
+            self._memory.metrics = self.metrics
+        return self._memory
+
+    @property
+    def generator(self) -> "BlogGenerator":
+        """Blog generator (creates the posts directory)."""
+        if self._generator is None:
+            from generate_post import BlogGenerator
+            from session_digest import DigestCache
+            self._generator = BlogGenerator(posts_dir=self.posts_dir,
+                                            rate_limiter=self.rate_limiter,
+                                            llm_backend=self.llm_backend)
+            self._generator.metrics = self.metrics
+            self._generator.map_reduce = self.map_reduce
+            self._generator.digest_cache = DigestCache(self.scripts_dir / "data" / "digest_cache")
+        return self._generator
+
+    @property
+    def publisher(self) -> "GitPublisher":
+        if self._publisher is None:
+            from git_publisher import GitPublisher
+            self._publisher = GitPublisher(self.repo_dir, logger=self.logger)
+        return self._publisher
+
+    def enable_profiling(self, output_dir: Path) -> None:
+        """Profile every stage from now on into `output_dir` (see profiling.py)."""
+        from profiling import StageProfiler
+        self.profiler = StageProfiler(output_dir)
+        if self._memory is not None:
+            self._memory.profiler = self.profiler
+        self.logger.info(f"Profiling to {output_dir}")
+
+    def _profile(self, name: str):
+        return self.profiler.profile(name) if self.profiler is not None else nullcontext()
+
+    @contextmanager
+    def _exclusive_run(self):
+        """
+        Hold the run lock, yielding False instead if another run holds it.
+
+        A lock left by a run that crashed (or, on another host, that is
+        older than its stale timeout) is broken rather than waited for.
+        """
+        try:
+            self.run_lock.acquire(timeout=self.lock_wait)
+        except LockTimeout as e:
+            self.logger.warning(f"Another AutoBlog run is in progress ({e}); not starting")
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self.run_lock.release()
 
     def run(self, date: Optional[str] = None, skip_push: bool = False,
-            skip_summaries: bool = False) -> bool:
+            skip_summaries: bool = False, sync_days: Optional[int] = None,
+            from_stage: Optional[str] = None, until_stage: Optional[str] = None,
+            force: bool = False) -> bool:
         """
         Run the full daily blog generation process.
 
+        The run is executed as an incremental stage pipeline (see
+        PIPELINE_STAGES): stages whose inputs are unchanged since the last
+        run for this date reuse their cached output instead of running again.
+
+        Only one run or backfill happens at a time: if another process holds
+        the run lock for longer than lock_wait, this returns False without
+        doing any work.
+
         Args:
             date: Date to generate for (defaults to today)
             skip_push: Don't push to GitHub
             skip_summaries: Don't generate Claude summaries (faster)
+            sync_days: Sync and sanitize this many days of transcripts first
+            from_stage: Re-run starting at this stage, reusing stored outputs before it
+            until_stage: Stop after this stage
+            force: Ignore cached stage outputs
 
         Returns:
             True if successful, False otherwise
@@ -170,136 +295,433 @@ class DailyBlogRunner:
 
         self.logger.info(f"Starting daily blog generation for {date}")
 
-        # Check if post already exists for this date (idempotency)
-        existing = list(self.posts_dir.glob(f"{date}-*.md"))
-        if existing:
-            self.logger.info(f"Post already exists for {date}: {existing[0].name}")
-            return True
+        with self._exclusive_run() as acquired:
+            if not acquired:
+                return False
 
-        # Also check drafts directory
-        existing_draft = list(self.drafts_dir.glob(f"{date}-*.md"))
-        if existing_draft:
-            self.logger.info(f"Draft already exists for {date}: {existing_draft[0].name}")
-            return True
+            # Check if a post or draft already exists for this date (idempotency).
+            # Partial reruns are explicit debugging requests, so they bypass it.
+            if from_stage is None and until_stage is None and self._existing_post(date):
+                return True
 
-        try:
-            # Step 1: Update project memory index
-            self.logger.info("Step 1/4: Updating project memory index...")
-            stats = self.memory.update_index(use_claude_for_summaries=not skip_summaries)
-            self.logger.info(f"  Found {stats['new_sessions']} new sessions")
-            self.logger.info(f"  New projects: {stats['new_projects']}")
+            metrics = self._start_metrics("run", date=date, from_stage=from_stage,
+                                          until_stage=until_stage, force=force)
+            success = False
+            stopped_at = None
+            try:
+                pipeline = self._build_pipeline(date, skip_push, skip_summaries, sync_days)
+                result = pipeline.run(
+                    params={"date": date, "skip_summaries": skip_summaries,
+                            "skip_push": skip_push, "sync_days": sync_days,
+                            "map_reduce": self.generator.map_reduce},
+                    from_stage=from_stage,
+                    until_stage=until_stage,
+                    force=force
+                )
+                metrics.add_pipeline_result(result)
+                stopped_at = result.stopped_at
+
+                if not result.success:
+                    self.logger.error(f"  Generation failed at stage '{result.stopped_at}': {result.error}")
+                    return False
+
+                if result.cached:
+                    self.logger.info(f"  Reused cached stages: {', '.join(result.cached)}")
+                if result.stopped_at is None and until_stage is None:
+                    self.logger.info("Daily blog generation completed successfully!")
+                success = True
+                return True
 
-            # Step 2: Get context for blog generation
+            except Exception as e:
+                self.logger.error(f"Error during blog generation: {e}", exc_info=True)
+                return False
+            finally:
+                self._finish_metrics(metrics, success, stopped_at=stopped_at)
+
+    def _build_pipeline(self, date: str, skip_push: bool, skip_summaries: bool,
+                        sync_days: Optional[int]) -> "Pipeline":
+        """Express a single-date run as a DAG of cacheable stages."""
+        from generate_post import DRAFT_PROMPT, POLISH_PROMPT, REVIEW_PROMPT, REVISE_PROMPT
+        from pipeline import NoCache, Pipeline, PipelineStop, Stage, StageError
+        from session_digest import DIGEST_PROMPT
+
+        generator = self.generator
+
+        def sync(inputs):
+            if sync_days is None:
+                return {"synced": None}
+            count = self._copy_transcripts(sync_days)
+            if count is None:
+                raise StageError("Transcript directory not found")
+            return {"synced": count}
+
+        def sanitize(inputs):
+            if sync_days is None:
+                return {"total_redactions": None}
+            summary = self._sanitize_transcripts()
+            return {key: summary[key] for key in ("total_files", "files_with_secrets", "total_redactions")}
+
+        def update_index(inputs):
+            return self._update_index(skip_summaries=True)
+
+        def summaries(inputs):
+            if skip_summaries:
+                return {"summarized": []}
+            days = sorted({(p, d) for p, d, _ in inputs["update_index"]["new_session_keys"]})
+            if days:
+                self.logger.info(f"  Summarizing {len(days)} project-days...")
+                self.memory.summarize_days(days)
+            return {"summarized": [list(day) for day in days]}
+
+        def context(inputs):
             self.logger.info("Step 2/4: Gathering context...")
-            context = self.memory.get_context_for_blog(date)
+            ctx = self.memory.get_context_for_blog(date)
 
-            if not context.get("today"):
+            if not ctx.get("today"):
                 self.logger.info(f"  No transcripts found for {date}")
                 self.logger.info("  Checking for transcripts from yesterday...")
 
                 # Try yesterday if today is empty (for early morning runs)
                 yesterday = (datetime.strptime(date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
-                context = self.memory.get_context_for_blog(yesterday)
+                ctx = self.memory.get_context_for_blog(yesterday)
 
-                if not context.get("today"):
-                    self.logger.info("  No transcripts found. Skipping generation.")
-                    return True  # Not an error, just nothing to do
+                if not ctx.get("today"):
+                    raise PipelineStop("No transcripts found. Skipping generation.")
 
                 self.logger.info(f"  Using transcripts from {yesterday}")
 
-            self.logger.info(f"  Projects: {', '.join(context['projects_worked_on'])}")
-            self.logger.info(f"  Sessions: {len(context['today'])}")
+            self.logger.info(f"  Projects: {', '.join(ctx['projects_worked_on'])}")
+            self.logger.info(f"  Sessions: {len(ctx['today'])}")
+            return ctx
 
-            # Step 3: Generate blog post
+        def draft(inputs):
             self.logger.info("Step 3/4: Generating blog post...")
-            result = self.generator.generate(context)
+            transcripts_text = generator._format_transcripts(inputs["context"].get("today", []))
+            history_text = generator._format_history(inputs["context"].get("history", []))
+            if not transcripts_text.strip():
+                raise StageError("No transcripts found for today")
+            text = generator.draft_pass(transcripts_text, history_text)
+            if not text:
+                raise StageError("Failed to generate draft")
+            return text
+
+        def with_fallback(pass_name, produce):
+            # Fallback outputs are used for this run but not cached, so the
+            # failed pass is retried next time
+            passes = {}
+            text = produce(passes)
+            return text if passes.get(pass_name) else NoCache(text)
+
+        def review(inputs):
+            return with_fallback("review", lambda p: generator.review_pass(inputs["draft"], p))
+
+        def revise(inputs):
+            return with_fallback("revised", lambda p: generator.revise_pass(
+                inputs["draft"], inputs["review"], p))
+
+        def polish(inputs):
+            return with_fallback("final", lambda p: generator.polish_pass(inputs["revise"], p))
+
+        def save(inputs):
+            result = generator.finalize(inputs["polish"], inputs["context"].get("date"))
+            filepath = self._save_post(inputs["context"], result)
+            if filepath is None:
+                raise StageError(result.error or "Failed to save post")
+            return {"path": str(filepath), "title": result.title}
+
+        def publish(inputs):
+            if skip_push:
+                self.logger.info("Step 4/4: Skipping Git push (--skip-push)")
+                return {"pushed": False}
+            self.logger.info("Step 4/4: Pushing to GitHub...")
+            pushed = self._git_push(inputs["save"]["title"], Path(inputs["save"]["path"]))
+            if not pushed:
+                self.logger.warning("  Git push failed, but post was saved locally")
+            return {"pushed": pushed}
+
+        stages = [
+            Stage("sync", sync, params=["sync_days"],
+                  external=lambda: self._source_transcripts_signature(sync_days) if sync_days else None),
+            Stage("sanitize", sanitize, inputs=["sync"]),
+            Stage("update_index", update_index, inputs=["sanitize"], cacheable=False),
+            Stage("summaries", summaries, inputs=["update_index"], params=["skip_summaries"]),
+            Stage("context", context, inputs=["update_index", "summaries"], params=["date"],
+                  cacheable=False),
+            Stage("draft", draft, inputs=["context"], params=["map_reduce"],
+                  version=DRAFT_PROMPT + (DIGEST_PROMPT if generator.map_reduce else "")),
+            Stage("review", review, inputs=["draft"], version=REVIEW_PROMPT),
+            Stage("revise", revise, inputs=["draft", "review"], version=REVISE_PROMPT),
+            Stage("polish", polish, inputs=["revise"], version=POLISH_PROMPT),
+            Stage("save", save, inputs=["context", "polish"], cacheable=False),
+            Stage("publish", publish, inputs=["save"], params=["skip_push"], cacheable=False),
+        ]
+        return Pipeline(stages, cache_dir=self.pipeline_cache_dir / date, logger=self.logger,
+                        profiler=self.profiler)
+
+    def run_backfill(self, dates: List[str], skip_push: bool = False,
+                     skip_summaries: bool = False, workers: int = 1) -> Dict[str, bool]:
+        """
+        Generate posts for several dates from one shared in-memory state.
 
-            if not result.success:
-                self.logger.error(f"  Generation failed: {result.error}")
-                return False
+        The index is updated and the transcript tree walked only once; each
+        date is then generated from the same session list. Unlike run(),
+        an empty date does not fall back to the previous day, since that day
+        is part of the backfill in its own right.
 
-            self.logger.info(f"  Title: {result.title}")
+        With workers > 1 the LLM passes for different dates run concurrently
+        (throttled by the runner's shared rate limiter, if any). Posts are
+        still saved and pushed one at a time in date order, so the output is
+        the same as a serial run.
 
-            # Check if this should be a draft (any project matches draft-only list)
-            is_draft_only = self._is_draft_only_project(context['projects_worked_on'])
+        Like run(), gives up (every date False) if another run holds the
+        run lock for longer than lock_wait.
 
-            # Save the post to appropriate directory
-            if is_draft_only:
-                self.drafts_dir.mkdir(parents=True, exist_ok=True)
-                filepath = self.drafts_dir / result.filename
-                filepath.write_text(result.content)
-                self.logger.info(f"  Saved to drafts (draft-only project): {filepath}")
-            else:
-                filepath = self.generator.save_post(result)
-                self.logger.info(f"  Saved to: {filepath}")
-
-            # Step 4: Git commit and push
-            if not skip_push:
-                self.logger.info("Step 4/4: Pushing to GitHub...")
-                push_success = self._git_push(result.title, filepath)
-                if not push_success:
-                    self.logger.warning("  Git push failed, but post was saved locally")
-            else:
-                self.logger.info("Step 4/4: Skipping Git push (--skip-push)")
+        Args:
+            dates: Dates to generate for (YYYY-MM-DD), processed in order
+            skip_push: Don't push to GitHub
+            skip_summaries: Don't generate Claude summaries (faster)
+            workers: Number of dates to generate concurrently
 
-            self.logger.info("Daily blog generation completed successfully!")
-            return True
+        Returns:
+            Mapping of date to success for every date processed
+        """
+        with self._exclusive_run() as acquired:
+            if not acquired:
+                return {date: False for date in dates}
+
+            results = {}
+
+            missing = []
+            for date in sorted(dates):
+                if self._existing_post(date):
+                    results[date] = True
+                else:
+                    missing.append(date)
+
+            if not missing:
+                return results
+
+            metrics = self._start_metrics("backfill", dates=missing, workers=workers)
+            try:
+                self._backfill_missing(missing, results, skip_push, skip_summaries, workers, metrics)
+            finally:
+                self._finish_metrics(metrics, all(results.get(d) for d in missing))
+            return results
+
+    def _backfill_missing(self, missing: List[str], results: Dict[str, bool],
+                          skip_push: bool, skip_summaries: bool, workers: int,
+                          metrics: RunMetrics) -> None:
+        """Generate, save and publish the dates run_backfill() found missing."""
+        from concurrent.futures import ThreadPoolExecutor
 
+        try:
+            with metrics.stage("update_index"):
+                self._update_index(skip_summaries)
+            with metrics.stage("find_sessions"):
+                sessions = self.memory.find_all_sessions()
+            # Once here, so the workers only search the history index
+            self.memory.sync_history_index()
         except Exception as e:
-            self.logger.error(f"Error during blog generation: {e}", exc_info=True)
-            return False
-
-    def _git_push(self, title: str, filepath: Path) -> bool:
-        """Commit and push changes to GitHub."""
+            self.logger.error(f"Error updating project index: {e}", exc_info=True)
+            results.update({date: False for date in missing})
+            return
+
+        def build(date: str):
+            self.logger.info(f"Starting daily blog generation for {date}")
+            # Summed across workers, so this can exceed the run's wall time
+            with metrics.stage("generate"):
+                return self._build_post(date, sessions=sessions, fallback_to_yesterday=False)
+
+        published = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {date: executor.submit(build, date) for date in missing}
+
+            # Save strictly in date order as each date's build completes
+            for date in missing:
+                try:
+                    built = futures[date].result()
+                    if built is None:
+                        results[date] = True
+                        continue
+                    with metrics.stage("save"):
+                        filepath = self._save_post(*built)
+                    results[date] = filepath is not None
+                    if filepath is not None:
+                        published.append((date, built[1].title, filepath))
+                except Exception as e:
+                    self.logger.error(f"Error during blog generation for {date}: {e}", exc_info=True)
+                    results[date] = False
+
+        # Step 4: one commit and one push for the whole backfill
+        if published and not skip_push:
+            self.logger.info(f"Step 4/4: Pushing {len(published)} posts to GitHub...")
+            with metrics.stage("publish"):
+                pushed = self._git_publish(
+                    [filepath for _, _, filepath in published],
+                    self._commit_message(published)
+                )
+            if not pushed:
+                self.logger.warning("  Git push failed, but posts were saved locally")
+        elif published:
+            self.logger.info("Step 4/4: Skipping Git push (--skip-push)")
+
+    def _start_metrics(self, command: str, **meta: Any) -> RunMetrics:
+        """Begin recording a run and attach the recorder to memory and generator."""
+        metrics = RunMetrics(command, **meta)
+        self.metrics = metrics
+        self.memory.metrics = metrics
+        self.generator.metrics = metrics
+        return metrics
+
+    def _finish_metrics(self, metrics: RunMetrics, success: bool, **extra: Any) -> Dict[str, Any]:
+        """Detach the recorder and append its record to the run history."""
+        self.metrics = None
+        for component in (self._memory, self._generator):
+            if component is not None:
+                component.metrics = None
+
+        record = metrics.finish(success, **extra)
+        self.logger.info(
+            f"  Run took {record['wall']:.1f}s ({record['cpu']:.1f}s CPU), "
+            f"{record['llm']['total_calls']} LLM calls"
+        )
         try:
-            os.chdir(self.repo_dir)
+            self.history.append(record)
+        except OSError as e:
+            self.logger.warning(f"  Could not write run history: {e}")
+        return record
+
+    def _existing_post(self, date: str) -> Optional[Path]:
+        """Return an existing post or draft for a date, if there is one (idempotency)."""
+        existing = self.catalog.find(date)
+        if existing is not None:
+            kind = "Draft" if existing.parent == self.drafts_dir else "Post"
+            self.logger.info(f"{kind} already exists for {date}: {existing.name}")
+        return existing
+
+    def _update_index(self, skip_summaries: bool) -> Dict[str, Any]:
+        """Step 1: bring the project memory index up to date."""
+        self.logger.info("Step 1/4: Updating project memory index...")
+        stats = self.memory.update_index(use_claude_for_summaries=not skip_summaries)
+        self.logger.info(f"  Found {stats['new_sessions']} new sessions")
+        self.logger.info(f"  New projects: {stats['new_projects']}")
+        return stats
+
+    def _build_post(self, date: str, sessions: Optional[List[Dict[str, Any]]] = None,
+                    fallback_to_yesterday: bool = True
+                    ) -> Optional[Tuple[Dict[str, Any], "GenerationResult"]]:
+        """
+        Steps 2-3: gather context and run the generation passes.
 
-            # Check if we're in a git repo
-            result = subprocess.run(
-                ['git', 'rev-parse', '--git-dir'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode != 0:
-                self.logger.warning("Not a git repository, skipping push")
-                return False
+        Has no side effects on the repo, so it is safe to run for several
+        dates concurrently.
 
-            # Add the new post
-            subprocess.run(['git', 'add', str(filepath)], check=True)
+        Returns:
+            (context, result), or None if there were no transcripts to write about
+        """
+        # Step 2: Get context for blog generation
+        self.logger.info("Step 2/4: Gathering context...")
+        context = self.memory.get_context_for_blog(date, sessions=sessions)
 
-            # Also add updated project index (ignore if in .gitignore)
-            index_file = self.scripts_dir / "data" / "project_index.json"
-            if index_file.exists():
-                subprocess.run(['git', 'add', str(index_file)], check=False)
+        if not context.get("today"):
+            self.logger.info(f"  No transcripts found for {date}")
+            if not fallback_to_yesterday:
+                self.logger.info("  Skipping generation.")
+                return None
 
-            # Check if there are changes to commit
-            result = subprocess.run(
-                ['git', 'diff', '--cached', '--quiet'],
-                capture_output=True
-            )
-            if result.returncode == 0:
-                self.logger.info("  No changes to commit")
-                return True
+            self.logger.info("  Checking for transcripts from yesterday...")
 
-            # Commit
-            commit_msg = f"Add blog post: {title}\n\nAutomatically generated by AutoBlog"
-            subprocess.run(
-                ['git', 'commit', '-m', commit_msg],
-                check=True
-            )
+            # Try yesterday if today is empty (for early morning runs)
+            yesterday = (datetime.strptime(date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+            context = self.memory.get_context_for_blog(yesterday, sessions=sessions)
 
-            # Push
-            subprocess.run(['git', 'push'], check=True)
-            self.logger.info("  Successfully pushed to GitHub")
-            return True
+            if not context.get("today"):
+                self.logger.info("  No transcripts found. Skipping generation.")
+                return None
 
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"  Git operation failed: {e}")
-            return False
+            self.logger.info(f"  Using transcripts from {yesterday}")
+
+        self.logger.info(f"  Projects: {', '.join(context['projects_worked_on'])}")
+        self.logger.info(f"  Sessions: {len(context['today'])}")
+
+        # Step 3: Generate blog post
+        self.logger.info("Step 3/4: Generating blog post...")
+        result = self.generator.generate(context)
+        return context, result
+
+    def _save_post(self, context: Dict[str, Any], result: "GenerationResult") -> Optional[Path]:
+        """Save a generated post, or a draft for draft-only projects."""
+        if not result.success:
+            self.logger.error(f"  Generation failed: {result.error}")
+            return None
+
+        self.logger.info(f"  Title: {result.title}")
+
+        # Check if this should be a draft (any project matches draft-only list)
+        is_draft_only = self._is_draft_only_project(context['projects_worked_on'])
+
+        # Save the post to appropriate directory
+        if is_draft_only:
+            self.drafts_dir.mkdir(parents=True, exist_ok=True)
+            filepath = self.drafts_dir / result.filename
+            filepath.write_text(result.content)
+            self.logger.info(f"  Saved to drafts (draft-only project): {filepath}")
+        else:
+            filepath = self.generator.save_post(result)
+            self.logger.info(f"  Saved to: {filepath}")
+
+        if filepath is not None:
+            self.catalog.add(filepath)
+            if self.metrics is not None:
+                self.metrics.count("posts_saved")
+        return filepath
+
+    def _git_push(self, title: str, filepath: Path) -> bool:
+        """Commit and push a single post to GitHub."""
+        commit_msg = f"Add blog post: {title}\n\nAutomatically generated by AutoBlog"
+        return self._git_publish([filepath], commit_msg)
+
+    def _git_publish(self, paths: List[Path], message: str) -> bool:
+        """Commit the given posts plus the project index in one commit, then push."""
+        index_file = self.scripts_dir / "data" / "project_index.json"
+        try:
+            # The committed file is the snapshot; fold pending journal entries
+            # into it, and only stage it if its content changed
+            self.memory.compact_index()
+            stage_index = self.memory.index_unpublished
+            result = self.publisher.publish(paths, message,
+                                            optional_paths=[index_file] if stage_index else [])
         except Exception as e:
             self.logger.error(f"  Unexpected error during git push: {e}")
             return False
 
+        if self.metrics is not None:
+            self.metrics.count("push_attempts", result.push_attempts)
+
+        if not result.success:
+            if result.error == "Not a git repository":
+                self.logger.warning("Not a git repository, skipping push")
+            else:
+                self.logger.error(f"  {result.error}")
+            return False
+
+        if stage_index and result.committed:
+            self.memory.mark_index_published()
+        if result.pushed:
+            self.logger.info("  Successfully pushed to GitHub")
+        return True
+
+    def _commit_message(self, published: List[Tuple[str, str, Path]]) -> str:
+        """Commit message covering every post from a backfill."""
+        if len(published) == 1:
+            return f"Add blog post: {published[0][1]}\n\nAutomatically generated by AutoBlog"
+
+        dates = [date for date, _, _ in published]
+        lines = [f"Add {len(published)} blog posts ({dates[0]} to {dates[-1]})", ""]
+        lines += [f"- {date}: {title}" for date, title, _ in published]
+        lines += ["", "Automatically generated by AutoBlog"]
+        return "\n".join(lines)
+
     def _is_draft_only_project(self, projects: list) -> bool:
         """Check if any project in the list is marked as draft-only."""
         for project in projects:
@@ -319,19 +741,20 @@ class DailyBlogRunner:
         Returns:
             True if successful
         """
-        transcripts_dir = self.repo_dir / "transcripts"
-        transcripts_dir.mkdir(parents=True, exist_ok=True)
-
-        self.logger.info(f"Syncing transcripts from last {days} days...")
-
-        source_dir = Path.home() / "transcript"
-        if not source_dir.exists():
-            self.logger.warning(f"Transcript directory not found: {source_dir}")
+        with self._profile("sync"):
+            copied = self._copy_transcripts(days)
+        if copied is None:
             return False
+        with self._profile("sanitize"):
+            self._sanitize_transcripts()
+        return True
+
+    def _iter_source_transcripts(self, days: int):
+        """Yield (project, date, session_id, conversation_path) for recent local sessions."""
+        source_dir = self.transcript_source_dir
 
         # Calculate date threshold
         threshold = datetime.now() - timedelta(days=days)
-        synced_count = 0
 
         for project_dir in source_dir.iterdir():
             if not project_dir.is_dir() or project_dir.name.startswith('.'):
@@ -348,7 +771,6 @@ class DailyBlogRunner:
                 except ValueError:
                     continue
 
-                # Sync this date's transcripts
                 for session_dir in date_dir.iterdir():
                     if not session_dir.is_dir():
                         continue
@@ -357,47 +779,185 @@ class DailyBlogRunner:
                     if not conversation.exists():
                         continue
 
-                    # Create destination path
-                    dest_dir = transcripts_dir / date_dir.name
-                    dest_dir.mkdir(parents=True, exist_ok=True)
+                    yield project_dir.name, date_dir.name, session_dir.name, conversation
+
+    def _copy_transcripts(self, days: int) -> Optional[int]:
+        """Copy and pre-process recent transcripts. Returns the count, or None if no source."""
+        transcripts_dir = self.repo_dir / "transcripts"
+        transcripts_dir.mkdir(parents=True, exist_ok=True)
+
+        self.logger.info(f"Syncing transcripts from last {days} days...")
+
+        source_dir = self.transcript_source_dir
+        if not source_dir.exists():
+            self.logger.warning(f"Transcript directory not found: {source_dir}")
+            return None
+
+        synced_count = 0
+        for project, date, session_id, conversation in self._iter_source_transcripts(days):
+            # Create destination path
+            dest_dir = transcripts_dir / date
+            dest_dir.mkdir(parents=True, exist_ok=True)
 
-                    dest_file = dest_dir / f"{project_dir.name}_{session_dir.name}.md"
+            dest_file = dest_dir / f"{project}_{session_id}.md"
 
-                    # Process transcript to reduce size
-                    raw_content = conversation.read_text(encoding='utf-8')
-                    processed_content = process_transcript(raw_content)
-                    dest_file.write_text(processed_content, encoding='utf-8')
-                    synced_count += 1
+            # Process transcript to reduce size
+            raw_content = conversation.read_text(encoding='utf-8')
+            processed_content = process_transcript(raw_content)
+            dest_file.write_text(processed_content, encoding='utf-8')
+            synced_count += 1
 
         self.logger.info(f"  Synced {synced_count} transcript files")
+        return synced_count
+
+    def _sanitize_transcripts(self) -> Dict[str, Any]:
+        """Run comprehensive sanitization on the synced transcripts."""
+        from sanitize_transcripts import sanitize_directory
 
-        # Run comprehensive sanitization on synced transcripts
         self.logger.info("  Running sanitization pass...")
-        summary = sanitize_directory(transcripts_dir, dry_run=False)
+        summary = sanitize_directory(self.repo_dir / "transcripts", dry_run=False)
         if summary['total_redactions'] > 0:
             self.logger.info(f"  Sanitized {summary['total_redactions']} secrets in {summary['files_with_secrets']} files")
         else:
             self.logger.info("  No additional secrets found")
-
-        return True
+        return summary
+
+    def _source_transcripts_signature(self, days: int) -> List[Any]:
+        """Cheap stat-only fingerprint of the transcripts a sync would copy."""
+        if not self.transcript_source_dir.exists():
+            return []
+        signature = []
+        for project, date, session_id, conversation in self._iter_source_transcripts(days):
+            st = conversation.stat()
+            signature.append([project, date, session_id, st.st_size, st.st_mtime_ns])
+        return sorted(signature)
 
     def get_status(self) -> dict:
         """Get the current status of the blog system."""
         stats = self.memory.get_stats()
 
-        # Count posts
-        posts = list(self.posts_dir.glob("*.md")) if self.posts_dir.exists() else []
-
         return {
             "projects_tracked": stats["total_projects"],
             "total_sessions": stats["total_sessions"],
             "last_index_update": stats["last_updated"],
-            "posts_generated": len(posts),
+            "last_index_scan": stats["last_scan"],
+            "posts_generated": self.catalog.post_count(),
             "repo_dir": str(self.repo_dir),
-            "posts_dir": str(self.posts_dir)
+            "posts_dir": str(self.posts_dir),
+            "latency": self.history.latency_summary("run")
         }
 
 
+def submit_job(args: argparse.Namespace) -> int:
+    """Send a job to a running daemon and print the response. Returns an exit code."""
+    from blog_daemon import DEFAULT_SOCKET_PATH, send_request
+
+    job_args = {
+        key: value for key, value in {
+            "date": args.date, "start": args.start, "end": args.end,
+            "days": args.days, "workers": args.workers,
+        }.items() if value is not None
+    }
+    if args.skip_push:
+        job_args["skip_push"] = True
+    if args.skip_summaries:
+        job_args["skip_summaries"] = True
+
+    try:
+        response = send_request(
+            {"job": args.job, "args": job_args, "wait": not args.no_wait},
+            socket_path=args.socket or DEFAULT_SOCKET_PATH
+        )
+    except OSError as e:
+        print(f"Could not reach AutoBlog daemon: {e}")
+        return 1
+
+    print(json.dumps(response, indent=2))
+    result = response.get("job", {}).get("result")
+    return 0 if response.get("ok") and result is not False else 1
+
+
+def bench_command(args: argparse.Namespace) -> int:
+    """Run the offline pipeline benchmark and print a report. Returns an exit code."""
+    from benchmark import format_bench_result, run_pipeline_bench
+    from llm_backend import FakeLLMBackend, backend_from_spec
+
+    if args.llm_backend:
+        backend = backend_from_spec(args.llm_backend)
+    else:
+        backend = FakeLLMBackend(latency=args.latency, jitter=args.jitter,
+                                 failure_rate=args.failure_rate,
+                                 output_words=args.words, seed=args.seed)
+
+    result = run_pipeline_bench(
+        backend,
+        days=args.days,
+        projects=args.projects,
+        sessions_per_day=args.sessions_per_day,
+        turns=args.turns,
+        workers=args.workers,
+        skip_summaries=args.skip_summaries,
+        llm_calls_per_minute=args.rate_limit,
+        seed=args.seed
+    )
+    print(format_bench_result(result))
+
+    if args.json_path:
+        args.json_path.parent.mkdir(parents=True, exist_ok=True)
+        args.json_path.write_text(json.dumps(result.to_dict(), indent=2))
+    return 0 if not result.failed_dates else 1
+
+
+def bench_scaling_command(args: argparse.Namespace) -> int:
+    """Run the transcript scaling benchmark and print a table. Returns an exit code."""
+    from benchmark import format_scaling_results, run_scaling_bench
+
+    def parse_list(value: str) -> List[str]:
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    def report(measurement) -> None:
+        print(f"  {measurement.layout:<6} {measurement.sessions:>7} sessions  "
+              f"{measurement.operation:<22} {measurement.wall:.3f}s", flush=True)
+
+    measurements = run_scaling_bench(
+        scales=[int(n) for n in parse_list(args.sessions)],
+        layouts=parse_list(args.layouts),
+        projects=args.projects,
+        turns=args.turns,
+        secret_density=args.secret_density,
+        trace_memory=not args.no_memory,
+        seed=args.seed,
+        progress=report
+    )
+    print()
+    print(format_scaling_results(measurements))
+
+    if args.json_path:
+        args.json_path.parent.mkdir(parents=True, exist_ok=True)
+        args.json_path.write_text(json.dumps([m.to_dict() for m in measurements], indent=2))
+    return 0
+
+
+def bench_index_command(args: argparse.Namespace) -> int:
+    """Run the index format benchmark and print a table. Returns an exit code."""
+    from benchmark import format_index_format_results, run_index_format_bench
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()] if args.formats else None
+    measurements = run_index_format_bench(
+        scales=[int(n) for n in args.sessions.split(",") if n.strip()],
+        formats=formats,
+        projects=args.projects,
+        repeat=args.repeat,
+        seed=args.seed
+    )
+    print(format_index_format_results(measurements))
+
+    if args.json_path:
+        args.json_path.parent.mkdir(parents=True, exist_ok=True)
+        args.json_path.write_text(json.dumps([m.to_dict() for m in measurements], indent=2))
+    return 0
+
+
 def main():
     """CLI entry point for daily blog generation."""
     parser = argparse.ArgumentParser(
@@ -413,9 +973,160 @@ def main():
                             help="Don't push to GitHub")
     run_parser.add_argument("--skip-summaries", action="store_true",
                             help="Skip Claude summary generation (faster)")
+    run_parser.add_argument("--sync-days", type=int,
+                            help="Sync and sanitize this many days of transcripts first")
+    run_parser.add_argument("--from-stage", choices=PIPELINE_STAGES,
+                            help="Re-run from this stage using stored outputs of earlier stages")
+    run_parser.add_argument("--until-stage", choices=PIPELINE_STAGES,
+                            help="Stop after this stage")
+    run_parser.add_argument("--force", action="store_true",
+                            help="Ignore cached stage outputs and re-run every stage")
+    run_parser.add_argument("--profile", nargs="?", const="", metavar="DIR",
+                            help=PROFILE_HELP)
+    run_parser.add_argument("--llm-backend", metavar="SPEC",
+                            help=LLM_BACKEND_HELP)
+    run_parser.add_argument("--wait-for-lock", type=float, default=0, metavar="SECONDS",
+                            help="Wait this long for another run to finish (default: exit at once)")
+    run_parser.add_argument("--map-reduce", action="store_true",
+                            help="Digest each session of a large day in parallel, then draft from the digests")
     run_parser.add_argument("--log-file", type=Path,
                             help="Log file path")
 
+    # Backfill command
+    backfill_parser = subparsers.add_parser(
+        "backfill", help="Generate posts for several past days in one process"
+    )
+    backfill_parser.add_argument("--days", type=int, default=7,
+                                 help="Days to backfill, excluding today (default: 7)")
+    backfill_parser.add_argument("--skip-push", action="store_true",
+                                 help="Don't push to GitHub")
+    backfill_parser.add_argument("--skip-summaries", action="store_true",
+                                 help="Skip Claude summary generation (faster)")
+    backfill_parser.add_argument("--workers", type=int, default=1,
+                                 help="Dates to generate concurrently (default: 1)")
+    backfill_parser.add_argument("--rate-limit", type=float,
+                                 help="Max Claude calls per minute across all workers")
+    backfill_parser.add_argument("--llm-backend", metavar="SPEC",
+                                 help=LLM_BACKEND_HELP)
+    backfill_parser.add_argument("--wait-for-lock", type=float, default=0, metavar="SECONDS",
+                                 help="Wait this long for another run to finish (default: exit at once)")
+    backfill_parser.add_argument("--map-reduce", action="store_true",
+                                 help="Digest each session of a large day in parallel, then draft from the digests")
+    backfill_parser.add_argument("--log-file", type=Path,
+                                 help="Log file path")
+
+    # Serve command (long-running daemon)
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run as a daemon accepting jobs over a Unix socket"
+    )
+    serve_parser.add_argument("--socket", type=Path,
+                              help="Socket path (default: ~/.autoblog.sock)")
+    serve_parser.add_argument("--max-parallel", type=int, default=2,
+                              help="Max jobs running at once (default: 2)")
+    serve_parser.add_argument("--llm-slots", type=int, default=1,
+                              help="Max LLM-bound jobs running at once (default: 1)")
+    serve_parser.add_argument("--rate-limit", type=float,
+                              help="Max Claude calls per minute across all jobs")
+    serve_parser.add_argument("--llm-backend", metavar="SPEC",
+                              help=LLM_BACKEND_HELP)
+    serve_parser.add_argument("--log-file", type=Path,
+                              help="Log file path")
+
+    # Submit command (client for the daemon)
+    submit_parser = subparsers.add_parser("submit", help="Submit a job to a running daemon")
+    submit_parser.add_argument("job", choices=["sync", "update", "generate", "backfill",
+                                               "status", "jobs", "ping", "shutdown"],
+                               help="Job to submit")
+    submit_parser.add_argument("--date", help="Date for generate (YYYY-MM-DD)")
+    submit_parser.add_argument("--start", help="First date for backfill (YYYY-MM-DD)")
+    submit_parser.add_argument("--end", help="Last date for backfill (YYYY-MM-DD)")
+    submit_parser.add_argument("--days", type=int,
+                               help="Days for sync or backfill")
+    submit_parser.add_argument("--workers", type=int,
+                               help="Concurrent dates for backfill")
+    submit_parser.add_argument("--skip-push", action="store_true",
+                               help="Don't push to GitHub")
+    submit_parser.add_argument("--skip-summaries", action="store_true",
+                               help="Skip Claude summary generation")
+    submit_parser.add_argument("--no-wait", action="store_true",
+                               help="Return once queued instead of waiting for the result")
+    submit_parser.add_argument("--socket", type=Path,
+                               help="Socket path (default: ~/.autoblog.sock)")
+
+    # Bench command (offline throughput benchmark)
+    bench_parser = subparsers.add_parser(
+        "bench", help="Benchmark the full pipeline on a synthetic corpus with a fake LLM"
+    )
+    bench_parser.add_argument("--days", type=int, default=7,
+                              help="Days of synthetic transcripts (default: 7)")
+    bench_parser.add_argument("--projects", type=int, default=3,
+                              help="Synthetic projects (default: 3)")
+    bench_parser.add_argument("--sessions-per-day", type=int, default=2,
+                              help="Sessions per project per day (default: 2)")
+    bench_parser.add_argument("--turns", type=int, default=20,
+                              help="Conversation turns per session (default: 20)")
+    bench_parser.add_argument("--workers", type=int, default=1,
+                              help="Dates to generate concurrently (default: 1)")
+    bench_parser.add_argument("--latency", type=float, default=0.05,
+                              help="Fake LLM latency per call in seconds (default: 0.05)")
+    bench_parser.add_argument("--jitter", type=float, default=0.0,
+                              help="Fake LLM latency jitter in seconds (default: 0)")
+    bench_parser.add_argument("--failure-rate", type=float, default=0.0,
+                              help="Fraction of fake LLM calls that fail (default: 0)")
+    bench_parser.add_argument("--words", type=int, default=600,
+                              help="Words per fake LLM response (default: 600)")
+    bench_parser.add_argument("--seed", type=int, default=0,
+                              help="Seed for corpus and fake LLM (default: 0)")
+    bench_parser.add_argument("--skip-summaries", action="store_true",
+                              help="Skip summary generation")
+    bench_parser.add_argument("--rate-limit", type=float,
+                              help="Max LLM calls per minute across all workers")
+    bench_parser.add_argument("--llm-backend", metavar="SPEC",
+                              help="Override the fake backend (e.g. claude-cli for a real run)")
+    bench_parser.add_argument("--json", type=Path, dest="json_path",
+                              help="Also write the result as JSON to this path")
+
+    # Bench-scaling command (transcript operations vs. corpus size)
+    scaling_parser = subparsers.add_parser(
+        "bench-scaling", help="Time transcript discovery, indexing, sync and sanitization "
+                              "on synthetic corpora of increasing size"
+    )
+    scaling_parser.add_argument("--sessions", default="100,1000,10000",
+                                help="Comma-separated corpus sizes in sessions "
+                                     "(default: 100,1000,10000)")
+    scaling_parser.add_argument("--layouts", default="local,repo",
+                                help="Comma-separated layouts: local, repo (default: both)")
+    scaling_parser.add_argument("--projects", type=int, default=10,
+                                help="Synthetic projects (default: 10)")
+    scaling_parser.add_argument("--turns", type=int, default=20,
+                                help="Mean conversation turns per session (default: 20)")
+    scaling_parser.add_argument("--secret-density", type=float, default=0.01,
+                                help="Probability a turn leaks a fake secret (default: 0.01)")
+    scaling_parser.add_argument("--seed", type=int, default=0,
+                                help="Corpus seed (default: 0)")
+    scaling_parser.add_argument("--no-memory", action="store_true",
+                                help="Skip peak-memory tracing (faster, more accurate timings)")
+    scaling_parser.add_argument("--json", type=Path, dest="json_path",
+                                help="Also write the measurements as JSON to this path")
+
+    index_bench_parser = subparsers.add_parser(
+        "bench-index", help="Compare project index load and save times across snapshot formats"
+    )
+    index_bench_parser.add_argument("--sessions", default="1000,10000,100000",
+                                    help="Comma-separated index sizes in sessions "
+                                         "(default: 1000,10000,100000)")
+    index_bench_parser.add_argument("--formats",
+                                    help="Comma-separated formats: json, abix, msgpack "
+                                         "(default: all available)")
+    index_bench_parser.add_argument("--projects", type=int, default=10,
+                                    help="Synthetic projects (default: 10)")
+    index_bench_parser.add_argument("--repeat", type=int, default=5,
+                                    help="Best-of repeats per measurement (default: 5)")
+    index_bench_parser.add_argument("--seed", type=int, default=0,
+                                    help="Index seed (default: 0)")
+    index_bench_parser.add_argument("--json", type=Path, dest="json_path",
+                                    help="Also write the measurements as JSON to this path")
+
     # Status command
     subparsers.add_parser("status", help="Show system status")
 
@@ -423,11 +1134,15 @@ def main():
     sync_parser = subparsers.add_parser("sync", help="Sync transcripts to repo")
     sync_parser.add_argument("--days", type=int, default=7,
                              help="Days of transcripts to sync (default: 7)")
+    sync_parser.add_argument("--profile", nargs="?", const="", metavar="DIR",
+                             help=PROFILE_HELP)
 
     # Update command
     update_parser = subparsers.add_parser("update", help="Update project index only")
     update_parser.add_argument("--skip-summaries", action="store_true",
                                help="Skip Claude summary generation")
+    update_parser.add_argument("--profile", nargs="?", const="", metavar="DIR",
+                               help=PROFILE_HELP)
 
     args = parser.parse_args()
 
@@ -435,18 +1150,70 @@ def main():
         parser.print_help()
         return
 
+    if args.command == "submit":
+        sys.exit(submit_job(args))
+
+    if args.command == "bench":
+        sys.exit(bench_command(args))
+
+    if args.command == "bench-scaling":
+        sys.exit(bench_scaling_command(args))
+
+    if args.command == "bench-index":
+        sys.exit(bench_index_command(args))
+
+    llm_backend = None
+    if getattr(args, 'llm_backend', None):
+        from llm_backend import backend_from_spec
+        llm_backend = backend_from_spec(args.llm_backend)
+
     runner = DailyBlogRunner(
-        log_file=getattr(args, 'log_file', None)
+        log_file=getattr(args, 'log_file', None),
+        llm_calls_per_minute=getattr(args, 'rate_limit', None),
+        llm_backend=llm_backend
     )
 
+    runner.lock_wait = getattr(args, 'wait_for_lock', 0)
+    runner.map_reduce = getattr(args, 'map_reduce', False)
+
+    if getattr(args, 'profile', None) is not None:
+        from profiling import default_profile_dir
+        runner.enable_profiling(Path(args.profile) if args.profile else default_profile_dir(args.command))
+
     if args.command == "run":
         success = runner.run(
             date=args.date,
             skip_push=args.skip_push,
-            skip_summaries=args.skip_summaries
+            skip_summaries=args.skip_summaries,
+            sync_days=args.sync_days,
+            from_stage=args.from_stage,
+            until_stage=args.until_stage,
+            force=args.force
         )
         sys.exit(0 if success else 1)
 
+    elif args.command == "backfill":
+        dates = [
+            (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+            for days_ago in range(args.days, 0, -1)
+        ]
+        results = runner.run_backfill(
+            dates,
+            skip_push=args.skip_push,
+            skip_summaries=args.skip_summaries,
+            workers=args.workers
+        )
+        sys.exit(0 if all(results.values()) else 1)
+
+    elif args.command == "serve":
+        from blog_daemon import DEFAULT_SOCKET_PATH, serve
+        serve(
+            runner,
+            socket_path=args.socket or DEFAULT_SOCKET_PATH,
+            max_parallel=args.max_parallel,
+            resource_limits={"llm": args.llm_slots}
+        )
+
     elif args.command == "status":
         status = runner.get_status()
         print("AutoBlog Status")
@@ -454,9 +1221,21 @@ def main():
         print(f"Projects tracked: {status['projects_tracked']}")
         print(f"Total sessions: {status['total_sessions']}")
         print(f"Last index update: {status['last_index_update']}")
+        print(f"Last index scan: {status['last_index_scan']}")
         print(f"Posts generated: {status['posts_generated']}")
         print(f"Repository: {status['repo_dir']}")
 
+        latency = status["latency"]
+        if latency["runs"]:
+            print()
+            print(f"Run latency (last {latency['runs']} successful runs)")
+            print("-" * 40)
+            rows = [("total", latency["total"])]
+            rows += [(name, stats) for name, stats in latency["stages"].items()]
+            rows += [(f"llm:{label}", stats) for label, stats in latency["llm"].items()]
+            for name, stats in rows:
+                print(f"{name:<16} p50 {stats['p50']:7.2f}s   p95 {stats['p95']:7.2f}s   (n={stats['count']})")
+
     elif args.command == "sync":
         success = runner.sync_transcripts(days=args.days)
         sys.exit(0 if success else 1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Offline Extractive Summaries for AutoBlog Daily Logs
+
+When summaries are skipped (--skip-summaries) or the LLM is unavailable,
+daily logs would otherwise keep an empty summary and no key topics. This
+module fills both locally, in milliseconds, from the day's transcripts:
+
+- key_topics: the day's highest TF-IDF terms
+- summary: the sentence whose terms score highest, trimmed to one line
+
+Term weights come from a document-frequency table over every project-day
+summarized so far, so words that appear in every session ("file", "test",
+the project's own name) rank below what made this day different. The
+table lives in a small JSON file next to the index. It is updated
+incrementally, counting each project-day once, and it is local state:
+losing it only resets the weighting.
+
+Summaries written here are marked "summary_source": "extractive" and are
+replaced whenever the LLM later summarizes the same day.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Length of the one-line summary
+SUMMARY_CHARS = 160
+KEY_TOPICS = 5
+
+# Sentences with fewer or more terms than this make poor one-line summaries
+MIN_SENTENCE_TERMS = 2
+MAX_SENTENCE_TERMS = 40
+
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z0-9_+#]*(?:[.-][A-Za-z0-9_+#]+)*")
+_CODE_BLOCK = re.compile(r"```.*?```", re.DOTALL)
+_TOOL_RESULT = re.compile(r"\[Tool Result:.*?\]\s*$", re.DOTALL | re.MULTILINE)
+_TOOL_CALL = re.compile(r"^\[Tool:[^\]]*\]\s*$", re.MULTILINE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+# Speaker prefixes and transcript boilerplate lines
+_SPEAKER = re.compile(r"^\s*(?:\*\*(?:User|Assistant)\*\*:|#+ .*$|- \w[\w ]*: .*$|\*\*\w[\w ]*\*\*: .*$)",
+                      re.MULTILINE)
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being
+below between both but by can could did do does doing done down during each few for from
+further get got had has have having he her here hers him his how i if in into is it its
+itself just let lets like me more most my no nor not now of off on once only or other our
+ours out over own please same she should so some such than that the their theirs them then
+there these they this those through to too under until up us very was we were what when
+where which while who whom why will with would you your yours yourself
+ok okay yes sure thanks thank great good look looking see start starting now need want
+make made use using used add added can't don't i'll i'm it's let's that's there's we're
+you're user assistant claude tool tools result session conversation file files code
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased terms of `text`, without stopwords and very short words."""
+    return [t for t in (m.group(0).lower() for m in _TOKEN.finditer(text))
+            if len(t) > 2 and t not in STOPWORDS]
+
+
+def prose(transcript: str) -> str:
+    """The conversational text of a transcript: no headers, code, tool calls or results."""
+    text = _CODE_BLOCK.sub(" ", transcript)
+    text = _TOOL_RESULT.sub(" ", text)
+    text = _TOOL_CALL.sub(" ", text)
+    return _SPEAKER.sub(" ", text)
+
+
+class TermStats:
+    """
+    Document frequencies over summarized project-days, persisted as JSON.
+
+    Args:
+        path: JSON file holding the table (created on first save)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.docs = 0
+        self.df: Counter = Counter()
+        self._seen: Set[str] = set()
+        self._dirty = False
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.docs = data.get("docs", 0)
+            self.df = Counter(data.get("df", {}))
+            self._seen = set(data.get("seen", []))
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    def add_document(self, key: str, terms: Iterable[str]) -> None:
+        """Count a document's distinct terms once per `key` (e.g. "project/date")."""
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self.docs += 1
+        self.df.update(set(terms))
+        self._dirty = True
+
+    def idf(self, term: str) -> float:
+        # Smoothed, so unseen terms and a tiny corpus still get finite weights
+        return math.log((1 + self.docs) / (1 + self.df.get(term, 0))) + 1.0
+
+    def save(self) -> None:
+        """Write the table if it changed (atomically)."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps({"docs": self.docs, "df": self.df,
+                                        "seen": sorted(self._seen)}))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def summarize(texts: List[str], stats: TermStats, key: Optional[str] = None,
+              exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Extractive summary and key topics for one day's transcripts.
+
+    Args:
+        texts: The day's transcript texts (or leading parts of them)
+        stats: Corpus document frequencies; the day is added under `key` first
+        key: Document key for stats (e.g. "project/date"); None leaves stats alone
+        exclude: Terms never to report as topics (e.g. the project's name)
+
+    Returns:
+        {"summary": str, "key_topics": [str], "summary_source": "extractive"}
+    """
+    body = "\n".join(prose(text) for text in texts)
+    terms = tokenize(body)
+    if key is not None:
+        stats.add_document(key, terms)
+
+    excluded = {t for name in exclude for t in tokenize(name)}
+    tf = Counter(terms)
+    weight = {t: (1 + math.log(n)) * stats.idf(t) for t, n in tf.items() if t not in excluded}
+
+    topics = sorted(weight, key=lambda t: (-weight[t], t))[:KEY_TOPICS]
+
+    best, best_score = "", 0.0
+    for sentence in _SENTENCE_END.split(body):
+        sentence = " ".join(sentence.split())
+        sentence_terms = set(tokenize(sentence))
+        if not MIN_SENTENCE_TERMS <= len(sentence_terms) <= MAX_SENTENCE_TERMS:
+            continue
+        score = sum(weight.get(t, 0.0) for t in sentence_terms) / math.sqrt(len(sentence_terms))
+        if score > best_score:
+            best, best_score = sentence, score
+
+    if len(best) > SUMMARY_CHARS:
+        best = best[:SUMMARY_CHARS].rsplit(" ", 1)[0] + " ..."
+    return {"summary": best, "key_topics": topics, "summary_source": "extractive"}
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Inter-Process Locks for AutoBlog
+
+The launchd trigger, a manual `daily_blog.py run`, the daemon and the
+`project_memory.py update` CLI can all run at once. Two locks keep them
+from stepping on each other:
+
+FileLock guards short read-modify-write cycles on a shared file (the
+project index). It is an advisory fcntl lock on a sidecar ".lock" file, so
+the kernel releases it when the holder exits or crashes; waiting for it
+never needs a staleness check.
+
+RunLock guards a whole generation run, which can take many minutes of LLM
+calls. It is a lock file created exclusively and holding the owner's pid,
+host and start time, so a second runner can say who it is waiting for. A
+lock whose owner is gone is broken. Where the owner can't be checked (it
+runs on another host, or its record is unreadable), a lock older than
+`stale_after` is broken instead.
+"""
+
+import fcntl
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Seconds between attempts while waiting for a lock
+POLL_INTERVAL = 0.1
+
+# A run lock whose owner can't be checked is assumed abandoned after this
+DEFAULT_STALE_AFTER = 2 * 3600
+
+
+class LockTimeout(Exception):
+    """A lock could not be acquired in time. `holder` describes the owner, if known."""
+
+    def __init__(self, path: Path, holder: Optional[Dict[str, Any]] = None):
+        self.path = Path(path)
+        self.holder = holder
+        if holder:
+            since = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(holder.get("started", 0)))
+            message = f"{self.path} is held by pid {holder.get('pid')} since {since}"
+        else:
+            message = f"{self.path} is held by another process"
+        super().__init__(message)
+
+
+class FileLock:
+    """
+    Reentrant advisory lock on `path` (flock), shared safely by threads.
+
+    Args:
+        path: Lock file to create next to the protected file
+        timeout: Default seconds to wait in acquire(); None waits forever
+    """
+
+    def __init__(self, path: Path, timeout: Optional[float] = None):
+        self.path = Path(path)
+        self.timeout = timeout
+        # flock is per open file, so nested and cross-thread use in one
+        # process goes through this lock and a single descriptor
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self, timeout: Optional[float] = -1) -> None:
+        """
+        Block until the lock is held.
+
+        Args:
+            timeout: Seconds to wait (None: forever; default: the lock's timeout)
+
+        Raises:
+            LockTimeout: If another process still holds it after `timeout`
+        """
+        if timeout == -1:
+            timeout = self.timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        if not self._thread_lock.acquire(timeout=-1 if timeout is None else max(timeout, 0)):
+            raise LockTimeout(self.path)
+        if self._depth:
+            self._depth += 1
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        os.close(fd)
+                        raise LockTimeout(self.path)
+                    time.sleep(POLL_INTERVAL)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._fd = fd
+        self._depth = 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    @property
+    def depth(self) -> int:
+        """How many times this process currently holds the lock (0: not held)."""
+        return self._depth
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class RunLock:
+    """
+    Exclusive lock for a whole run, with stale-lock recovery.
+
+    Args:
+        path: Lock file
+        stale_after: Seconds after which a lock whose owner can't be checked
+            is considered abandoned
+    """
+
+    def __init__(self, path: Path, stale_after: float = DEFAULT_STALE_AFTER):
+        self.path = Path(path)
+        self.stale_after = stale_after
+        self._token: Optional[str] = None
+
+    def holder(self) -> Optional[Dict[str, Any]]:
+        """The current owner's record (pid, host, started), or None if unlocked."""
+        try:
+            return json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError):
+            # Being written right now, or garbage; report an unknown owner
+            return {}
+
+    def is_stale(self, holder: Dict[str, Any]) -> bool:
+        """
+        Whether `holder` has given up the lock.
+
+        A holder on this host is stale exactly when its process has exited,
+        however long it has been running. Only when that can't be checked
+        (another host, or an unreadable record) is it judged by stale_after.
+        """
+        if holder.get("host") == socket.gethostname() and isinstance(holder.get("pid"), int):
+            return not _pid_alive(holder["pid"])
+        started = holder.get("started")
+        if not isinstance(started, (int, float)):
+            # Unreadable record: judge it by the file's age instead
+            try:
+                started = self.path.stat().st_mtime
+            except OSError:
+                return False
+        return time.time() - started > self.stale_after
+
+    def acquire(self, timeout: float = 0) -> None:
+        """
+        Take the lock, breaking it first if it is stale.
+
+        Args:
+            timeout: Seconds to wait for a live owner to finish (0: don't wait)
+
+        Raises:
+            LockTimeout: If a live owner still holds the lock after `timeout`
+        """
+        deadline = time.monotonic() + timeout
+        token = f"{os.getpid()}-{time.time_ns()}"
+        record = json.dumps({"pid": os.getpid(), "host": socket.gethostname(),
+                             "started": time.time(), "token": token})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        while True:
+            try:
+                fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                holder = self.holder()
+                if holder is None:
+                    continue  # released between our attempts
+                if self.is_stale(holder):
+                    self._break(holder)
+                    continue
+                if time.monotonic() >= deadline:
+                    raise LockTimeout(self.path, holder)
+                time.sleep(POLL_INTERVAL)
+                continue
+            with os.fdopen(fd, 'w') as f:
+                f.write(record)
+            self._token = token
+            return
+
+    def _break(self, holder: Dict[str, Any]) -> None:
+        # Only remove the record we judged stale, not one a racing process just wrote
+        if self.holder() == holder:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def release(self) -> None:
+        """Remove the lock file if this instance still owns it."""
+        holder = self.holder()
+        if holder and holder.get("token") == self._token:
+            self.path.unlink()
+        self._token = None
+
+    def __enter__(self) -> "RunLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by someone else
+    return True
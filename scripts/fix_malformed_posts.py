@@ -11,6 +11,10 @@ import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from post_catalog import PostCatalog
+
 
 def clean_content(content: str) -> tuple:
     """
@@ -239,7 +243,7 @@ def main():
     if args.file:
         files = [posts_dir / args.file]
     else:
-        files = list(posts_dir.glob("*daily-development-log-january-14-2026*.md"))
+        files = PostCatalog(posts_dir).find_by_slug("daily-development-log-january-14-2026")
 
     if not files:
         print("No malformed posts found")
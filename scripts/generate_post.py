@@ -2,28 +2,32 @@
 """
 Multi-Pass Blog Post Generator for AutoBlog
 
-Generates polished blog posts using a 4-pass Claude CLI pipeline:
+Generates polished blog posts using a 4-pass Claude pipeline (CLI with API
+fallback by default; see llm_backend.py for the alternatives):
 1. Draft - Initial blog post from transcripts
 2. Review - Critique and identify improvements
 3. Revise - Implement improvements
 4. Polish - Final readability pass
+
+With map_reduce set, large days first condense each session into a digest
+in parallel, and the draft is written from the digests (see session_digest.py).
 """
 
 import json
-import os
 import re
-import subprocess
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
-# Try to import anthropic for API fallback
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+from content_handle import as_handle, read_content
+from content_sampler import sample_session
+from llm_backend import ClaudeBackend, LLMBackend
+from rate_limiter import TokenBucket
+from run_metrics import LLMCall, RunMetrics
+from session_digest import (DIGEST_INPUT_CHARS, DIGEST_MIN_BYTES, DIGEST_PROMPT, DIGEST_WORKERS,
+                            MAP_REDUCE_MIN_BYTES, DigestCache, content_hash)
 
 
 @dataclass
@@ -37,6 +41,10 @@ class GenerationResult:
     error: Optional[str] = None
 
 
+# Characters of each transcript included in the draft prompt
+MAX_TRANSCRIPT_CHARS = 8000
+
+
 # Prompt templates for each pass
 DRAFT_PROMPT = """You are writing a blog post about my day coding with Claude Code.
 
@@ -128,9 +136,21 @@ Write the final polished blog post in full:"""
 class BlogGenerator:
     """Generates polished blog posts using multi-pass Claude CLI pipeline."""
 
-    def __init__(self, posts_dir: Optional[Path] = None):
+    def __init__(self, posts_dir: Optional[Path] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 llm_backend: Optional[LLMBackend] = None):
         self.posts_dir = posts_dir or Path(__file__).parent.parent / "_posts"
         self.posts_dir.mkdir(parents=True, exist_ok=True)
+        # Shared across generators so concurrent workers respect one global rate
+        self.rate_limiter = rate_limiter
+        # Claude CLI with API fallback unless a backend (e.g. the fake) is given
+        self.llm_backend = llm_backend or ClaudeBackend()
+        # Set by the runner for the duration of a run to record every call
+        self.metrics: Optional[RunMetrics] = None
+        # Digest the sessions of large days before drafting (see session_digest.py)
+        self.map_reduce = False
+        self.digest_cache: Optional[DigestCache] = None
+        self.digest_workers = DIGEST_WORKERS
 
     def generate(self, context: Dict[str, Any]) -> GenerationResult:
         """
@@ -159,13 +179,7 @@ class BlogGenerator:
                     error="No transcripts found for today"
                 )
 
-            # Pass 1: Draft
-            print("Pass 1/4: Generating draft...")
-            draft = self._call_claude(DRAFT_PROMPT.format(
-                transcripts=transcripts_text,
-                history=history_text
-            ))
-            passes["draft"] = draft
+            draft = self.draft_pass(transcripts_text, history_text, passes)
 
             if not draft:
                 return GenerationResult(
@@ -177,54 +191,11 @@ class BlogGenerator:
                     error="Failed to generate draft"
                 )
 
-            # Pass 2: Review
-            print("Pass 2/4: Reviewing draft...")
-            review = self._call_claude(REVIEW_PROMPT.format(draft=draft))
-            passes["review"] = review
-
-            if not review:
-                # Continue with draft if review fails
-                print("Warning: Review failed, continuing with draft")
-                review = "No specific improvements identified."
-
-            # Pass 3: Revise
-            print("Pass 3/4: Revising based on feedback...")
-            revised = self._call_claude(REVISE_PROMPT.format(
-                draft=draft,
-                feedback=review
-            ))
-            passes["revised"] = revised
-
-            if not revised:
-                # Fall back to draft if revision fails
-                print("Warning: Revision failed, using draft")
-                revised = draft
-
-            # Pass 4: Polish
-            print("Pass 4/4: Final polish...")
-            final = self._call_claude(POLISH_PROMPT.format(post=revised))
-            passes["final"] = final
-
-            if not final:
-                # Fall back to revised if polish fails
-                print("Warning: Polish failed, using revised version")
-                final = revised
-
-            # Clean up Claude's output (strip code fences, preamble, etc.)
-            final = self._clean_claude_output(final)
-
-            # Extract title and format
-            title = self._extract_title(final)
-            filename = self._generate_filename(context.get("date"), title)
-            content = self._format_jekyll_post(final, context.get("date"), title)
+            review = self.review_pass(draft, passes)
+            revised = self.revise_pass(draft, review, passes)
+            final = self.polish_pass(revised, passes)
 
-            return GenerationResult(
-                success=True,
-                title=title,
-                content=content,
-                filename=filename,
-                passes=passes
-            )
+            return self.finalize(final, context.get("date"), passes)
 
         except Exception as e:
             return GenerationResult(
@@ -236,93 +207,168 @@ class BlogGenerator:
                 error=str(e)
             )
 
-    def _call_claude(self, prompt: str, timeout: int = 300) -> str:
-        """
-        Call Claude with a prompt, trying CLI first, then API fallback.
-
-        The API fallback is used when ANTHROPIC_API_KEY is set (e.g., in GitHub Actions).
-        """
-        # Check if we should use API directly (e.g., in CI environment)
-        api_key = os.environ.get('ANTHROPIC_API_KEY')
-        use_api = os.environ.get('USE_ANTHROPIC_API', '').lower() == 'true'
-
-        if use_api and api_key and ANTHROPIC_AVAILABLE:
-            return self._call_claude_api(prompt, api_key, timeout)
-
-        # Try CLI first
-        cli_result = self._call_claude_cli(prompt, timeout)
-        if cli_result:
-            return cli_result
-
-        # Fall back to API if CLI fails and API is available
-        if api_key and ANTHROPIC_AVAILABLE:
-            print("CLI failed, falling back to Anthropic API...")
-            return self._call_claude_api(prompt, api_key, timeout)
+    def draft_pass(self, transcripts_text: str, history_text: str,
+                   passes: Optional[Dict[str, str]] = None) -> str:
+        """Pass 1: write the initial draft. Returns "" on failure."""
+        print("Pass 1/4: Generating draft...")
+        draft = self._call_claude(DRAFT_PROMPT.format(
+            transcripts=transcripts_text,
+            history=history_text
+        ), label="draft")
+        if passes is not None:
+            passes["draft"] = draft
+        return draft
 
-        return ""
+    def review_pass(self, draft: str, passes: Optional[Dict[str, str]] = None) -> str:
+        """Pass 2: critique the draft."""
+        print("Pass 2/4: Reviewing draft...")
+        review = self._call_claude(REVIEW_PROMPT.format(draft=draft), label="review")
+        if passes is not None:
+            passes["review"] = review
 
-    def _call_claude_cli(self, prompt: str, timeout: int = 300) -> str:
-        """Call Claude via CLI."""
-        try:
-            result = subprocess.run(
-                ['claude', '--print', '-p', prompt],
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+        if not review:
+            # Continue with draft if review fails
+            print("Warning: Review failed, continuing with draft")
+            review = "No specific improvements identified."
+        return review
+
+    def revise_pass(self, draft: str, review: str,
+                    passes: Optional[Dict[str, str]] = None) -> str:
+        """Pass 3: implement the review feedback."""
+        print("Pass 3/4: Revising based on feedback...")
+        revised = self._call_claude(REVISE_PROMPT.format(
+            draft=draft,
+            feedback=review
+        ), label="revise")
+        if passes is not None:
+            passes["revised"] = revised
 
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                print(f"Claude CLI error: {result.stderr}")
-                return ""
+        if not revised:
+            # Fall back to draft if revision fails
+            print("Warning: Revision failed, using draft")
+            revised = draft
+        return revised
+
+    def polish_pass(self, revised: str, passes: Optional[Dict[str, str]] = None) -> str:
+        """Pass 4: final readability polish."""
+        print("Pass 4/4: Final polish...")
+        final = self._call_claude(POLISH_PROMPT.format(post=revised), label="polish")
+        if passes is not None:
+            passes["final"] = final
 
-        except subprocess.TimeoutExpired:
-            print(f"Claude CLI timed out after {timeout}s")
-            return ""
-        except FileNotFoundError:
-            print("Claude CLI not found")
-            return ""
-        except Exception as e:
-            print(f"Claude CLI exception: {e}")
-            return ""
+        if not final:
+            # Fall back to revised if polish fails
+            print("Warning: Polish failed, using revised version")
+            final = revised
+        return final
+
+    def finalize(self, final: str, date: Optional[str],
+                 passes: Optional[Dict[str, str]] = None) -> GenerationResult:
+        """Clean the polished text and package it as a Jekyll post."""
+        # Clean up Claude's output (strip code fences, preamble, etc.)
+        final = self._clean_claude_output(final)
+
+        # Extract title and format
+        title = self._extract_title(final)
+        filename = self._generate_filename(date, title)
+        content = self._format_jekyll_post(final, date, title)
+
+        return GenerationResult(
+            success=True,
+            title=title,
+            content=content,
+            filename=filename,
+            passes=passes if passes is not None else {}
+        )
+
+    def _call_claude(self, prompt: str, timeout: int = 300, label: str = "llm") -> str:
+        """
+        Call Claude through the configured backend.
 
-    def _call_claude_api(self, prompt: str, api_key: str, timeout: int = 300) -> str:
-        """Call Claude via Anthropic API directly."""
-        try:
-            client = anthropic.Anthropic(api_key=api_key)
-
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+        Waits for the shared rate limiter first. If self.metrics is set, the
+        call is recorded there under `label`.
+        """
+        call = LLMCall(label=label, prompt_chars=len(prompt))
+        if self.rate_limiter is not None:
+            call.rate_limit_wait = self.rate_limiter.acquire()
 
-            if message.content and len(message.content) > 0:
-                return message.content[0].text
-            return ""
+        start = time.perf_counter()
+        response = self.llm_backend.complete(prompt, timeout, call)
 
-        except Exception as e:
-            print(f"Anthropic API error: {e}")
-            return ""
+        call.wall = time.perf_counter() - start
+        call.response_chars = len(response)
+        call.ok = bool(response)
+        if self.metrics is not None:
+            self.metrics.record_llm_call(call)
+        return response
 
     def _format_transcripts(self, transcripts: List[Dict[str, Any]]) -> str:
-        """Format today's transcripts for the prompt."""
+        """Format today's transcripts for the prompt (as digests for large days in map-reduce mode)."""
         if not transcripts:
             return ""
 
+        if self.map_reduce:
+            total = sum(as_handle(t.get("content", "")).size for t in transcripts)
+            if total > MAP_REDUCE_MIN_BYTES:
+                return self._format_digests(transcripts)
+
         sections = []
         for t in transcripts:
             project = t.get("project", "Unknown Project")
-            content = t.get("content", "")
+            content = self._truncated_transcript(t.get("content", ""))
+            sections.append(f"### Project: {project}\n\n{content}")
+
+        return "\n\n---\n\n".join(sections)
 
-            # Truncate very long transcripts
-            if len(content) > 8000:
-                content = content[:8000] + "\n\n[... transcript truncated ...]"
+    def _truncated_transcript(self, content: Any) -> str:
+        """A transcript cut to MAX_TRANSCRIPT_CHARS, marked if anything was cut."""
+        # One extra char tells us whether there was more, without reading the rest of the file
+        text = read_content(content, limit=MAX_TRANSCRIPT_CHARS + 1)
+        if len(text) > MAX_TRANSCRIPT_CHARS:
+            text = text[:MAX_TRANSCRIPT_CHARS] + "\n\n[... transcript truncated ...]"
+        return text
 
-            sections.append(f"### Project: {project}\n\n{content}")
+    def _format_digests(self, transcripts: List[Dict[str, Any]]) -> str:
+        """
+        Map step: one digest per session, written in parallel, cached by content.
+
+        Short sessions are used as they are. A digest call that fails falls
+        back to the session's start, truncated as in the single-prompt mode,
+        and is not cached.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        sections: List[Optional[str]] = [None] * len(transcripts)
+        pending = []
+        for i, t in enumerate(transcripts):
+            project = t.get("project", "Unknown Project")
+            handle = as_handle(t.get("content", ""))
+            if handle.size <= DIGEST_MIN_BYTES:
+                sections[i] = f"### Project: {project}\n\n{handle.read()}"
+                continue
+            key = self.digest_cache.key(project, content_hash(handle)) if self.digest_cache else None
+            cached = self.digest_cache.get(key) if key else None
+            if cached:
+                sections[i] = f"### Project: {project} (session digest)\n\n{cached}"
+            else:
+                pending.append((i, project, handle, key))
+
+        def digest(project: str, handle) -> str:
+            prompt = DIGEST_PROMPT.format(project=project,
+                                          transcript=sample_session(handle, DIGEST_INPUT_CHARS))
+            return self._call_claude(prompt, timeout=120, label="digest").strip()
+
+        if pending:
+            print(f"Digesting {len(pending)} sessions...")
+            with ThreadPoolExecutor(max_workers=max(1, self.digest_workers)) as executor:
+                results = list(executor.map(lambda job: digest(job[1], job[2]), pending))
+            for (i, project, handle, key), text in zip(pending, results):
+                if text:
+                    if key:
+                        self.digest_cache.put(key, text)
+                    sections[i] = f"### Project: {project} (session digest)\n\n{text}"
+                else:
+                    sections[i] = f"### Project: {project}\n\n{self._truncated_transcript(handle)}"
 
         return "\n\n---\n\n".join(sections)
 
@@ -343,11 +389,20 @@ class BlogGenerator:
 - Total sessions: {total}
 - Summary: {summary}"""
 
-            # Add recent session summaries
+            # Longer arc first: monthly, then weekly rollups (see rollups.py)
+            for key, heading in (("monthly", "Earlier months"), ("weekly", "Recent weeks")):
+                rollups = [(period, r.get("summary", "")) for period, r in h.get(key, {}).items()]
+                rollups = [(period, summary) for period, summary in rollups if summary]
+                if rollups:
+                    section += f"\n- {heading}:"
+                    for period, summary in rollups:
+                        section += f"\n  - {period}: {summary}"
+
+            # Earlier days, already chosen by relevance within a budget (see history_search.py)
             recent = h.get("recent_sessions", {})
             if recent:
-                section += "\n- Recent work:"
-                for date, log in sorted(recent.items())[-3:]:
+                section += "\n- Related earlier work:"
+                for date, log in sorted(recent.items()):
                     log_summary = log.get("summary", "")
                     if log_summary:
                         section += f"\n  - {date}: {log_summary}"
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Git Publishing for AutoBlog
+
+Collects every post and index change from a run into a single commit and a
+single push. All commands run with `git -C <repo>` so the process working
+directory is never changed.
+"""
+
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+MAX_PUSH_ATTEMPTS = 3
+PUSH_RETRY_DELAY = 2.0
+
+
+@dataclass
+class PublishResult:
+    """Result of a publish (commit + push)."""
+    success: bool
+    committed: bool = False
+    pushed: bool = False
+    push_attempts: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class GitPublisher:
+    """Stages, commits and pushes a batch of files in one go."""
+
+    def __init__(self, repo_dir: Path, logger=None,
+                 max_push_attempts: int = MAX_PUSH_ATTEMPTS,
+                 retry_delay: float = PUSH_RETRY_DELAY,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.repo_dir = Path(repo_dir)
+        self.logger = logger
+        self.max_push_attempts = max_push_attempts
+        self.retry_delay = retry_delay
+        self._sleep = sleep
+
+    def _log(self, message: str) -> None:
+        if self.logger is not None:
+            self.logger.info(message)
+
+    def _git(self, timings: Dict[str, float], step: str, *args: str,
+             check: bool = False) -> subprocess.CompletedProcess:
+        """Run a git command against the repo and add its duration to `step`."""
+        start = time.perf_counter()
+        try:
+            return subprocess.run(
+                ['git', '-C', str(self.repo_dir), *args],
+                capture_output=True,
+                text=True,
+                check=check
+            )
+        finally:
+            timings[step] = timings.get(step, 0.0) + time.perf_counter() - start
+
+    def publish(self, paths: List[Path], message: str,
+                optional_paths: Optional[List[Path]] = None) -> PublishResult:
+        """
+        Commit `paths` (plus any `optional_paths` git will accept) and push.
+
+        Args:
+            paths: Files that must be staged (e.g. new posts)
+            message: Commit message
+            optional_paths: Files staged if possible, e.g. the project index,
+                which may be gitignored
+
+        Returns:
+            PublishResult with per-step timings in seconds
+        """
+        result = PublishResult(success=False)
+        timings = result.timings
+
+        try:
+            check = self._git(timings, "rev-parse", 'rev-parse', '--git-dir')
+            if check.returncode != 0:
+                result.error = "Not a git repository"
+                return result
+
+            if paths:
+                self._git(timings, "add", 'add', '--', *[str(p) for p in paths], check=True)
+            existing_optional = [str(p) for p in (optional_paths or []) if Path(p).exists()]
+            if existing_optional:
+                self._git(timings, "add", 'add', '--', *existing_optional)
+
+            diff = self._git(timings, "diff", 'diff', '--cached', '--quiet')
+            if diff.returncode == 0:
+                self._log("  No changes to commit")
+                result.success = True
+                return result
+
+            self._git(timings, "commit", 'commit', '-m', message, check=True)
+            result.committed = True
+
+            result.pushed = self._push_with_retry(result)
+            result.success = result.pushed
+            if not result.pushed and result.error is None:
+                result.error = "Push failed"
+            return result
+
+        except subprocess.CalledProcessError as e:
+            result.error = f"Git operation failed: {e}"
+            return result
+        finally:
+            self._log("  Git timings: " + ", ".join(
+                f"{step} {seconds:.2f}s" for step, seconds in timings.items()
+            ))
+
+    def _push_with_retry(self, result: PublishResult) -> bool:
+        """Push, rebasing onto the remote and retrying when the push is rejected."""
+        timings = result.timings
+
+        for attempt in range(1, self.max_push_attempts + 1):
+            result.push_attempts = attempt
+            push = self._git(timings, "push", 'push')
+            if push.returncode == 0:
+                return True
+
+            self._log(f"  Push attempt {attempt} failed: {push.stderr.strip()}")
+            if attempt == self.max_push_attempts:
+                break
+
+            # Remote moved on (e.g. another machine pushed): replay our commit on top
+            rebase = self._git(timings, "pull-rebase", 'pull', '--rebase', '--autostash')
+            if rebase.returncode != 0:
+                self._git(timings, "pull-rebase", 'rebase', '--abort')
+                result.error = f"Rebase onto remote failed: {rebase.stderr.strip()}"
+                return False
+
+            self._sleep(self.retry_delay * attempt)
+
+        return False
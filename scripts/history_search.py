@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Relevance-Ranked Project History for the AutoBlog Draft Prompt
+
+The draft prompt's history used to be each project's last few days,
+whether or not they had anything to do with today. HistoryIndex is a
+BM25 inverted index over every daily log's summary and key topics.
+relevant_logs() uses it to pick the earlier days that best match today's
+transcripts, within a fixed character budget.
+
+The index lives in memory next to the IndexModel. sync() brings it up to
+date by comparing a digest of each log's summary and topics with the one
+it indexed, so only new or changed days are tokenized again. sync() and
+search() hold a lock, so one index can serve several backfill threads.
+"""
+
+import math
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from extractive import prose, tokenize
+from index_model import ProjectTimeline
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+# Characters of daily summaries per project in the prompt (about 200 tokens)
+HISTORY_CHARS = 800
+HISTORY_DAYS = 5
+
+# Most frequent terms of today's transcripts used as the query
+MAX_QUERY_TERMS = 40
+
+DocKey = Tuple[str, str]  # (project, date)
+
+
+class HistoryIndex:
+    """BM25 index over daily logs; see the module docstring."""
+
+    __slots__ = ("postings", "_docs", "_lengths", "_sources", "_total_length", "_lock")
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[DocKey, int]] = {}
+        self._docs: Dict[DocKey, Counter] = {}
+        self._lengths: Dict[DocKey, int] = {}
+        self._sources: Dict[DocKey, int] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def sync(self, projects: Dict[str, Any]) -> int:
+        """
+        Index new and changed daily logs and drop removed ones.
+
+        Args:
+            projects: The index's "projects" dict
+
+        Returns:
+            Number of logs (re)indexed or removed
+        """
+        with self._lock:
+            changed = 0
+            seen = set()
+            for project, data in projects.items():
+                for date, log in data.get("daily_logs", {}).items():
+                    key = (project, date)
+                    seen.add(key)
+                    topics = log.get("key_topics", [])
+                    source = hash((log.get("summary", ""), tuple(topics)))
+                    if self._sources.get(key) == source:
+                        continue
+                    self._remove(key)
+                    self._add(key, tokenize(" ".join([log.get("summary", ""), *topics])))
+                    self._sources[key] = source
+                    changed += 1
+            for key in [key for key in self._sources if key not in seen]:
+                self._remove(key)
+                del self._sources[key]
+                changed += 1
+            return changed
+
+    def _add(self, key: DocKey, terms: List[str]) -> None:
+        counts = Counter(terms)
+        self._docs[key] = counts
+        self._lengths[key] = len(terms)
+        self._total_length += len(terms)
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[key] = tf
+
+    def _remove(self, key: DocKey) -> None:
+        counts = self._docs.pop(key, None)
+        if counts is None:
+            return
+        self._total_length -= self._lengths.pop(key)
+        for term in counts:
+            docs = self.postings[term]
+            del docs[key]
+            if not docs:
+                del self.postings[term]
+
+    def search(self, query: Iterable[str], project: str,
+               before: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Rank a project's days by BM25 score against `query`.
+
+        Args:
+            query: Query terms (duplicates are ignored)
+            project: Only this project's days are ranked
+            before: Only days earlier than this YYYY-MM-DD
+
+        Returns:
+            (date, score) pairs with a positive score, best first
+        """
+        with self._lock:
+            count = len(self._docs)
+            if not count:
+                return []
+            avgdl = self._total_length / count or 1.0
+            scores: Dict[str, float] = {}
+            for term in set(query):
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+                for key, tf in docs.items():
+                    doc_project, date = key
+                    if doc_project != project or (before is not None and date >= before):
+                        continue
+                    norm = tf + K1 * (1 - B + B * self._lengths[key] / avgdl)
+                    scores[date] = scores.get(date, 0.0) + idf * tf * (K1 + 1) / norm
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def query_terms(texts: Iterable[str], limit: int = MAX_QUERY_TERMS) -> List[str]:
+    """The `limit` most frequent terms of today's transcript texts (see extractive.prose)."""
+    counts = Counter(term for text in texts for term in tokenize(prose(text)))
+    return [term for term, _ in counts.most_common(limit)]
+
+
+def relevant_logs(history: HistoryIndex, timeline: ProjectTimeline, query: List[str],
+                  before: str, budget: int = HISTORY_CHARS,
+                  max_days: int = HISTORY_DAYS) -> Dict[str, Any]:
+    """
+    Daily logs for a project's history in the prompt.
+
+    The latest day before `before` always comes first, for continuity. The rest
+    are the best BM25 matches for `query`. Without a query or matches, the
+    most recent days are used instead. Days without a summary are skipped.
+    Selection stops at `max_days` days or `budget` characters of summaries.
+
+    Returns:
+        {date: log}, oldest first
+    """
+    logs = timeline.data.get("daily_logs", {})
+    recent = list(reversed(timeline.recent_dates(before, count=len(timeline.dates))))
+    ranked = [date for date, _ in history.search(query, timeline.name, before)] if query else []
+    candidates = recent[:1] + ranked if ranked else recent
+
+    chosen: List[str] = []
+    used = 0
+    for date in candidates:
+        summary = logs[date].get("summary", "")
+        if not summary or date in chosen:
+            continue
+        if used + len(summary) > budget and chosen:
+            continue
+        chosen.append(date)
+        used += len(summary)
+        if len(chosen) >= max_days or used >= budget:
+            break
+    return {date: logs[date] for date in sorted(chosen)}
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+On-Disk Formats for the AutoBlog Project Index
+
+The index snapshot's format follows its file extension:
+
+    .json     Indented JSON (the default, and what gets committed)
+    .abix     Binary: a small versioned header and a marshal payload
+    .msgpack  MessagePack (needs the optional msgpack package)
+
+.abix uses only the standard library. marshal is a C codec for Python's
+core types and does not call arbitrary constructors the way pickle does.
+It deduplicates strings through a reference table, so project names,
+dates and repeated topics are stored and loaded once. Binary snapshots are
+memory-mapped and decoded straight from the mapping.
+
+Like pickle, marshal is not meant for untrusted input. An index is
+local data written by AutoBlog itself, so that is fine here.
+
+The journal (index_store.py) is JSON lines in every format; only the
+snapshot changes. convert_index() converts between formats in either
+direction.
+"""
+
+import json
+import marshal
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict
+
+# msgpack is only needed for .msgpack indexes
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+ABIX_MAGIC = b"ABIX"
+ABIX_VERSION = 1
+# marshal format written into .abix files (readable by every Python 3.4+)
+MARSHAL_VERSION = 4
+
+# magic, layout version, marshal version, payload length
+_ABIX_HEADER = struct.Struct("<4sBBxxQ")
+
+FORMATS = {".json": "json", ".abix": "abix", ".msgpack": "msgpack"}
+
+
+class IndexFormatError(ValueError):
+    """An index file is not in the format its extension promises."""
+
+
+class IndexVersionError(IndexFormatError):
+    """An index file was written by a newer AutoBlog; it is not damaged, just unreadable here."""
+
+
+def index_format(path: Path) -> str:
+    """Format name for an index path, from its extension (unknown extensions are JSON)."""
+    return FORMATS.get(Path(path).suffix.lower(), "json")
+
+
+def dumps_index(index: Dict[str, Any], fmt: str) -> bytes:
+    """Encode an index in the given format."""
+    if fmt == "abix":
+        payload = marshal.dumps(index, MARSHAL_VERSION)
+        return _ABIX_HEADER.pack(ABIX_MAGIC, ABIX_VERSION, MARSHAL_VERSION, len(payload)) + payload
+    if fmt == "msgpack":
+        _require_msgpack()
+        return msgpack.packb(index, use_bin_type=True, default=str)
+    return json.dumps(index, indent=2, default=str).encode('utf-8')
+
+
+def loads_index(data: bytes, fmt: str) -> Dict[str, Any]:
+    """
+    Decode an index (any bytes-like object, e.g. a memory map).
+
+    Raises:
+        IndexVersionError: If the data is in a newer version of `fmt`
+        IndexFormatError: If the data is not a valid index in `fmt`
+    """
+    try:
+        if fmt == "abix":
+            return _loads_abix(data)
+        if fmt == "msgpack":
+            _require_msgpack()
+            index = msgpack.unpackb(data, raw=False, strict_map_key=False)
+        else:
+            index = json.loads(bytes(data))
+    except IndexFormatError:
+        raise
+    except (ValueError, EOFError, TypeError) as e:
+        # JSONDecodeError, marshal's ValueError/EOFError, msgpack's ValueError subclasses
+        raise IndexFormatError(f"Invalid {fmt} index: {e}") from e
+    if not isinstance(index, dict):
+        raise IndexFormatError(f"Invalid {fmt} index: not a mapping")
+    return index
+
+
+def _loads_abix(data: bytes) -> Dict[str, Any]:
+    if len(data) < _ABIX_HEADER.size:
+        raise IndexFormatError("Invalid abix index: truncated header")
+    magic, version, marshal_version, length = _ABIX_HEADER.unpack_from(data)
+    if magic != ABIX_MAGIC:
+        raise IndexFormatError("Invalid abix index: bad magic")
+    if version > ABIX_VERSION or marshal_version > marshal.version:
+        raise IndexVersionError(
+            f"abix index version {version}/{marshal_version} is newer than this AutoBlog supports"
+        )
+    if len(data) - _ABIX_HEADER.size != length:
+        raise IndexFormatError("Invalid abix index: truncated payload")
+    with memoryview(data) as view, view[_ABIX_HEADER.size:] as payload:
+        index = marshal.loads(payload)
+    if not isinstance(index, dict):
+        raise IndexFormatError("Invalid abix index: not a mapping")
+    return index
+
+
+def _require_msgpack() -> None:
+    if not MSGPACK_AVAILABLE:
+        raise ImportError("msgpack is required for .msgpack project indexes")
+
+
+def read_index(path: Path) -> Dict[str, Any]:
+    """
+    Read an index file in the format its extension names.
+
+    Raises:
+        OSError: If the file can't be read
+        IndexVersionError: If it was written in a newer format version
+        IndexFormatError: If it isn't a valid index
+    """
+    fmt = index_format(path)
+    with open(path, 'rb') as f:
+        if fmt == "json":
+            return loads_index(f.read(), fmt)
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file: nothing to map
+            return loads_index(b"", fmt)
+        with mapped:
+            return loads_index(mapped, fmt)
+
+
+def convert_index(source: Path, destination: Path) -> Dict[str, Any]:
+    """
+    Write the index at `source` (snapshot plus journal) to `destination`,
+    in the format of each one's extension.
+
+    Returns:
+        The converted index
+
+    Raises:
+        FileNotFoundError: If there is no index at `source`
+    """
+    from index_store import IndexStore
+
+    store = IndexStore(source)
+    if not store.snapshot_path.exists() and not store.has_journal():
+        raise FileNotFoundError(f"No index at {source}")
+    index = store.load()
+    IndexStore(destination).compact(index)
+    return index
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+In-Memory Model of the AutoBlog Project Index
+
+The index is persisted (and journaled, see index_store.py) as plain JSON:
+projects -> daily_logs -> {"sessions": [...], "summary", "key_topics"}.
+That shape is awkward to query. A session membership test scans a list,
+the session total is re-summed over every project, and "the last five
+days before D" sorts a project's whole log.
+
+IndexModel sits on top of that dict and keeps what queries need:
+- per-day session-id sets
+- a running session total
+- each project's dates as a sorted list, searched with bisect
+
+It writes through to the dict, which stays the single source of truth
+for persistence. Structural changes (new projects, days, sessions) should
+go through add_session(). Summaries and other fields can still be edited
+in the dict directly.
+"""
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class ProjectTimeline:
+    """One project's days, kept sorted, with a session-id set per day."""
+
+    __slots__ = ("name", "data", "_dates", "_sessions")
+
+    def __init__(self, name: str, data: Dict[str, Any]):
+        """
+        Args:
+            name: Project name
+            data: The project's entry in the index dict (modified in place)
+        """
+        self.name = name
+        self.data = data
+        self._dates: List[str] = sorted(data.get("daily_logs", {}))
+        self._sessions: Dict[str, Set[str]] = {}
+
+    @property
+    def dates(self) -> List[str]:
+        """The project's dates in order (do not modify)."""
+        logs = self.data.get("daily_logs", {})
+        if len(self._dates) != len(logs):
+            # A day was added or removed in the dict directly; resync
+            self._dates = sorted(logs)
+        return self._dates
+
+    def session_ids(self, date: str) -> Set[str]:
+        """Session ids recorded for `date` (empty if none)."""
+        log = self.data.get("daily_logs", {}).get(date)
+        if log is None:
+            return set()
+        ids = self._sessions.get(date)
+        if ids is None or len(ids) != len(log["sessions"]):
+            ids = self._sessions[date] = set(log["sessions"])
+        return ids
+
+    def add_session(self, date: str, session_id: str) -> bool:
+        """
+        Record a session, creating its day if needed.
+
+        Returns:
+            True if the session was new
+        """
+        logs = self.data.setdefault("daily_logs", {})
+        if date not in logs:
+            logs[date] = {"sessions": [], "summary": "", "key_topics": []}
+            insort(self.dates, date)
+        elif session_id in self.session_ids(date):
+            return False
+
+        logs[date]["sessions"].append(session_id)
+        self.session_ids(date).add(session_id)
+        self.data["total_sessions"] = self.data.get("total_sessions", 0) + 1
+        if date > self.data.get("last_touched", ""):
+            self.data["last_touched"] = date
+        return True
+
+    def recent_dates(self, before: Optional[str] = None, count: int = 5) -> List[str]:
+        """The last `count` dates, optionally only those earlier than `before`."""
+        dates = self.dates
+        end = len(dates) if before is None else bisect_left(dates, before)
+        return dates[max(0, end - count):end]
+
+    def recent_logs(self, before: Optional[str] = None, count: int = 5) -> Dict[str, Any]:
+        """Daily logs for recent_dates(), oldest first."""
+        logs = self.data["daily_logs"]
+        return {date: logs[date] for date in self.recent_dates(before, count)}
+
+
+class IndexModel:
+    """Typed view over an index dict; see the module docstring."""
+
+    __slots__ = ("data", "_projects", "total_sessions")
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Args:
+            data: The index dict ({"last_updated", "projects"}), modified in place
+        """
+        self.data = data
+        self._projects: Dict[str, ProjectTimeline] = {}
+        self.total_sessions = sum(p.get("total_sessions", 0) for p in data["projects"].values())
+
+    def project(self, name: str) -> Optional[ProjectTimeline]:
+        """The project's timeline, or None if it is not tracked."""
+        data = self.data["projects"].get(name)
+        if data is None:
+            return None
+        timeline = self._projects.get(name)
+        if timeline is None or timeline.data is not data:
+            timeline = self._projects[name] = ProjectTimeline(name, data)
+        return timeline
+
+    @property
+    def project_names(self) -> List[str]:
+        return list(self.data["projects"])
+
+    def add_session(self, project: str, date: str, session_id: str) -> Tuple[bool, bool]:
+        """
+        Record a session, creating its project and day if needed.
+
+        Returns:
+            (project was new, session was new)
+        """
+        new_project = project not in self.data["projects"]
+        if new_project:
+            self.data["projects"][project] = {
+                "first_seen": date,
+                "last_touched": date,
+                "total_sessions": 0,
+                "summary": "",
+                "daily_logs": {}
+            }
+        added = self.project(project).add_session(date, session_id)
+        if added:
+            self.total_sessions += 1
+        return new_project, added
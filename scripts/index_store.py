@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Journaled Storage for the AutoBlog Project Index
+
+The index is kept as a snapshot (project_index.json, the file that is
+committed with posts, or a binary format chosen by extension; see
+index_format.py) plus an append-only journal next to it
+(project_index.json.journal). Saving appends only what changed since the last
+load or save, one fsynced line per save, so write I/O follows the size of
+the change rather than the size of the index. Loading replays the journal
+on top of the snapshot.
+
+Now and then the journal is compacted: the full index is written to a temp
+file, fsynced and renamed over the snapshot, and the journal is removed. A
+crash at any point leaves either the old or the new snapshot plus a journal
+whose changes are safe to replay again; a torn final journal line is
+ignored and cut off before the next append.
+
+Changes are tracked per top-level key, per project (its fields other than
+the daily logs and rollups), per daily log and per rollup by comparing
+content digests, so callers keep mutating the index as a plain dict.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from index_format import IndexFormatError, IndexVersionError, dumps_index, index_format, read_index
+
+# Compact once the journal is at least this big...
+COMPACT_MIN_BYTES = 256 * 1024
+# ...and at least this fraction of the snapshot
+COMPACT_RATIO = 0.5
+
+JOURNAL_SUFFIX = ".journal"
+# A damaged snapshot is renamed to <snapshot>.corrupt-<timestamp>
+CORRUPT_SUFFIX = ".corrupt-"
+
+logger = logging.getLogger("autoblog")
+
+PathKey = Tuple[str, ...]
+
+# Per-project dicts whose entries are tracked and journaled one by one
+SPLIT_KEYS = ("daily_logs", "rollups")
+
+
+def empty_index() -> Dict[str, Any]:
+    return {"last_updated": None, "projects": {}}
+
+
+def _digest(value: Any) -> int:
+    # Digests only live in this process, so the builtin (randomized) str hash
+    # is fine, and repr() of JSON data is several times cheaper than
+    # json.dumps(). A reordered dict reads as changed, which only costs a
+    # redundant journal entry.
+    return hash(repr(value))
+
+
+def _entries(index: Dict[str, Any]) -> Dict[PathKey, Any]:
+    """
+    Split the index into the units changes are tracked and journaled at:
+    each top-level key, each project (with its SPLIT_KEYS emptied), each
+    daily log and each rollup.
+    """
+    entries: Dict[PathKey, Any] = {}
+    for key, value in index.items():
+        if key != "projects" or not isinstance(value, dict):
+            entries[(key,)] = value
+            continue
+        # Constant marker, so an empty "projects" survives a replay
+        entries[("projects",)] = {}
+        for name, project in value.items():
+            if not isinstance(project, dict):
+                entries[("projects", name)] = project
+                continue
+            split = [key for key in SPLIT_KEYS if isinstance(project.get(key), dict)]
+            entries[("projects", name)] = {**project, **{key: {} for key in split}}
+            for key in split:
+                for child, item in project[key].items():
+                    entries[("projects", name, key, child)] = item
+    return entries
+
+
+def _apply(index: Dict[str, Any], change: Dict[str, Any]) -> None:
+    """Apply one journaled change to the index in place."""
+    path = change.get("set") or change.get("del")
+    parent = index
+    for key in path[:-1]:
+        child = parent.get(key)
+        if not isinstance(child, dict):
+            if "del" in change:
+                return
+            child = parent[key] = {}
+        parent = child
+
+    if "del" in change:
+        parent.pop(path[-1], None)
+        return
+
+    value = change["value"]
+    existing = parent.get(path[-1])
+    if len(path) == 2 and path[0] == "projects" and isinstance(value, dict) \
+            and isinstance(existing, dict):
+        # A project entry carries empty SPLIT_KEYS; keep the entries replayed so far
+        value = {**value, **{key: existing.get(key, {}) for key in SPLIT_KEYS if key in value}}
+    elif path == ["projects"] and isinstance(existing, dict):
+        return
+    parent[path[-1]] = value
+
+
+class IndexStore:
+    """Snapshot + journal persistence for one index file."""
+
+    def __init__(self, snapshot_path: Path):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(self.snapshot_path.name + JOURNAL_SUFFIX)
+        self._digests: Dict[PathKey, int] = {}
+        self._pending_digests: Dict[PathKey, int] = {}
+        # Whether _digests describes what is on disk (set by load and compact)
+        self._synced = False
+        # Snapshot rewrites by this store, so callers can tell when the committed file changed
+        self.compactions = 0
+        # Byte offset just past the last complete journal line seen on load
+        self._journal_end = 0
+
+    def signature(self) -> Tuple[Optional[int], Optional[int]]:
+        """Cheap stat-based token that changes whenever another process saves."""
+        def mtime(path: Path) -> Optional[int]:
+            try:
+                return path.stat().st_mtime_ns
+            except OSError:
+                return None
+        return mtime(self.snapshot_path), mtime(self.journal_path)
+
+    def load(self) -> Dict[str, Any]:
+        """
+        The snapshot with the journal replayed on top (empty if neither exists).
+
+        Raises:
+            IndexVersionError: If the snapshot was written by a newer AutoBlog
+            OSError: If the snapshot exists but can't be read right now
+        """
+        index = empty_index()
+        if self.snapshot_path.exists():
+            try:
+                index = read_index(self.snapshot_path)
+            except FileNotFoundError:
+                pass
+            except IndexVersionError:
+                # Valid, just newer: leave it for the AutoBlog that wrote it
+                raise
+            except IndexFormatError as e:
+                # Damaged: start fresh (keeping the journal), but never let the
+                # next compaction overwrite the file. Read errors (EACCES, EIO,
+                # ...) propagate instead and leave it alone.
+                self._quarantine_snapshot(e)
+
+        for change in self._read_journal():
+            _apply(index, change)
+
+        self._digests = {path: _digest(value) for path, value in _entries(index).items()}
+        self._synced = True
+        return index
+
+    def _quarantine_snapshot(self, error: Exception) -> Path:
+        """
+        Move a damaged snapshot aside so it can be inspected or restored.
+
+        Raises:
+            OSError: If it can't be moved; loading an empty index would then
+                risk overwriting it
+        """
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+        target = self.snapshot_path.with_name(self.snapshot_path.name + CORRUPT_SUFFIX + stamp)
+        os.replace(self.snapshot_path, target)
+        logger.error(f"Project index {self.snapshot_path} is damaged ({error}); "
+                     f"moved it to {target.name} and started from an empty index")
+        return target
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        self._journal_end = 0
+        changes: List[Dict[str, Any]] = []
+        try:
+            f = open(self.journal_path, 'rb')
+        except OSError:
+            return changes
+        with f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crash
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                offset += len(line)
+                changes.extend(record.get("changes", []))
+            self._journal_end = offset
+        return changes
+
+    def pending_changes(self, index: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Changes between the last load/save and `index`, in journal form."""
+        entries = _entries(index)
+        digests = {path: _digest(value) for path, value in entries.items()}
+
+        changes: List[Dict[str, Any]] = []
+        for path in self._digests.keys() - digests.keys():
+            changes.append({"del": list(path)})
+        for path, digest in digests.items():
+            if self._digests.get(path) != digest:
+                changes.append({"set": list(path), "value": entries[path]})
+        # Parents before children, so a new project is created before its logs
+        changes.sort(key=lambda c: ("del" in c, len(c.get("set") or c.get("del"))))
+        self._pending_digests = digests
+        return changes
+
+    def is_dirty(self, index: Dict[str, Any]) -> bool:
+        """Whether `index` differs from what was last loaded or saved."""
+        return not self._synced or bool(self.pending_changes(index))
+
+    def save(self, index: Dict[str, Any]) -> int:
+        """
+        Journal what changed since the last load or save.
+
+        A snapshot is written directly instead when there is none yet or
+        when this store never loaded the index (so there is nothing to diff
+        against), and the journal is compacted once it grows past the
+        thresholds.
+
+        Returns:
+            Number of changed entries (0 means nothing was written)
+        """
+        if not self._synced or not self.snapshot_path.exists():
+            changes = self.pending_changes(index)
+            self.compact(index)
+            return max(len(changes), 1)
+
+        changes = self.pending_changes(index)
+        if not changes:
+            return 0
+
+        self._append(changes)
+        self._digests = self._pending_digests
+
+        if self._should_compact():
+            self.compact(index)
+        return len(changes)
+
+    def _append(self, changes: List[Dict[str, Any]]) -> None:
+        line = (json.dumps({"changes": changes}, default=str) + "\n").encode('utf-8')
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.journal_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            # Drop a torn tail left by a crash so this record starts on its own line
+            if os.fstat(fd).st_size != self._journal_end:
+                os.ftruncate(fd, self._journal_end)
+            os.lseek(fd, self._journal_end, os.SEEK_SET)
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._journal_end += len(line)
+
+    def _should_compact(self) -> bool:
+        try:
+            journal = self.journal_path.stat().st_size
+            snapshot = self.snapshot_path.stat().st_size
+        except OSError:
+            return False
+        return journal >= COMPACT_MIN_BYTES and journal >= snapshot * COMPACT_RATIO
+
+    def has_journal(self) -> bool:
+        return self.journal_path.exists()
+
+    def compact(self, index: Dict[str, Any]) -> None:
+        """Atomically rewrite the snapshot from `index` and drop the journal."""
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        data = dumps_index(index, index_format(self.snapshot_path))
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_dir(self.snapshot_path.parent)
+
+        # Safe to lose: replaying it onto the new snapshot changes nothing
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+        self._journal_end = 0
+        self._digests = {path: _digest(value) for path, value in _entries(index).items()}
+        self._synced = True
+        self.compactions += 1
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
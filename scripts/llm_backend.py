@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+LLM Backends for AutoBlog
+
+Every Claude call made by BlogGenerator and ProjectMemory goes through an
+LLMBackend. The real backends shell out to the Claude CLI and fall back to
+the Anthropic API; FakeLLMBackend is a deterministic local stand-in with
+configurable latency, jitter, failure rate and output size, used to
+benchmark the pipeline without paying for calls.
+
+Backends can be chosen with a spec string (see backend_from_spec), e.g.
+"claude", "claude-cli" or "fake:latency=0.5,jitter=0.1,failure_rate=0.05".
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from typing import Callable, Optional
+
+from run_metrics import LLMCall
+
+# The anthropic SDK (API fallback) pulls in httpx and friends, so only check
+# that it is installed here and import it when a client is first needed
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+
+API_MODEL = "claude-sonnet-4-20250514"
+
+
+class LLMBackend:
+    """Turns a prompt into a completion. Returns "" on failure, never raises."""
+
+    name = "base"
+
+    def complete(self, prompt: str, timeout: int = 300,
+                 call: Optional[LLMCall] = None) -> str:
+        """
+        Complete a prompt.
+
+        Args:
+            prompt: Prompt text
+            timeout: Seconds to wait for a response
+            call: Optional record to fill with the backend used and attempts made
+
+        Returns:
+            The response text, or "" if the call failed
+        """
+        raise NotImplementedError
+
+    def _attempt(self, call: Optional[LLMCall], backend: str) -> None:
+        if call is not None:
+            call.attempts += 1
+            call.backend = backend
+
+
+class ClaudeCLIBackend(LLMBackend):
+    """The `claude` CLI in print mode."""
+
+    name = "claude-cli"
+
+    def __init__(self, verbose: bool = True):
+        # Summaries fail quietly; generation passes report CLI errors
+        self.verbose = verbose
+
+    def complete(self, prompt: str, timeout: int = 300,
+                 call: Optional[LLMCall] = None) -> str:
+        self._attempt(call, "cli")
+        try:
+            result = subprocess.run(
+                ['claude', '--print', '-p', prompt],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+
+            if result.returncode == 0:
+                return result.stdout.strip()
+            self._report(f"Claude CLI error: {result.stderr}")
+            return ""
+
+        except subprocess.TimeoutExpired:
+            self._report(f"Claude CLI timed out after {timeout}s")
+            return ""
+        except FileNotFoundError:
+            self._report("Claude CLI not found")
+            return ""
+        except Exception as e:
+            self._report(f"Claude CLI exception: {e}")
+            return ""
+
+    def _report(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
+
+class AnthropicAPIBackend(LLMBackend):
+    """The Anthropic Messages API, with one client reused across calls."""
+
+    name = "anthropic-api"
+
+    def __init__(self, api_key: Optional[str] = None, model: str = API_MODEL):
+        self.api_key = api_key
+        self.model = model
+        self._client = None
+        self._client_key: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _get_client(self, api_key: str):
+        with self._lock:
+            if self._client is None or self._client_key != api_key:
+                import anthropic
+                self._client = anthropic.Anthropic(api_key=api_key)
+                self._client_key = api_key
+            return self._client
+
+    def complete(self, prompt: str, timeout: int = 300,
+                 call: Optional[LLMCall] = None) -> str:
+        self._attempt(call, "api")
+        api_key = self.api_key or os.environ.get('ANTHROPIC_API_KEY')
+        try:
+            message = self._get_client(api_key).messages.create(
+                model=self.model,
+                max_tokens=4096,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+
+            if message.content and len(message.content) > 0:
+                return message.content[0].text
+            return ""
+
+        except Exception as e:
+            print(f"Anthropic API error: {e}")
+            return ""
+
+
+class ClaudeBackend(LLMBackend):
+    """
+    CLI first, then the API.
+
+    The API is used directly when USE_ANTHROPIC_API=true and
+    ANTHROPIC_API_KEY is set (e.g. in GitHub Actions), and as a fallback
+    when the CLI fails and a key is available.
+    """
+
+    name = "claude"
+
+    def __init__(self):
+        self.cli = ClaudeCLIBackend()
+        self.api = AnthropicAPIBackend()
+
+    def complete(self, prompt: str, timeout: int = 300,
+                 call: Optional[LLMCall] = None) -> str:
+        api_key = os.environ.get('ANTHROPIC_API_KEY')
+        use_api = os.environ.get('USE_ANTHROPIC_API', '').lower() == 'true'
+
+        if use_api and api_key and ANTHROPIC_AVAILABLE:
+            return self.api.complete(prompt, timeout, call)
+
+        cli_result = self.cli.complete(prompt, timeout, call)
+        if cli_result:
+            return cli_result
+
+        if api_key and ANTHROPIC_AVAILABLE:
+            print("CLI failed, falling back to Anthropic API...")
+            return self.api.complete(prompt, timeout, call)
+
+        return ""
+
+
+FAKE_VOCABULARY = (
+    "refactor pipeline index cache session transcript prompt latency test "
+    "deploy commit branch parser schema migration query worker queue retry "
+    "timeout config module function class interface benchmark profile "
+    "memory thread lock build release review feature bug fix context model"
+).split()
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Deterministic offline stand-in for Claude.
+
+    The response, simulated latency and whether the call fails are all
+    derived from a hash of (seed, prompt), so identical runs produce identical
+    output. Summary prompts get a JSON summary; everything else gets a
+    markdown post of about `output_words` words.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, output_words: int = 600, seed: int = 0,
+                 sleep: Callable[[float], None] = time.sleep):
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError("failure_rate must be between 0 and 1")
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.output_words = output_words
+        self.seed = seed
+        self._sleep = sleep
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str, timeout: int = 300,
+                 call: Optional[LLMCall] = None) -> str:
+        self._attempt(call, "fake")
+        with self._lock:
+            self.calls += 1
+
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode('utf-8')).hexdigest()
+        rng = random.Random(digest)
+
+        delay = max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+        if delay:
+            self._sleep(min(delay, timeout))
+        if rng.random() < self.failure_rate:
+            return ""
+
+        if "Respond with only valid JSON" in prompt:
+            return json.dumps({
+                "summary": f"Worked on {' and '.join(rng.sample(FAKE_VOCABULARY, 2))}.",
+                "key_topics": rng.sample(FAKE_VOCABULARY, 3),
+            })
+        return self._post(rng, digest[:8])
+
+    def _post(self, rng: random.Random, tag: str) -> str:
+        title_words = " ".join(w.capitalize() for w in rng.sample(FAKE_VOCABULARY, 3))
+        lines = [f"# {title_words} ({tag})", ""]
+        remaining = self.output_words
+        section = 1
+        while remaining > 0:
+            lines += [f"## Part {section}", ""]
+            words = min(remaining, 80)
+            lines += [" ".join(rng.choice(FAKE_VOCABULARY) for _ in range(words)) + ".", ""]
+            remaining -= words
+            section += 1
+        return "\n".join(lines)
+
+
+def backend_from_spec(spec: str) -> LLMBackend:
+    """
+    Build a backend from a spec string.
+
+    Args:
+        spec: "claude", "claude-cli", "api", or "fake[:key=value,...]" where
+            keys are latency, jitter, failure_rate, words and seed
+
+    Returns:
+        The configured backend
+    """
+    name, _, options = spec.partition(":")
+    name = name.strip().lower()
+
+    if name == "claude":
+        return ClaudeBackend()
+    if name == "claude-cli":
+        return ClaudeCLIBackend()
+    if name == "api":
+        return AnthropicAPIBackend()
+    if name != "fake":
+        raise ValueError(f"Unknown LLM backend: {name}")
+
+    kwargs = {}
+    converters = {"latency": float, "jitter": float, "failure_rate": float,
+                  "words": int, "seed": int}
+    for option in filter(None, (o.strip() for o in options.split(","))):
+        key, _, value = option.partition("=")
+        if key not in converters:
+            raise ValueError(f"Unknown option for fake backend: {key}")
+        kwargs["output_words" if key == "words" else key] = converters[key](value)
+    return FakeLLMBackend(**kwargs)
@@ -5,13 +5,21 @@ Login Trigger for AutoBlog
 Wrapper script that runs on login and generates blog posts for any missed
 days in the past 7 days. Uses a marker file to avoid running multiple times
 per day.
+
+By default the backfill runs in-process: one DailyBlogRunner updates the
+index once and generates every missing date from that shared state, several
+dates at a time under a global Claude call rate limit. If a
+`daily_blog.py serve` daemon is running, the backfill is submitted to it
+instead so it shares the daemon's warm state and job queue. Pass
+--isolated to run each date in its own `daily_blog.py run` subprocess instead.
 """
 
+import argparse
 import subprocess
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 
 MARKER_FILE = Path.home() / ".autoblog_last_run"
@@ -20,6 +28,10 @@ DAILY_BLOG_SCRIPT = SCRIPT_DIR / "daily_blog.py"
 POSTS_DIR = SCRIPT_DIR.parent / "_posts"
 DRAFTS_DIR = SCRIPT_DIR.parent / "_drafts"
 BACKFILL_DAYS = 7
+# Dates generated concurrently by the in-process backfill, and the global cap
+# on Claude calls (CLI or API) shared by all of them
+BACKFILL_WORKERS = 4
+LLM_CALLS_PER_MINUTE = 30
 
 
 def get_last_run_date() -> Optional[str]:
@@ -37,29 +49,90 @@ def set_last_run_date(date: str) -> None:
     MARKER_FILE.write_text(date)
 
 
-def main() -> int:
-    today = datetime.now().strftime("%Y-%m-%d")
+def get_missing_dates() -> List[str]:
+    """Dates in the backfill window (oldest first, excluding today) without a post or draft."""
+    sys.path.insert(0, str(SCRIPT_DIR))
+    from post_catalog import PostCatalog
 
-    # Check if already ran today
-    last_run = get_last_run_date()
-    if last_run == today:
-        print(f"Already ran today ({today}), skipping")
-        return 0
-
-    print(f"Running blog generation backfill for past {BACKFILL_DAYS} days")
-
-    # Loop through past 7 days (oldest to newest, excluding today)
-    # This ensures posts are generated in chronological order
-    any_failures = False
+    catalog = PostCatalog(POSTS_DIR, DRAFTS_DIR)
+    missing = []
     for days_ago in range(BACKFILL_DAYS, 0, -1):
         target_date = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-        print(f"\nProcessing {target_date}...")
 
         # Skip if post already exists for this date
-        if list(POSTS_DIR.glob(f"{target_date}-*.md")) or list(DRAFTS_DIR.glob(f"{target_date}-*.md")):
-            print(f"  Post or draft already exists, skipping")
+        if catalog.has_date(target_date):
+            print(f"{target_date}: post or draft already exists, skipping")
             continue
 
+        missing.append(target_date)
+    return missing
+
+
+def run_backfill_in_process(dates: List[str], workers: int = BACKFILL_WORKERS,
+                            calls_per_minute: float = LLM_CALLS_PER_MINUTE) -> bool:
+    """Generate all dates with a single DailyBlogRunner. Returns True if any failed."""
+    sys.path.insert(0, str(SCRIPT_DIR))
+    from daily_blog import DailyBlogRunner
+
+    runner = DailyBlogRunner(repo_dir=SCRIPT_DIR.parent, llm_calls_per_minute=calls_per_minute)
+    results = runner.run_backfill(dates, workers=workers)
+
+    any_failures = False
+    for date in dates:
+        if results.get(date):
+            print(f"  Completed {date}")
+        else:
+            print(f"  Blog generation failed for {date}")
+            any_failures = True
+    return any_failures
+
+
+def run_backfill_via_daemon(dates: List[str], workers: int = BACKFILL_WORKERS) -> Optional[bool]:
+    """
+    Hand the backfill to a running `daily_blog.py serve` daemon, if there is one.
+
+    Returns True if any date failed, False if all succeeded, or None when no
+    daemon is available or it stopped answering (the caller then backfills
+    in-process; the run lock keeps that from overlapping a backfill the
+    daemon is still running).
+    """
+    sys.path.insert(0, str(SCRIPT_DIR))
+    from blog_daemon import is_daemon_running, send_request
+
+    if not is_daemon_running():
+        return None
+
+    print("Submitting backfill to running AutoBlog daemon")
+    try:
+        response = send_request({
+            "job": "backfill",
+            "args": {"dates": dates, "workers": workers},
+            "wait": True
+        })
+        if not isinstance(response, dict):
+            raise ValueError(f"unexpected reply {response!r}")
+    except (OSError, ValueError) as e:
+        # The daemon restarted or died mid-backfill, or sent garbage
+        print(f"AutoBlog daemon backfill failed ({e}), running it in-process")
+        return None
+    results = response.get("job", {}).get("result") or {}
+
+    any_failures = not response.get("ok")
+    for date in dates:
+        if results.get(date):
+            print(f"  Completed {date}")
+        else:
+            print(f"  Blog generation failed for {date}")
+            any_failures = True
+    return any_failures
+
+
+def run_backfill_subprocess(dates: List[str]) -> bool:
+    """Generate each date in its own daily_blog.py process. Returns True if any failed."""
+    any_failures = False
+    for target_date in dates:
+        print(f"\nProcessing {target_date}...")
+
         result = subprocess.run(
             [sys.executable, str(DAILY_BLOG_SCRIPT), "run", "--date", target_date],
             cwd=SCRIPT_DIR.parent,
@@ -70,6 +143,44 @@ def main() -> int:
             any_failures = True
         else:
             print(f"  Completed {target_date}")
+    return any_failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AutoBlog login/backfill trigger")
+    parser.add_argument("--isolated", action="store_true",
+                        help="Run each date in a separate daily_blog.py subprocess")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS,
+                        help=f"Dates to generate concurrently (default: {BACKFILL_WORKERS})")
+    parser.add_argument("--rate-limit", type=float, default=LLM_CALLS_PER_MINUTE,
+                        help=f"Max Claude calls per minute (default: {LLM_CALLS_PER_MINUTE})")
+    args = parser.parse_args(argv)
+
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    # Check if already ran today
+    last_run = get_last_run_date()
+    if last_run == today:
+        print(f"Already ran today ({today}), skipping")
+        return 0
+
+    print(f"Running blog generation backfill for past {BACKFILL_DAYS} days")
+
+    # Oldest to newest, excluding today, so posts are generated in chronological order
+    dates = get_missing_dates()
+
+    any_failures = False
+    if dates:
+        if args.isolated:
+            any_failures = run_backfill_subprocess(dates)
+        else:
+            try:
+                any_failures = run_backfill_via_daemon(dates, args.workers)
+                if any_failures is None:
+                    any_failures = run_backfill_in_process(dates, args.workers, args.rate_limit)
+            except ImportError as e:
+                print(f"In-process backfill unavailable ({e}), falling back to subprocesses")
+                any_failures = run_backfill_subprocess(dates)
 
     # Update marker file regardless of success/failure
     # (we don't want to keep retrying on login if there's an error)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Performance Regression Gates for AutoBlog
+
+Times hot paths and compares them against stored baselines, failing when
+one gets slower than a threshold (e.g. a regex change that makes
+sanitization ten times slower). Used by tests/test_performance.py.
+
+Timings are stored relative to a fixed calibration workload run on the
+same machine, so a baseline recorded on a laptop still means something on
+a slower CI runner. Each measurement is the best of several repeats, which
+filters out most scheduler noise.
+
+Environment:
+    AUTOBLOG_PERF_THRESHOLD  Allowed slowdown factor (default: 3.0)
+    AUTOBLOG_PERF_UPDATE=1   Rewrite the baselines with the current timings
+    AUTOBLOG_PERF_SKIP=1     Skip the performance tests entirely
+"""
+
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_THRESHOLD = 3.0
+
+# Measurements shorter than this are too noisy to gate on; time a batch instead
+MIN_MEASUREMENT = 0.002
+
+# Extra allowance for filesystem-bound paths, whose cost depends on the
+# page and dentry caches rather than on the CPU the calibration measures
+IO_SLACK = 2.0
+
+
+def time_call(operation: Callable[[], Any], repeat: int = 5) -> float:
+    """
+    Best-of-`repeat` seconds for one call of `operation`.
+
+    Very fast operations are run in batches until a batch takes at least
+    MIN_MEASUREMENT, and the per-call time is reported.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_MEASUREMENT or number >= 1_000_000:
+            break
+        number *= 10
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+_CALIBRATION_TEXT = "\n".join(
+    f"line {i}: token=abc{i:05d} value {i * 7} note" for i in range(2000)
+)
+_CALIBRATION_PATTERN = re.compile(r"token=([a-z]+\d+)")
+
+
+def _calibration_workload() -> None:
+    # Regex, string and dict work, like the paths being gated
+    counts: Dict[str, int] = {}
+    for match in _CALIBRATION_PATTERN.finditer(_CALIBRATION_TEXT):
+        key = match.group(1)[-2:]
+        counts[key] = counts.get(key, 0) + 1
+    "\n".join(line.upper() for line in _CALIBRATION_TEXT.split("\n"))
+
+
+_calibration: Optional[float] = None
+
+
+def calibration_seconds() -> float:
+    """Time of the calibration workload on this machine (measured once)."""
+    global _calibration
+    if _calibration is None:
+        _calibration = time_call(_calibration_workload, repeat=7)
+    return _calibration
+
+
+@dataclass
+class PerfCheck:
+    """Result of comparing one measurement with its baseline."""
+    name: str
+    seconds: float
+    relative: float
+    baseline: Optional[float]
+    threshold: float
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """How many times slower than the baseline (None without one)."""
+        return self.relative / self.baseline if self.baseline else None
+
+    @property
+    def passed(self) -> bool:
+        return self.ratio is None or self.ratio <= self.threshold
+
+    def describe(self) -> str:
+        if self.ratio is None:
+            return f"{self.name}: {self.seconds * 1000:.2f}ms (no baseline)"
+        return (f"{self.name}: {self.seconds * 1000:.2f}ms, {self.ratio:.2f}x baseline "
+                f"(threshold {self.threshold:.1f}x)")
+
+
+class PerfBaselines:
+    """
+    Stored baselines, as multiples of the calibration workload.
+
+    Args:
+        path: JSON file of {name: relative time}
+        threshold: Allowed slowdown factor (default: AUTOBLOG_PERF_THRESHOLD or 3.0)
+        update: Record current timings instead of checking
+            (default: AUTOBLOG_PERF_UPDATE=1)
+    """
+
+    def __init__(self, path: Path, threshold: Optional[float] = None,
+                 update: Optional[bool] = None):
+        self.path = Path(path)
+        self.threshold = threshold if threshold is not None else float(
+            os.environ.get("AUTOBLOG_PERF_THRESHOLD", DEFAULT_THRESHOLD)
+        )
+        self.update = update if update is not None else (
+            os.environ.get("AUTOBLOG_PERF_UPDATE") == "1"
+        )
+        self.baselines: Dict[str, float] = (
+            json.loads(self.path.read_text()) if self.path.exists() else {}
+        )
+
+    def check(self, name: str, operation: Callable[[], Any], repeat: int = 5,
+              io_bound: bool = False) -> PerfCheck:
+        """
+        Time `operation` and compare it with the baseline stored as `name`.
+
+        Args:
+            name: Baseline name
+            operation: Zero-argument callable to time
+            repeat: Best-of repeats
+            io_bound: Allow IO_SLACK times the usual threshold
+        """
+        seconds = time_call(operation, repeat=repeat)
+        relative = seconds / calibration_seconds()
+
+        if self.update:
+            self.baselines[name] = round(relative, 4)
+            self.save()
+
+        return PerfCheck(name=name, seconds=seconds, relative=relative,
+                         baseline=self.baselines.get(name),
+                         threshold=self.threshold * (IO_SLACK if io_bound else 1.0))
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(dict(sorted(self.baselines.items())), indent=2) + "\n")
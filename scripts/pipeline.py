@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Incremental Stage Pipeline for AutoBlog
+
+Expresses a run as a small DAG of named stages. Each stage declares the
+stages it consumes, the run parameters it depends on and (optionally) a
+fingerprint of external state such as a directory tree. Its cache key is a
+hash of all of those plus the fingerprints of its inputs' outputs.
+
+A cacheable stage whose key is unchanged is not re-executed; its previous
+output is reused. Stages that are cheap or have side effects can be marked
+non-cacheable: they always run, but their output fingerprint still decides
+whether anything downstream needs to run again (early cutoff).
+
+Outputs are persisted as JSON per stage, which also lets --from-stage resume
+a run from any point using the stored outputs of earlier stages.
+"""
+
+import hashlib
+import json
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+class StageError(Exception):
+    """A stage failed; the pipeline stops and reports failure."""
+
+
+class PipelineStop(Exception):
+    """A stage decided there is nothing more to do; the pipeline stops successfully."""
+
+
+class NoCache:
+    """Wrap a stage output that should be used this run but not persisted (e.g. a fallback)."""
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _json_default(value: Any) -> Any:
+    # Objects that know their own JSON form (e.g. lazy ContentHandles, which
+    # serialize as path/size/mtime rather than their text) use it
+    to_json = getattr(value, "to_json", None)
+    return to_json() if callable(to_json) else str(value)
+
+
+def fingerprint(value: Any) -> str:
+    """Stable content hash of a JSON-serializable value."""
+    encoded = json.dumps(value, sort_keys=True, default=_json_default).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass
+class Stage:
+    """A single step of the pipeline."""
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    inputs: List[str] = field(default_factory=list)
+    params: List[str] = field(default_factory=list)
+    external: Optional[Callable[[], Any]] = None
+    cacheable: bool = True
+    version: str = ""
+
+
+@dataclass
+class PipelineResult:
+    """Result of a pipeline run."""
+    success: bool
+    outputs: Dict[str, Any]
+    executed: List[str]
+    cached: List[str]
+    stopped_at: Optional[str] = None
+    error: Optional[str] = None
+    # stage -> {"wall": seconds, "cpu": seconds} for every stage that executed
+    timings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+class Pipeline:
+    """Runs stages in order, re-executing only those whose inputs changed."""
+
+    def __init__(self, stages: List[Stage], cache_dir: Optional[Path] = None, logger=None,
+                 profiler=None):
+        self.stages = stages
+        self.cache_dir = cache_dir
+        self.logger = logger
+        # Optional StageProfiler; each executed stage runs inside profiler.profile(name)
+        self.profiler = profiler
+
+        names = [s.name for s in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique")
+        for i, stage in enumerate(stages):
+            for dep in stage.inputs:
+                if dep not in names[:i]:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown or later stage '{dep}'")
+
+    @property
+    def stage_names(self) -> List[str]:
+        return [s.name for s in self.stages]
+
+    def _log(self, message: str) -> None:
+        if self.logger is not None:
+            self.logger.info(message)
+
+    def _cache_path(self, name: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{name}.json"
+
+    def _load(self, name: str) -> Optional[Dict[str, Any]]:
+        path = self._cache_path(name)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
+
+    def _store(self, name: str, key: str, output: Any, output_fp: str) -> None:
+        path = self._cache_path(name)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({"key": key, "fingerprint": output_fp, "output": output}, f,
+                      default=_json_default)
+        tmp_path.replace(path)
+
+    def _key(self, stage: Stage, params: Dict[str, Any], input_fps: Dict[str, str]) -> str:
+        return fingerprint({
+            "stage": stage.name,
+            "version": stage.version,
+            "params": {p: params.get(p) for p in stage.params},
+            "inputs": {dep: input_fps.get(dep) for dep in stage.inputs},
+            "external": stage.external() if stage.external else None,
+        })
+
+    def run(self, params: Optional[Dict[str, Any]] = None,
+            from_stage: Optional[str] = None,
+            until_stage: Optional[str] = None,
+            force: bool = False) -> PipelineResult:
+        """
+        Run the pipeline.
+
+        Args:
+            params: Run parameters stages may depend on (e.g. date)
+            from_stage: Re-execute this stage; earlier stages reuse their
+                stored outputs and are not run at all
+            until_stage: Stop after this stage
+            force: Ignore cached outputs and execute every stage
+
+        Returns:
+            PipelineResult with each stage's output
+        """
+        params = params or {}
+        names = self.stage_names
+        for name in (from_stage, until_stage):
+            if name is not None and name not in names:
+                raise ValueError(f"Unknown stage: {name}")
+
+        start_idx = names.index(from_stage) if from_stage else 0
+        end_idx = names.index(until_stage) if until_stage else len(names) - 1
+
+        outputs: Dict[str, Any] = {}
+        fps: Dict[str, str] = {}
+        result = PipelineResult(success=True, outputs=outputs, executed=[], cached=[])
+
+        for idx, stage in enumerate(self.stages):
+            if idx > end_idx:
+                break
+
+            cached = self._load(stage.name)
+
+            # Before --from-stage: use the stored output without running anything
+            if idx < start_idx:
+                if cached is None:
+                    result.success = False
+                    result.stopped_at = stage.name
+                    result.error = (f"No stored output for stage '{stage.name}'; "
+                                    f"run without --from-stage first")
+                    return result
+                outputs[stage.name] = cached["output"]
+                fps[stage.name] = cached["fingerprint"]
+                result.cached.append(stage.name)
+                continue
+
+            # The --from-stage stage itself always runs; later stages follow normal cache rules
+            key = self._key(stage, params, fps)
+            rerun_requested = force or (from_stage is not None and idx == start_idx)
+            if (stage.cacheable and not rerun_requested
+                    and cached is not None and cached.get("key") == key):
+                outputs[stage.name] = cached["output"]
+                fps[stage.name] = cached["fingerprint"]
+                result.cached.append(stage.name)
+                self._log(f"[{stage.name}] up to date, using cached output")
+                continue
+
+            self._log(f"[{stage.name}] running")
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            profile = self.profiler.profile(stage.name) if self.profiler else nullcontext()
+            try:
+                with profile:
+                    output = stage.func({dep: outputs.get(dep) for dep in stage.inputs})
+            except PipelineStop as e:
+                result.stopped_at = stage.name
+                self._log(f"[{stage.name}] {e}" if str(e) else f"[{stage.name}] nothing to do")
+                return result
+            except StageError as e:
+                result.success = False
+                result.stopped_at = stage.name
+                result.error = str(e)
+                return result
+            finally:
+                result.timings[stage.name] = {
+                    "wall": time.perf_counter() - wall_start,
+                    "cpu": time.thread_time() - cpu_start,
+                }
+
+            persist = True
+            if isinstance(output, NoCache):
+                output = output.value
+                persist = False
+
+            output_fp = fingerprint(output)
+            outputs[stage.name] = output
+            fps[stage.name] = output_fp
+            result.executed.append(stage.name)
+            if persist:
+                self._store(stage.name, key, output, output_fp)
+
+        return result
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Post Catalog for AutoBlog
+
+In-memory index of the posts and drafts that already exist, keyed by date.
+Each directory is listed with a single scandir() and only re-listed when its
+mtime changes, so "is there already a post for this date?" checks are
+dictionary lookups instead of a glob per date.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+POST_FILENAME_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})-(.*)\.md$')
+
+
+class PostCatalog:
+    """Date -> filenames index over _posts/ and _drafts/."""
+
+    def __init__(self, posts_dir: Path, drafts_dir: Optional[Path] = None):
+        self.posts_dir = Path(posts_dir)
+        self.drafts_dir = Path(drafts_dir) if drafts_dir is not None else None
+        # directory -> {date: [filename, ...]}
+        self._entries: Dict[Path, Dict[str, List[str]]] = {}
+        self._mtimes: Dict[Path, Optional[int]] = {}
+        self._titles: Dict[Path, Optional[str]] = {}
+
+    def _dirs(self) -> List[Path]:
+        return [d for d in (self.posts_dir, self.drafts_dir) if d is not None]
+
+    def _scan(self, directory: Path) -> None:
+        """List a directory once and group its post files by date."""
+        by_date: Dict[str, List[str]] = {}
+        try:
+            mtime = directory.stat().st_mtime_ns
+            with os.scandir(directory) as it:
+                for entry in it:
+                    match = POST_FILENAME_PATTERN.match(entry.name)
+                    if match and entry.is_file():
+                        by_date.setdefault(match.group(1), []).append(entry.name)
+        except FileNotFoundError:
+            mtime = None
+
+        for names in by_date.values():
+            names.sort()
+        self._entries[directory] = by_date
+        self._mtimes[directory] = mtime
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-list any directory whose mtime changed since it was last scanned."""
+        for directory in self._dirs():
+            if force or directory not in self._entries:
+                self._scan(directory)
+                continue
+            try:
+                mtime = directory.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._mtimes.get(directory):
+                self._scan(directory)
+
+    def _lookup(self, directory: Optional[Path], date: str) -> List[Path]:
+        if directory is None:
+            return []
+        self.refresh()
+        return [directory / name for name in self._entries[directory].get(date, [])]
+
+    def posts_for(self, date: str) -> List[Path]:
+        """Published posts for a date."""
+        return self._lookup(self.posts_dir, date)
+
+    def drafts_for(self, date: str) -> List[Path]:
+        """Drafts for a date."""
+        return self._lookup(self.drafts_dir, date)
+
+    def find(self, date: str) -> Optional[Path]:
+        """The first post for a date, else the first draft, else None."""
+        posts = self.posts_for(date)
+        if posts:
+            return posts[0]
+        drafts = self.drafts_for(date)
+        return drafts[0] if drafts else None
+
+    def has_date(self, date: str) -> bool:
+        """Whether a post or draft exists for a date."""
+        return self.find(date) is not None
+
+    def post_count(self) -> int:
+        """Number of published posts."""
+        self.refresh()
+        return sum(len(names) for names in self._entries[self.posts_dir].values())
+
+    def dates(self) -> List[str]:
+        """Sorted dates that have a post or draft."""
+        self.refresh()
+        dates = set()
+        for directory in self._dirs():
+            dates.update(self._entries[directory].keys())
+        return sorted(dates)
+
+    def find_by_slug(self, text: str, drafts: bool = False) -> List[Path]:
+        """Posts (or drafts) whose slug contains `text`."""
+        directory = self.drafts_dir if drafts else self.posts_dir
+        if directory is None:
+            return []
+        self.refresh()
+        return [
+            directory / name
+            for names in self._entries[directory].values()
+            for name in names
+            if text in name[11:]
+        ]
+
+    def add(self, path: Path) -> None:
+        """Record a file just written by this process without re-listing."""
+        path = Path(path)
+        match = POST_FILENAME_PATTERN.match(path.name)
+        if not match or path.parent not in self._entries:
+            return
+        names = self._entries[path.parent].setdefault(match.group(1), [])
+        if path.name not in names:
+            names.append(path.name)
+            names.sort()
+        try:
+            self._mtimes[path.parent] = path.parent.stat().st_mtime_ns
+        except FileNotFoundError:
+            pass
+
+    def title(self, path: Path) -> Optional[str]:
+        """Title from a post's front matter (read once, then cached)."""
+        path = Path(path)
+        if path not in self._titles:
+            title = None
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    if f.readline().strip() == '---':
+                        for line in f:
+                            if line.strip() == '---':
+                                break
+                            if line.startswith('title:'):
+                                title = line[6:].strip().strip('"\'')
+                                break
+            except OSError:
+                pass
+            self._titles[path] = title
+        return self._titles[path]
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Stage Profiling for AutoBlog
+
+Wraps named stages in cProfile and a lightweight stack sampler. For every
+stage the output directory gets:
+
+    <stage>.prof       cProfile stats (open with pstats or snakeviz)
+    <stage>.collapsed  sampled stacks in collapsed format for flame graphs
+                       (flamegraph.pl, speedscope, inferno)
+
+plus all.collapsed (every stage, rooted at the stage name) and summary.txt
+(top functions by cumulative time per stage). Files are written as each
+stage finishes, so a crashed run still leaves the stages that completed.
+
+Stages opened inside another stage on the same thread are not profiled
+separately; their cost is part of the enclosing stage.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+
+DEFAULT_PROFILE_ROOT = Path(__file__).parent / "data" / "profiles"
+
+# Seconds between stack samples
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Functions listed per stage in summary.txt
+SUMMARY_LIMIT = 25
+
+
+def default_profile_dir(command: str) -> Path:
+    """A fresh timestamped directory for one command's profiles."""
+    return DEFAULT_PROFILE_ROOT / f"{command}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _StackSampler(threading.Thread):
+    """Periodically samples one thread's stack below a base depth."""
+
+    def __init__(self, thread_id: int, base_depth: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.base_depth = base_depth
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            stack.reverse()
+            inner = stack[self.base_depth:]
+            if inner:
+                self.samples[";".join(_frame_label(f) for f in inner)] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class _StageProfile:
+    """Context manager profiling one stage; see StageProfiler.profile()."""
+
+    def __init__(self, profiler: "StageProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self._cprofile = cProfile.Profile()
+        self._sampler: Optional[_StackSampler] = None
+
+    def __enter__(self) -> "_StageProfile":
+        if getattr(self.profiler._active, "stage", None) is not None:
+            # Nested stage: the enclosing profile already covers it
+            return self
+        self.profiler._active.stage = self.name
+
+        # Only sample frames below the `with` statement that opened the stage
+        depth = 0
+        frame = sys._getframe(1)
+        while frame is not None:
+            depth += 1
+            frame = frame.f_back
+        self._sampler = _StackSampler(threading.get_ident(), depth,
+                                      self.profiler.sample_interval)
+        self._sampler.start()
+        try:
+            self._cprofile.enable()
+        except ValueError:
+            # Another thread is already profiling (Python 3.12+ allows only
+            # one cProfile at a time); keep the stack samples only
+            self._cprofile = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._sampler is None:
+            return False
+        self.profiler._active.stage = None
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        self._sampler.stop()
+        self.profiler._write(self.name, self._cprofile, self._sampler.samples)
+        return False
+
+
+class StageProfiler:
+    """Profiles named stages into one output directory."""
+
+    def __init__(self, output_dir: Path, sample_interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.output_dir = Path(output_dir)
+        self.sample_interval = sample_interval
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._active = threading.local()
+
+    def profile(self, name: str) -> _StageProfile:
+        """Context manager that profiles the enclosed block as stage `name`."""
+        return _StageProfile(self, name)
+
+    def _write(self, name: str, profile: Optional[cProfile.Profile], samples: Counter) -> None:
+        with self._lock:
+            # Repeated stages (e.g. one per backfill date) get numbered files
+            count = self._seen.get(name, 0) + 1
+            self._seen[name] = count
+            file_stem = name if count == 1 else f"{name}-{count}"
+
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+            collapsed = [f"{stack} {n}" for stack, n in sorted(samples.items())]
+            (self.output_dir / f"{file_stem}.collapsed").write_text(
+                "".join(line + "\n" for line in collapsed)
+            )
+            with open(self.output_dir / "all.collapsed", 'a') as f:
+                for stack, n in sorted(samples.items()):
+                    f.write(f"{name};{stack} {n}\n")
+
+            if profile is None:
+                return
+            profile.dump_stats(str(self.output_dir / f"{file_stem}.prof"))
+            report = io.StringIO()
+            stats = pstats.Stats(profile, stream=report)
+            stats.sort_stats("cumulative").print_stats(SUMMARY_LIMIT)
+            with open(self.output_dir / "summary.txt", 'a') as f:
+                f.write(f"===== {file_stem} =====\n")
+                f.write(report.getvalue())
+                f.write("\n")
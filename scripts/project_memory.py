@@ -8,10 +8,29 @@ enabling cross-day context for blog generation.
 
 import json
 import os
-import subprocess
+import time
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
+
+from content_handle import ContentHandle
+from content_sampler import sample_day
+from extractive import TermStats, summarize as extractive_summary
+from file_lock import FileLock
+from history_search import HistoryIndex, query_terms, relevant_logs
+from index_model import IndexModel
+from index_store import IndexStore
+from rate_limiter import TokenBucket
+from rollups import ROLLUP_LLM_CALLS, history_rollups, update_rollups
+from run_metrics import LLMCall, RunMetrics
+from session_record import SessionRecord
+
+# Imported on first use: only runs that read a bundle need tarfile/zipfile,
+# and only runs that summarize need an LLM backend
+if TYPE_CHECKING:
+    from llm_backend import LLMBackend
+    from transcript_archive import TranscriptArchive
 
 
 # Default paths
@@ -19,6 +38,11 @@ TRANSCRIPT_DIR = Path.home() / "transcript"
 REPO_TRANSCRIPT_DIR = Path(__file__).parent.parent / "transcripts"
 DEFAULT_INDEX_PATH = Path(__file__).parent / "data" / "project_index.json"
 
+# Transcript excerpts per day summary, spread over all of the day's sessions
+SUMMARY_SAMPLE_CHARS = 4000
+# Transcript excerpts per project that today's history is ranked against
+QUERY_SAMPLE_CHARS = 8000
+
 
 def get_transcript_dir() -> Path:
     """
@@ -33,38 +57,215 @@ def get_transcript_dir() -> Path:
 class ProjectMemory:
     """Manages the project memory index for cross-day context."""
 
-    def __init__(self, index_path: Optional[Path] = None, transcript_dir: Optional[Path] = None):
+    def __init__(self, index_path: Optional[Path] = None, transcript_dir: Optional[Path] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 llm_backend: Optional["LLMBackend"] = None):
         self.index_path = index_path or DEFAULT_INDEX_PATH
         self.transcript_dir = transcript_dir or get_transcript_dir()
+        self.rate_limiter = rate_limiter
+        # Defaults to the quiet Claude CLI backend, created on first summary
+        self.llm_backend = llm_backend
+        # Set by the runner for the duration of a run to record summary calls
+        self.metrics: Optional[RunMetrics] = None
+        # Optional StageProfiler wrapping the steps of update_index()
+        self.profiler = None
+        # Loaded from disk on first access (see the index property)
+        self._index: Optional[Dict[str, Any]] = None
+        self._loaded_mtime: Optional[Any] = None
+        self._store_instance: Optional[IndexStore] = None
+        self._lock_instance: Optional[FileLock] = None
+        self._model: Optional[IndexModel] = None
+        self._history_index = HistoryIndex()
+        # False once the index may have changed since the last history sync
+        self._history_synced = False
+        self._archive: Optional["TranscriptArchive"] = None
+        self._term_stats: Optional[TermStats] = None
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        """The project index, loaded from disk the first time it is needed."""
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    @index.setter
+    def index(self, value: Dict[str, Any]) -> None:
+        self._index = value
+        self._history_synced = False
+
+    @property
+    def model(self) -> IndexModel:
+        """Query model over the index (see index_model.py), rebuilt when the index is replaced."""
+        if self._model is None or self._model.data is not self.index:
+            self._model = IndexModel(self.index)
+        return self._model
+
+    @property
+    def history_index(self) -> HistoryIndex:
+        """BM25 index over daily logs (see history_search.py), synced after the index changes."""
+        if not self._history_synced:
+            self.sync_history_index()
+        return self._history_index
+
+    def sync_history_index(self) -> int:
+        """
+        Bring the history index up to date with the project index.
+
+        Call it before reading context from several threads, so they find
+        it in sync instead of all syncing it at once.
+
+        Returns:
+            Number of daily logs (re)indexed or removed
+        """
+        self._history_synced = True
+        return self._history_index.sync(self.index["projects"])
+
+    def _profile(self, name: str):
+        return self.profiler.profile(name) if self.profiler is not None else nullcontext()
+
+    @property
+    def _store(self) -> IndexStore:
+        """Snapshot + journal storage for index_path (see index_store.py)."""
+        if self._store_instance is None or self._store_instance.snapshot_path != Path(self.index_path):
+            self._store_instance = IndexStore(self.index_path)
+        return self._store_instance
+
+    def _index_mtime(self) -> Any:
+        # Covers both the snapshot and the journal
+        return self._store.signature()
+
+    @property
+    def _lock(self) -> FileLock:
+        path = Path(self.index_path).with_name(Path(self.index_path).name + ".lock")
+        if self._lock_instance is None or self._lock_instance.path != path:
+            self._lock_instance = FileLock(path)
+        return self._lock_instance
+
+    @contextmanager
+    def locked(self):
+        """
+        Hold the index lock for a read-modify-write cycle.
+
+        Blocks while another process (a runner, the daemon, the CLI) is in
+        its own cycle, then reloads the index if that process saved, so
+        changes are made on top of its work instead of overwriting it.
+        Nested use is fine.
+        """
+        with self._lock:
+            if self._lock.depth == 1:
+                self.refresh_index()
+            try:
+                yield self.index
+            finally:
+                self._history_synced = False
+
+    def refresh_index(self) -> bool:
+        """
+        Reload the index if another process changed it on disk since we loaded it.
+
+        Used by long-running processes (the daemon) that keep the index in memory.
+        Returns True if the index was reloaded.
+        """
+        if self._index is None or self._index_mtime() == self._loaded_mtime:
+            return False
         self.index = self._load_index()
+        return True
+
+    @property
+    def _state_path(self) -> Path:
+        # project_index.json -> project_index.state.json (local, not committed)
+        return Path(self.index_path).with_name(Path(self.index_path).stem + ".state.json")
+
+    @property
+    def term_stats(self) -> TermStats:
+        """Document frequencies for offline summaries (project_index.terms.json, local)."""
+        if self._term_stats is None:
+            path = Path(self.index_path).with_name(Path(self.index_path).stem + ".terms.json")
+            self._term_stats = TermStats(path)
+        return self._term_stats
+
+    def _read_state(self) -> Dict[str, Any]:
+        try:
+            with open(self._state_path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_state(self, **updates: Any) -> None:
+        state = {**self._read_state(), **updates}
+        self._state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._state_path.with_name(self._state_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(state, indent=2))
+        os.replace(tmp_path, self._state_path)
+
+    @property
+    def last_scan(self) -> Optional[str]:
+        """
+        When update_index() last looked for new sessions.
+
+        Kept in a small state file rather than the index, so a scan that
+        finds nothing leaves the index (and git) untouched. Falls back to
+        the index's last_updated for indexes written before the state file.
+        """
+        return self._read_state().get("last_scan") or self.index.get("last_updated")
+
+    @property
+    def index_unpublished(self) -> bool:
+        """Whether project_index.json changed since it was last committed."""
+        return self._read_state().get("unpublished", True)
+
+    def mark_index_published(self) -> None:
+        with self._lock:
+            self._write_state(unpublished=False)
 
     def _load_index(self) -> Dict[str, Any]:
-        """Load the project index from disk, or create empty if doesn't exist."""
-        if self.index_path.exists():
-            try:
-                with open(self.index_path, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                # Corrupted or unreadable file - start fresh
-                pass
-        return {
-            "last_updated": None,
-            "projects": {}
-        }
+        """Load the index snapshot plus its journal, or create empty if neither exists."""
+        self._loaded_mtime = self._index_mtime()
+        return self._store.load()
+
+    def _save_index(self) -> int:
+        """Journal the index changes since the last load or save. Returns the number of changes."""
+        compactions = self._store.compactions
+        changes = self._store.save(self.index)
+        self._loaded_mtime = self._index_mtime()
+        if self._store.compactions != compactions:
+            self._write_state(unpublished=True)
+        return changes
+
+    def compact_index(self) -> bool:
+        """
+        Fold the journal into project_index.json (e.g. before committing it).
 
-    def _save_index(self) -> None:
-        """Save the project index to disk."""
-        self.index_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.index_path, 'w') as f:
-            json.dump(self.index, f, indent=2, default=str)
+        Returns:
+            True if the snapshot was rewritten
+        """
+        with self.locked():
+            self._save_index()
+            if not self._store.has_journal():
+                return False
+            self._store.compact(self.index)
+            self._loaded_mtime = self._index_mtime()
+            self._write_state(unpublished=True)
+            return True
 
-    def find_all_sessions(self) -> List[Dict[str, Any]]:
-        """Find all transcript sessions in the transcript directory."""
+    def find_all_sessions(self) -> List[SessionRecord]:
+        """
+        Find all transcript sessions in the transcript directory.
+
+        Returns compact SessionRecords, which also read like the session dicts
+        used elsewhere (session["project"], session.get("metadata"), ...).
+        Metadata files are only read when a record's metadata is accessed.
+        """
         sessions = []
 
         if not self.transcript_dir.exists():
             return sessions
 
+        # Transcript bundle (.tar, .tar.zst, .zip) - read without extracting
+        from transcript_archive import is_transcript_archive
+        if is_transcript_archive(self.transcript_dir):
+            return self._find_sessions_archive()
+
         # Check if this is the local structure or repo structure
         # Local: ~/transcript/[project]/[date]/[session_id]/conversation.md
         # Repo:  transcripts/[date]/[project]_[session_id].md
@@ -95,7 +296,7 @@ class ProjectMemory:
         except ValueError:
             return False
 
-    def _find_sessions_repo_structure(self) -> List[Dict[str, Any]]:
+    def _find_sessions_repo_structure(self) -> List[SessionRecord]:
         """Find sessions in repo structure: transcripts/[date]/[project]_[session_id].md"""
         sessions = []
 
@@ -108,33 +309,26 @@ class ProjectMemory:
 
             date_str = date_dir.name
 
-            for transcript_file in date_dir.iterdir():
-                if not transcript_file.is_file() or not transcript_file.name.endswith('.md'):
-                    continue
+            with os.scandir(date_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.md') or not entry.is_file():
+                        continue
 
-                # Parse filename: [project]_[session_id].md
-                filename = transcript_file.stem
-                parts = filename.rsplit('_', 1)
+                    # Parse filename: [project]_[session_id].md
+                    filename = entry.name[:-3]
+                    parts = filename.rsplit('_', 1)
 
-                if len(parts) == 2:
-                    project_name, session_id = parts
-                else:
-                    project_name = filename
-                    session_id = filename
+                    if len(parts) == 2:
+                        project_name, session_id = parts
+                    else:
+                        project_name = filename
+                        session_id = filename
 
-                session_info = {
-                    "project": project_name,
-                    "date": date_str,
-                    "session_id": session_id,
-                    "path": str(date_dir),
-                    "conversation_path": str(transcript_file),
-                    "has_metadata": False
-                }
-                sessions.append(session_info)
+                    sessions.append(SessionRecord(project_name, date_str, session_id, entry.path))
 
         return sessions
 
-    def _find_sessions_local_structure(self) -> List[Dict[str, Any]]:
+    def _find_sessions_local_structure(self) -> List[SessionRecord]:
         """Find sessions in local structure: ~/transcript/[project]/[date]/[session_id]/"""
         sessions = []
 
@@ -154,37 +348,67 @@ class ProjectMemory:
 
                 date_str = date_dir.name
 
-                for session_dir in date_dir.iterdir():
-                    if not session_dir.is_dir():
-                        continue
+                with os.scandir(date_dir) as entries:
+                    for entry in entries:
+                        if not entry.is_dir():
+                            continue
+
+                        conversation_file = os.path.join(entry.path, "conversation.md")
+                        if os.path.exists(conversation_file):
+                            sessions.append(SessionRecord(project_name, date_str, entry.name,
+                                                          conversation_file))
+
+        return sessions
+
+    def _get_archive(self) -> "TranscriptArchive":
+        """Open (or reuse) the archive at transcript_dir."""
+        from transcript_archive import TranscriptArchive
+        if self._archive is None or self._archive.path != Path(self.transcript_dir):
+            if self._archive is not None:
+                self._archive.close()
+            self._archive = TranscriptArchive(self.transcript_dir)
+        return self._archive
+
+    def _find_sessions_archive(self) -> List[SessionRecord]:
+        """
+        Find sessions inside a transcript bundle.
+
+        Both layouts are recognized from member names alone, with or without
+        a leading bundle root directory:
+          Local: [root/][project]/[date]/[session_id]/conversation.md
+          Repo:  [root/][date]/[project]_[session_id].md
+        """
+        archive = self._get_archive()
+        sessions = []
+
+        for name in archive.names():
+            # "./project/..." from `tar -C dir -cf bundle.tar .`: drop "." parts
+            # before the hidden-file check (the member name itself is kept)
+            parts = [part for part in name.strip('/').split('/') if part not in ('', '.')]
+            if not parts or any(part.startswith('.') for part in parts):
+                continue
 
-                    session_id = session_dir.name
-                    conversation_file = session_dir / "conversation.md"
-                    metadata_file = session_dir / "metadata.json"
-
-                    if conversation_file.exists():
-                        session_info = {
-                            "project": project_name,
-                            "date": date_str,
-                            "session_id": session_id,
-                            "path": str(session_dir),
-                            "conversation_path": str(conversation_file),
-                            "has_metadata": metadata_file.exists()
-                        }
-
-                        # Load metadata if available
-                        if metadata_file.exists():
-                            try:
-                                with open(metadata_file, 'r') as f:
-                                    session_info["metadata"] = json.load(f)
-                            except json.JSONDecodeError:
-                                pass
-
-                        sessions.append(session_info)
+            if parts[-1] == "conversation.md" and len(parts) >= 4 and self._is_date_format(parts[-3]):
+                project_name, date_str, session_id = parts[-4], parts[-3], parts[-2]
+                sessions.append(SessionRecord(project_name, date_str, session_id, name,
+                                              archive_member=name, archive=archive))
+
+            elif parts[-1].endswith('.md') and len(parts) >= 2 and self._is_date_format(parts[-2]):
+                filename = parts[-1][:-3]
+                name_parts = filename.rsplit('_', 1)
+
+                if len(name_parts) == 2:
+                    project_name, session_id = name_parts
+                else:
+                    project_name = filename
+                    session_id = filename
+
+                sessions.append(SessionRecord(project_name, parts[-2], session_id, name,
+                                              archive_member=name, archive=archive))
 
         return sessions
 
-    def find_new_sessions(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
+    def find_new_sessions(self, since: Optional[str] = None) -> List[SessionRecord]:
         """Find sessions added since the last update."""
         all_sessions = self.find_all_sessions()
 
@@ -202,82 +426,140 @@ class ProjectMemory:
 
         return new_sessions
 
-    def get_session_content(self, session: Dict[str, Any]) -> str:
-        """Read the conversation content from a session."""
-        conversation_path = Path(session["conversation_path"])
-        if conversation_path.exists():
-            return conversation_path.read_text()
-        return ""
+    def get_session_content(self, session: Dict[str, Any], limit: Optional[int] = None) -> str:
+        """Read the conversation content from a session, optionally only the first `limit` chars."""
+        handle = self.get_session_handle(session)
+        return handle.read(limit) if handle is not None else ""
+
+    def get_session_handle(self, session: Dict[str, Any]) -> Optional[ContentHandle]:
+        """A lazy handle on a session's conversation, or None if it is missing or empty."""
+        member = session.get("archive_member")
+        if member:
+            archive = self._get_archive()
+            if member not in archive or archive.size(member) == 0:
+                return None
+            return ContentHandle(str(archive.path), archive.size(member),
+                                 lambda limit: self._get_archive().read_text(member, limit),
+                                 member=member,
+                                 range_reader=lambda start, length:
+                                     self._get_archive().read_range(member, start, length))
+
+        return ContentHandle.for_file(Path(session["conversation_path"]))
 
     def update_index(self, use_claude_for_summaries: bool = True) -> Dict[str, int]:
         """
         Update the project index with new sessions.
 
+        Holds the index lock throughout (see locked()).
+
         Returns stats about what was updated.
         """
+        with self.locked():
+            return self._update_index(use_claude_for_summaries)
+
+    def _update_index(self, use_claude_for_summaries: bool) -> Dict[str, int]:
         stats = {
             "new_sessions": 0,
             "new_projects": 0,
-            "updated_projects": 0
+            "updated_projects": 0,
+            "new_session_keys": []
         }
 
-        # Get sessions since last update
-        since = self.index.get("last_updated")
-        new_sessions = self.find_new_sessions(since)
+        # Get sessions since the last scan
+        since = self.last_scan
+        with self._profile("find_sessions"):
+            new_sessions = self.find_new_sessions(since)
 
+        model = self.model
         for session in new_sessions:
             project = session["project"]
             date = session["date"]
             session_id = session["session_id"]
 
-            # Create project entry if new
-            if project not in self.index["projects"]:
-                self.index["projects"][project] = {
-                    "first_seen": date,
-                    "last_touched": date,
-                    "total_sessions": 0,
-                    "summary": "",
-                    "daily_logs": {}
-                }
+            # Creates the project and daily log entries as needed
+            new_project, added = model.add_session(project, date, session_id)
+            if new_project:
                 stats["new_projects"] += 1
+            if added:
+                stats["new_sessions"] += 1
+                stats["updated_projects"] += 1
+                stats["new_session_keys"].append([project, date, session_id])
 
-            project_data = self.index["projects"][project]
+        # Summarize updated days (offline only when summaries are skipped)
+        if stats["new_sessions"] > 0:
+            with self._profile("summaries"):
+                self._update_summaries(new_sessions, use_claude=use_claude_for_summaries)
 
-            # Update last_touched
-            if date > project_data["last_touched"]:
-                project_data["last_touched"] = date
+        # Roll up weeks and months that have closed (LLM-written only with summaries on)
+        with self._profile("rollups"):
+            self.update_rollups(use_claude=use_claude_for_summaries)
 
-            # Initialize daily log if needed
-            if date not in project_data["daily_logs"]:
-                project_data["daily_logs"][date] = {
-                    "sessions": [],
-                    "summary": "",
-                    "key_topics": []
-                }
+        now = datetime.now().isoformat()
 
-            daily_log = project_data["daily_logs"][date]
+        # Save only if the content changed; last_updated marks the last change
+        with self._profile("save_index"):
+            if self._store.is_dirty(self.index):
+                self.index["last_updated"] = now
+                self._save_index()
+        self._write_state(last_scan=now)
 
-            # Add session if not already tracked
-            if session_id not in daily_log["sessions"]:
-                daily_log["sessions"].append(session_id)
-                project_data["total_sessions"] += 1
-                stats["new_sessions"] += 1
-                stats["updated_projects"] += 1
+        return stats
 
-        # Generate summaries for updated projects
-        if use_claude_for_summaries and stats["new_sessions"] > 0:
-            self._update_summaries(new_sessions)
+    def update_rollups(self, use_claude: bool = True, today: Optional[str] = None) -> int:
+        """
+        Build the weekly and monthly rollups of every project for periods
+        that have closed since the last update, or whose days changed.
+        At most ROLLUP_LLM_CALLS rollups are written by the LLM per update,
+        across all projects; fallback rollups are rewritten on later updates.
 
-        # Update timestamp
-        self.index["last_updated"] = datetime.now().isoformat()
+        Args:
+            use_claude: Write rollup summaries with the LLM backend (otherwise
+                the daily summaries are run together)
+            today: YYYY-MM-DD; periods ending on or after it stay open (default: today)
 
-        # Save index
-        self._save_index()
+        Returns:
+            Number of rollups built
+        """
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        built = 0
+        calls = 0
+        with self.locked():
+            for name, project in self.index["projects"].items():
+                summarize = None
+                if use_claude:
+                    def summarize(level, period, children, name=name):
+                        nonlocal calls
+                        calls += 1
+                        return self._generate_rollup(name, level, period, children)
+                built += update_rollups(project, today, summarize,
+                                        max_calls=ROLLUP_LLM_CALLS - calls)
+        return built
+
+    def summarize_days(self, days: List[Tuple[str, str]]) -> None:
+        """Generate Claude summaries for specific (project, date) pairs and save."""
+        wanted = set(tuple(day) for day in days)
+        if not wanted:
+            return
 
-        return stats
+        sessions = [
+            s for s in self.find_all_sessions()
+            if (s["project"], s["date"]) in wanted
+        ]
+        with self.locked():
+            self._update_summaries(sessions)
+            # Closed weeks whose daily summaries just changed are rolled up again
+            self.update_rollups()
+            if self._store.is_dirty(self.index):
+                self._save_index()
+
+    def _update_summaries(self, sessions: List[Dict[str, Any]], use_claude: bool = True) -> None:
+        """
+        Update daily summaries for the days of `sessions`.
 
-    def _update_summaries(self, sessions: List[Dict[str, Any]]) -> None:
-        """Update summaries for projects with new sessions using Claude."""
+        Each day gets an LLM summary when use_claude is set and the call
+        succeeds. Otherwise it gets an offline extractive summary (see
+        extractive.py), unless it already has an LLM one.
+        """
         # Group sessions by project and date
         project_dates = {}
         for session in sessions:
@@ -287,31 +569,42 @@ class ProjectMemory:
             project_dates[key].append(session)
 
         for (project, date), date_sessions in project_dates.items():
-            # Read conversation content
-            content_snippets = []
-            for session in date_sessions[:3]:  # Limit to 3 sessions for summary
-                content = self.get_session_content(session)
-                # Take first 2000 chars of each session
-                if content:
-                    content_snippets.append(content[:2000])
+            if project not in self.index["projects"]:
+                continue
+
+            # Excerpts from every session of the day (see content_sampler.py)
+            handles = [self.get_session_handle(session) for session in date_sessions]
+            content_snippets = sample_day(handles, SUMMARY_SAMPLE_CHARS)
 
             if not content_snippets:
                 continue
 
-            # Generate summary using Claude CLI
-            combined_content = "\n\n---\n\n".join(content_snippets)
-            summary = self._generate_summary(project, date, combined_content)
+            # Always computed: it keeps the term statistics current and costs milliseconds
+            offline = extractive_summary(content_snippets, self.term_stats,
+                                         key=f"{project}/{date}", exclude=[project])
 
-            if summary and project in self.index["projects"]:
-                daily_log = self.index["projects"][project]["daily_logs"].get(date, {})
+            summary = None
+            if use_claude:
+                combined_content = "\n\n---\n\n".join(content_snippets)
+                summary = self._generate_summary(project, date, combined_content)
+
+            daily_log = self.index["projects"][project]["daily_logs"].get(date, {})
+            if summary:
                 daily_log["summary"] = summary.get("summary", "")
                 daily_log["key_topics"] = summary.get("key_topics", [])
+                daily_log.pop("summary_source", None)
+            elif not daily_log.get("summary") or daily_log.get("summary_source") == "extractive":
+                daily_log.update(offline)
+            else:
+                continue
+
+            # Update overall project summary
+            self.index["projects"][project]["summary"] = self._generate_project_summary(project)
 
-                # Update overall project summary
-                self.index["projects"][project]["summary"] = self._generate_project_summary(project)
+        self.term_stats.save()
 
     def _generate_summary(self, project: str, date: str, content: str) -> Optional[Dict[str, Any]]:
-        """Generate a summary of the day's work using Claude CLI."""
+        """Generate a summary of the day's work using the LLM backend."""
         prompt = f"""Summarize this Claude Code session for the project "{project}" on {date}.
 
 Provide a JSON response with:
@@ -319,40 +612,72 @@ Provide a JSON response with:
 - "key_topics": A list of 3-5 key topics/technologies discussed
 
 Session content:
-{content[:4000]}
+{content}
+
+Respond with only valid JSON, no other text."""
+
+        return self._complete_json(prompt, label="summary")
+
+    def _generate_rollup(self, project: str, level: str, period: str,
+                         children: List[Tuple[str, str, List[str]]]) -> Optional[Dict[str, Any]]:
+        """Summarize a closed week or month of a project from the level below (see rollups.py)."""
+        lines = [f"- {label}: {summary or 'no summary'} (topics: {', '.join(topics) or 'none'})"
+                 for label, summary, topics in children]
+        below = "days" if level == "week" else "weeks"
+        prompt = f"""Summarize the {level} {period} of work on the project "{project}" from these {below}.
+
+Provide a JSON response with:
+- "summary": A 2-3 sentence summary of what was accomplished over the {level}
+- "key_topics": A list of 3-5 key topics/technologies
+
+{below.capitalize()}:
+{chr(10).join(lines)[:4000]}
 
 Respond with only valid JSON, no other text."""
 
+        return self._complete_json(prompt, label="rollup")
+
+    def _complete_json(self, prompt: str, label: str) -> Optional[Dict[str, Any]]:
+        """Send a prompt to the LLM backend and parse the JSON object in its reply."""
+        if self.llm_backend is None:
+            from llm_backend import ClaudeCLIBackend
+            self.llm_backend = ClaudeCLIBackend(verbose=False)
+
+        call = LLMCall(label=label, prompt_chars=len(prompt))
+        if self.rate_limiter is not None:
+            call.rate_limit_wait = self.rate_limiter.acquire()
+
+        started = time.perf_counter()
         try:
-            result = subprocess.run(
-                ['claude', '--print', '-p', prompt],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            if result.returncode == 0 and result.stdout.strip():
-                # Try to parse JSON from response
-                response = result.stdout.strip()
+            response = self.llm_backend.complete(prompt, timeout=60, call=call).strip()
+            call.response_chars = len(response)
+            if response:
                 # Find JSON in response
                 start = response.find('{')
                 end = response.rfind('}') + 1
                 if start >= 0 and end > start:
-                    return json.loads(response[start:end])
-        except (subprocess.TimeoutExpired, json.JSONDecodeError, Exception):
+                    summary = json.loads(response[start:end])
+                    call.ok = True
+                    return summary
+        except (json.JSONDecodeError, Exception):
             pass
+        finally:
+            call.wall = time.perf_counter() - started
+            if self.metrics is not None:
+                self.metrics.record_llm_call(call)
 
         return None
 
     def _generate_project_summary(self, project: str) -> str:
         """Generate an overall summary for a project based on daily logs."""
-        if project not in self.index["projects"]:
+        timeline = self.model.project(project)
+        if timeline is None:
             return ""
 
-        project_data = self.index["projects"][project]
+        project_data = timeline.data
         daily_summaries = []
 
-        for date, log in sorted(project_data["daily_logs"].items())[-5:]:
+        for date, log in timeline.recent_logs().items():
             if log.get("summary"):
                 daily_summaries.append(f"- {date}: {log['summary']}")
 
@@ -365,28 +690,33 @@ Respond with only valid JSON, no other text."""
         """Get the full history for a specific project."""
         return self.index["projects"].get(project)
 
-    def get_context_for_blog(self, date: Optional[str] = None) -> Dict[str, Any]:
+    def get_context_for_blog(self, date: Optional[str] = None,
+                             sessions: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Get context for blog generation including today's transcripts and historical context.
 
         Args:
             date: Date to generate context for (defaults to today)
+            sessions: Pre-computed find_all_sessions() result, so several dates
+                can share one walk of the transcript tree
 
         Returns:
-            Dictionary with 'today' (list of sessions) and 'history' (project summaries)
+            Dictionary with 'today' (list of sessions) and 'history' (project summaries).
+            Each session's "content" is a ContentHandle; only a sample of it is
+            read here, to rank the history (see history_search.py).
         """
         if date is None:
             date = datetime.now().strftime('%Y-%m-%d')
 
         # Get today's sessions
-        all_sessions = self.find_all_sessions()
+        all_sessions = sessions if sessions is not None else self.find_all_sessions()
         today_sessions = [s for s in all_sessions if s["date"] == date]
 
-        # Get today's transcript content
+        # Get handles on today's transcripts (read lazily by the prompt builder)
         today_transcripts = []
         for session in today_sessions:
-            content = self.get_session_content(session)
-            if content:
+            content = self.get_session_handle(session)
+            if content is not None:
                 today_transcripts.append({
                     "project": session["project"],
                     "session_id": session["session_id"],
@@ -398,23 +728,23 @@ Respond with only valid JSON, no other text."""
         historical_context = []
 
         for project in projects_today:
-            history = self.get_project_history(project)
-            if history:
-                # Get recent daily logs (excluding today)
-                recent_logs = {}
-                for log_date, log in sorted(history["daily_logs"].items()):
-                    if log_date < date:
-                        recent_logs[log_date] = log
-
-                # Take last 5 days
-                recent_logs = dict(list(recent_logs.items())[-5:])
+            timeline = self.model.project(project)
+            if timeline is not None:
+                history = timeline.data
+                # Earlier days most relevant to today's transcripts, then weeks and months
+                handles = [t["content"] for t in today_transcripts if t["project"] == project]
+                query = query_terms(sample_day(handles, QUERY_SAMPLE_CHARS))
+                recent_logs = relevant_logs(self.history_index, timeline, query, before=date)
+                weekly, monthly = history_rollups(history, before=date)
 
                 historical_context.append({
                     "project": project,
                     "first_worked": history["first_seen"],
                     "total_sessions": history["total_sessions"],
                     "summary": history["summary"],
-                    "recent_sessions": recent_logs
+                    "recent_sessions": recent_logs,
+                    "weekly": weekly,
+                    "monthly": monthly
                 })
 
         return {
@@ -430,15 +760,13 @@ Respond with only valid JSON, no other text."""
 
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the project index."""
-        total_sessions = sum(
-            p["total_sessions"] for p in self.index["projects"].values()
-        )
-
+        model = self.model
         return {
             "total_projects": len(self.index["projects"]),
-            "total_sessions": total_sessions,
+            "total_sessions": model.total_sessions,
             "last_updated": self.index["last_updated"],
-            "projects": list(self.index["projects"].keys())
+            "last_scan": self.last_scan,
+            "projects": model.project_names
         }
 
 
@@ -447,16 +775,32 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Manage AutoBlog project memory")
-    parser.add_argument("command", choices=["update", "stats", "context", "history"],
+    parser.add_argument("command",
+                        choices=["update", "stats", "context", "history", "compact", "convert"],
                         help="Command to run")
     parser.add_argument("--project", help="Project name (for history command)")
     parser.add_argument("--date", help="Date for context (YYYY-MM-DD)")
     parser.add_argument("--no-summaries", action="store_true",
                         help="Skip Claude summary generation")
+    parser.add_argument("--index", type=Path,
+                        help="Index file; .json, .abix or .msgpack (default: data/project_index.json)")
+    parser.add_argument("--to", type=Path, dest="convert_to",
+                        help="Destination for convert; its extension picks the format")
+    parser.add_argument("--transcript-dir", type=Path,
+                        help="Transcript directory or bundle (.tar, .tar.zst, .zip)")
+    parser.add_argument("--profile", nargs="?", const="", type=str, metavar="DIR",
+                        help="Write per-stage cProfile and flame graph stacks "
+                             "(default dir: scripts/data/profiles/)")
 
     args = parser.parse_args()
 
-    memory = ProjectMemory()
+    memory = ProjectMemory(index_path=args.index, transcript_dir=args.transcript_dir)
+    if args.profile is not None:
+        from profiling import StageProfiler, default_profile_dir
+        memory.profiler = StageProfiler(
+            Path(args.profile) if args.profile else default_profile_dir(f"memory-{args.command}")
+        )
+        print(f"Profiling to {memory.profiler.output_dir}")
 
     if args.command == "update":
         print("Updating project index...")
@@ -470,15 +814,36 @@ def main():
         print(f"Total projects: {stats['total_projects']}")
         print(f"Total sessions: {stats['total_sessions']}")
         print(f"Last updated: {stats['last_updated']}")
+        print(f"Last scan: {stats['last_scan']}")
         print(f"Projects: {', '.join(stats['projects'])}")
 
     elif args.command == "context":
-        context = memory.get_context_for_blog(args.date)
+        with memory._profile("context"):
+            context = memory.get_context_for_blog(args.date)
         print(f"Date: {context['date']}")
         print(f"Projects worked on: {', '.join(context['projects_worked_on'])}")
         print(f"Today's sessions: {len(context['today'])}")
         print(f"Historical context for {len(context['history'])} projects")
 
+    elif args.command == "compact":
+        if memory.compact_index():
+            print(f"Compacted journal into {memory.index_path}")
+        else:
+            print("Nothing to compact")
+
+    elif args.command == "convert":
+        if not args.convert_to:
+            print("Error: --to required for convert command")
+            return
+        from index_format import convert_index
+        try:
+            with memory.locked():
+                convert_index(Path(memory.index_path), args.convert_to)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            return
+        print(f"Converted {memory.index_path} to {args.convert_to}")
+
     elif args.command == "history":
         if not args.project:
             print("Error: --project required for history command")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Weekly and Monthly Rollups for AutoBlog Project History
+
+Daily logs say what happened on one day. For long-running projects the
+blog prompt also needs the longer arc, without re-reading old transcripts
+or pasting in hundreds of daily summaries. Each project therefore keeps
+rollups in its index entry:
+
+    "rollups": {
+        "2026-W03": {"level": "week", "summary": ..., "key_topics": [...],
+                     "days": 4, "sessions": 9, "source": "<digest>"},
+        "2026-01":  {"level": "month", ...},
+    }
+
+A week (ISO, Monday to Sunday) is rolled up from its daily logs once it
+has ended. A month is rolled up from its weeks once its last week has
+ended. A week belongs to the month holding its Thursday, the ISO rule, so
+every week lands in exactly one month. Each rollup records a digest of
+its inputs. A closed period is only summarized again when those inputs
+change, e.g. a late session or a daily summary filled in afterwards.
+
+One update sends at most ROLLUP_LLM_CALLS rollups to the LLM, newest
+first, so the first update over years of history doesn't make hundreds of
+calls. The rest get a fallback summary marked "summary_source": "fallback",
+and later updates rewrite those with the LLM.
+"""
+
+import hashlib
+import json
+from collections import Counter, defaultdict
+from datetime import date as Date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Rollups handed to the prompt per project: fixed, however old the project
+HISTORY_WEEKS = 4
+HISTORY_MONTHS = 12
+
+# Length of a rollup summary built without the LLM
+FALLBACK_SUMMARY_CHARS = 400
+
+# Rollups one update may send to the LLM; the rest wait for later updates
+ROLLUP_LLM_CALLS = 20
+
+# (level, period, children) -> {"summary", "key_topics"}, or None to use the fallback.
+# children are (label, summary, key_topics) tuples, oldest first.
+Summarizer = Callable[[str, str, List[Tuple[str, str, List[str]]]], Optional[Dict[str, Any]]]
+
+
+def week_of(day: str) -> str:
+    """ISO week key ("2026-W03") of a YYYY-MM-DD date."""
+    year, week, _ = Date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_start(week: str) -> Date:
+    year, number = week.split("-W")
+    return Date.fromisocalendar(int(year), int(number), 1)
+
+
+def week_end(week: str) -> Date:
+    return week_start(week) + timedelta(days=6)
+
+
+def month_of_week(week: str) -> str:
+    """Month ("2026-01") a week belongs to: the one holding its Thursday."""
+    return (week_start(week) + timedelta(days=3)).strftime('%Y-%m')
+
+
+def month_end(month: str) -> Date:
+    """Last day of the last week belonging to `month`."""
+    year, number = (int(part) for part in month.split("-"))
+    first_of_next = Date(year + number // 12, number % 12 + 1, 1)
+    last_thursday = first_of_next - timedelta(days=(first_of_next.weekday() - 3) % 7 or 7)
+    return last_thursday + timedelta(days=3)
+
+
+def _digest(children: List[Tuple[str, str, List[str]]], sessions: int) -> str:
+    encoded = json.dumps([children, sessions], sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def fallback_rollup(children: List[Tuple[str, str, List[str]]]) -> Dict[str, Any]:
+    """A rollup without the LLM: the child summaries run together, and the most common topics."""
+    topics = Counter(topic for _, _, child_topics in children for topic in child_topics)
+    summary = " ".join(s.strip() for _, s, _ in children if s.strip())
+    if len(summary) > FALLBACK_SUMMARY_CHARS:
+        summary = summary[:FALLBACK_SUMMARY_CHARS].rsplit(" ", 1)[0] + " ..."
+    return {"summary": summary, "key_topics": [t for t, _ in topics.most_common(5)]}
+
+
+def update_rollups(project: Dict[str, Any], today: str,
+                   summarize: Optional[Summarizer] = None,
+                   max_calls: Optional[int] = ROLLUP_LLM_CALLS) -> int:
+    """
+    Bring a project's rollups up to date.
+
+    Only periods that have ended before `today` are rolled up, and only
+    when they are new, their inputs changed, or they hold a fallback
+    summary and `summarize` is given.
+
+    Args:
+        project: The project's index entry (modified in place)
+        today: YYYY-MM-DD; periods ending on or after it are still open
+        summarize: Builds a rollup's summary; None (or a None result) uses
+            fallback_rollup()
+        max_calls: Most calls to `summarize` (None: no limit); newer
+            periods are sent first
+
+    Returns:
+        Number of rollups (re)built
+    """
+    cutoff = Date.fromisoformat(today)
+    rollups = project.setdefault("rollups", {})
+    built = 0
+    calls = 0
+
+    def build(key: str, level: str, children, days: int, sessions: int) -> None:
+        nonlocal built, calls
+        source = _digest(children, sessions)
+        existing = rollups.get(key)
+        changed = existing is None or existing.get("source") != source
+        if not changed and (existing.get("summary_source") != "fallback" or summarize is None):
+            return
+        result = None
+        if summarize is not None and (max_calls is None or calls < max_calls):
+            calls += 1
+            result = summarize(level, key, children)
+        if not changed and not result:
+            return  # no better summary than the fallback it already has
+        fallback = not result
+        if fallback:
+            result = fallback_rollup(children)
+        rollups[key] = {
+            "level": level,
+            "summary": result.get("summary", ""),
+            "key_topics": list(result.get("key_topics", [])),
+            "days": days,
+            "sessions": sessions,
+            "source": source,
+        }
+        if fallback:
+            rollups[key]["summary_source"] = "fallback"
+        built += 1
+
+    # Weeks, from daily logs
+    weeks: Dict[str, List[str]] = defaultdict(list)
+    for day in project.get("daily_logs", {}):
+        weeks[week_of(day)].append(day)
+    for week, days in sorted(weeks.items(), reverse=True):
+        if week_end(week) >= cutoff:
+            continue
+        logs = project["daily_logs"]
+        children = [(day, logs[day].get("summary", ""), logs[day].get("key_topics", []))
+                    for day in sorted(days)]
+        sessions = sum(len(logs[day].get("sessions", [])) for day in days)
+        build(week, "week", children, len(days), sessions)
+
+    # Months, from closed weeks
+    months: Dict[str, List[str]] = defaultdict(list)
+    for key, rollup in rollups.items():
+        if rollup.get("level") == "week":
+            months[month_of_week(key)].append(key)
+    for month, month_weeks in sorted(months.items(), reverse=True):
+        if month_end(month) >= cutoff:
+            continue
+        children = [(week, rollups[week]["summary"], rollups[week]["key_topics"])
+                    for week in sorted(month_weeks)]
+        build(month, "month", children,
+              sum(rollups[w]["days"] for w in month_weeks),
+              sum(rollups[w]["sessions"] for w in month_weeks))
+
+    return built
+
+
+def history_rollups(project: Dict[str, Any], before: str,
+                    weeks: int = HISTORY_WEEKS, months: int = HISTORY_MONTHS
+                    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Rollups for a prompt about `before`: the last `weeks` weeks that ended
+    before it, and the last `months` months before those weeks.
+
+    Returns:
+        (weekly, monthly), each {period: rollup}, oldest first
+    """
+    cutoff = Date.fromisoformat(before)
+    rollups = project.get("rollups", {})
+    weekly_keys = sorted(k for k, r in rollups.items()
+                         if r.get("level") == "week" and week_end(k) < cutoff)[-weeks:] if weeks else []
+    # Months only cover what the weeks don't
+    horizon = week_start(weekly_keys[0]) if weekly_keys else cutoff
+    monthly_keys = sorted(k for k, r in rollups.items()
+                          if r.get("level") == "month" and month_end(k) < horizon)[-months:] if months else []
+    return ({k: rollups[k] for k in weekly_keys}, {k: rollups[k] for k in monthly_keys})
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Run Metrics for AutoBlog
+
+Structured telemetry for a single run: wall and CPU time per stage, one
+record per LLM call (prompt and response size, backends tried, rate-limit
+wait) and stage cache hits. Each finished run is appended as one JSON line
+to a run-history file, from which `daily_blog.py status` reports p50/p95
+latencies.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linearly interpolated percentile (0-100) of `values`, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class LLMCall:
+    """One logical Claude call, possibly spanning several backends."""
+    label: str
+    prompt_chars: int
+    response_chars: int = 0
+    backend: str = ""
+    attempts: int = 0
+    wall: float = 0.0
+    rate_limit_wait: float = 0.0
+    ok: bool = False
+
+
+class RunMetrics:
+    """Collects timings and LLM call stats for one run. Thread-safe."""
+
+    def __init__(self, command: str, **meta: Any):
+        self.command = command
+        self.meta = meta
+        self.started = datetime.now()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.llm_calls: List[LLMCall] = []
+        self.counters: Dict[str, int] = {}
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block as stage `name` (repeated stages accumulate)."""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - wall_start,
+                           time.thread_time() - cpu_start)
+
+    def add_stage(self, name: str, wall: float, cpu: float, cached: bool = False) -> None:
+        """Record a stage timing measured elsewhere (e.g. by the Pipeline)."""
+        with self._lock:
+            entry = self.stages.setdefault(
+                name, {"wall": 0.0, "cpu": 0.0, "count": 0, "cached": cached}
+            )
+            entry["wall"] += wall
+            entry["cpu"] += cpu
+            entry["count"] += 1
+            entry["cached"] = entry["cached"] and cached
+
+    def add_pipeline_result(self, result) -> None:
+        """Record the stage timings and cache hits of a PipelineResult."""
+        for name in result.cached:
+            self.add_stage(name, 0.0, 0.0, cached=True)
+        for name, timing in result.timings.items():
+            self.add_stage(name, timing["wall"], timing["cpu"])
+
+    def record_llm_call(self, call: LLMCall) -> None:
+        with self._lock:
+            self.llm_calls.append(call)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self, success: bool, **extra: Any) -> Dict[str, Any]:
+        """Build the run record."""
+        with self._lock:
+            calls = [asdict(call) for call in self.llm_calls]
+            stages = {name: dict(entry) for name, entry in self.stages.items()}
+            counters = dict(self.counters)
+
+        hits = sum(1 for entry in stages.values() if entry["cached"])
+        misses = len(stages) - hits
+
+        return {
+            "command": self.command,
+            "started": self.started.isoformat(timespec='seconds'),
+            "success": success,
+            **self.meta,
+            **extra,
+            "wall": time.perf_counter() - self._wall_start,
+            "cpu": time.process_time() - self._cpu_start,
+            "stages": stages,
+            "llm": {
+                "calls": calls,
+                "total_calls": len(calls),
+                "failed_calls": sum(1 for c in calls if not c["ok"]),
+                "retries": sum(max(0, c["attempts"] - 1) for c in calls),
+                "prompt_chars": sum(c["prompt_chars"] for c in calls),
+                "response_chars": sum(c["response_chars"] for c in calls),
+                "rate_limit_wait": sum(c["rate_limit_wait"] for c in calls),
+            },
+            "cache": {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / len(stages) if stages else None,
+            },
+            "counters": counters,
+        }
+
+
+class RunHistory:
+    """Append-only JSON-lines file of run records."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(record, default=str) + "\n"
+        # A single O_APPEND write, so concurrent runs never interleave records
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def load(self, limit: Optional[int] = None,
+             command: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The most recent records (oldest first), skipping malformed lines."""
+        if not self.path.exists():
+            return []
+
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if command is None or record.get("command") == command:
+                    records.append(record)
+
+        return records[-limit:] if limit else records
+
+    def latency_summary(self, command: str = "run", limit: int = 100) -> Dict[str, Any]:
+        """
+        p50/p95 latencies over the last `limit` successful runs of `command`.
+
+        Returns:
+            Dict with "runs", "total" and per-stage / per-LLM-pass entries of
+            {"p50", "p95", "count"} in seconds. Cached stages are excluded.
+        """
+        records = [r for r in self.load(command=command) if r.get("success")][-limit:]
+
+        stage_walls: Dict[str, List[float]] = {}
+        llm_walls: Dict[str, List[float]] = {}
+        for record in records:
+            for name, entry in record.get("stages", {}).items():
+                if not entry.get("cached"):
+                    stage_walls.setdefault(name, []).append(entry["wall"])
+            for call in record.get("llm", {}).get("calls", []):
+                llm_walls.setdefault(call["label"], []).append(call["wall"])
+
+        def summarize(values: List[float]) -> Dict[str, Any]:
+            return {"p50": percentile(values, 50), "p95": percentile(values, 95),
+                    "count": len(values)}
+
+        return {
+            "runs": len(records),
+            "total": summarize([r["wall"] for r in records]),
+            "stages": {name: summarize(v) for name, v in stage_walls.items()},
+            "llm": {label: summarize(v) for label, v in llm_walls.items()},
+        }
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Session Digests for Map-Reduce Blog Drafts
+
+On a day with many long sessions, one DRAFT_PROMPT cannot hold them: each
+transcript is cut to MAX_TRANSCRIPT_CHARS and everything after is lost.
+In map-reduce mode (BlogGenerator.map_reduce), each session is first
+condensed into a structured digest. Digests run in parallel and see a
+spread-out sample of the whole session (content_sampler.py). The draft
+pass then runs on the digests.
+
+Digests are cached on disk by a hash of the session's full content and
+the digest prompt. Rerunning a day only digests sessions that changed.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from content_handle import ContentHandle
+
+# Transcript characters the digest prompt sees per session
+DIGEST_INPUT_CHARS = 24000
+# Sessions up to this many bytes (ContentHandle.size) go into the draft as they are
+DIGEST_MIN_BYTES = 2000
+# Days whose transcripts total more than this many bytes are digested first
+MAP_REDUCE_MIN_BYTES = 24000
+# Concurrent digest calls
+DIGEST_WORKERS = 4
+
+_HASH_CHUNK = 1024 * 1024
+
+DIGEST_PROMPT = """You are condensing one Claude Code session so it can be written about later.
+
+## Project
+{project}
+
+## Session (excerpts; "[...]" marks skipped parts)
+{transcript}
+
+## Task
+Write a digest of this session in markdown with exactly these sections:
+
+**Goal:** what the developer set out to do (one sentence)
+**Done:** what was built or changed (up to 5 bullets)
+**Problems:** errors, dead ends and how they were resolved (up to 3 bullets, or "none")
+**Decisions:** notable design choices and why (up to 3 bullets, or "none")
+**Snippet:** the one short code snippet most worth showing, in a fenced block, or "none"
+**Insight:** one lesson about working with Claude Code from this session
+
+Keep it under 250 words. Output only the digest."""
+
+
+def content_hash(handle: ContentHandle) -> str:
+    """SHA-256 of a transcript's full content, read in chunks."""
+    digest = hashlib.sha256()
+    offset = 0
+    while offset < handle.size:
+        chunk = handle.read_at(offset, _HASH_CHUNK).encode('utf-8', errors='replace')
+        if not chunk:
+            break
+        digest.update(chunk)
+        offset += _HASH_CHUNK
+    return digest.hexdigest()
+
+
+class DigestCache:
+    """
+    Session digests on disk, one small JSON file per content hash.
+
+    Args:
+        directory: Where the digest files live (created on first write)
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def key(self, project: str, session_hash: str) -> str:
+        """Cache key for a session: changes with its content, project or the digest prompt."""
+        return hashlib.sha256(
+            "\0".join([DIGEST_PROMPT, project, session_hash]).encode('utf-8')
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self.directory / f"{key}.json", 'r') as f:
+                return json.load(f)["digest"]
+        except (OSError, json.JSONDecodeError, KeyError):
+            return None
+
+    def put(self, key: str, digest: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{key}.json"
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps({"digest": digest}))
+        os.replace(tmp_path, path)
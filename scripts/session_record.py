@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Compact Session Records for AutoBlog
+
+find_all_sessions() returns one SessionRecord per transcript. A record is
+slotted and immutable, shares interned project and date strings with every
+other session of that project and day, stores the conversation path once
+(the session directory is derived from it) and reads metadata.json only
+when something asks for it.
+
+Records also behave as read-only mappings with the keys the old session
+dicts had ("project", "date", "session_id", "path", "conversation_path",
+"has_metadata", plus "archive_member" for bundle sessions and "metadata"
+when a metadata file parses), so session["project"] and session.get(...)
+keep working.
+"""
+
+import json
+import os
+import posixpath
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+_UNLOADED = object()
+
+
+class SessionRecord(Mapping):
+    """One transcript session; see the module docstring."""
+
+    __slots__ = ("project", "date", "session_id", "conversation_path",
+                 "archive_member", "_archive", "_metadata")
+
+    def __init__(self, project: str, date: str, session_id: str, conversation_path: str,
+                 archive_member: Optional[str] = None, archive: Any = None):
+        """
+        Args:
+            project: Project name (interned)
+            date: Session date, YYYY-MM-DD (interned)
+            session_id: Session identifier
+            conversation_path: Transcript file path, or member name inside a bundle
+            archive_member: Bundle member name, for sessions read from a bundle
+            archive: The open TranscriptArchive holding the member, shared by
+                every record from that bundle
+        """
+        set_ = object.__setattr__
+        set_(self, "project", sys.intern(project))
+        set_(self, "date", sys.intern(date))
+        set_(self, "session_id", session_id)
+        set_(self, "conversation_path", conversation_path)
+        set_(self, "archive_member", archive_member)
+        set_(self, "_archive", archive)
+        set_(self, "_metadata", _UNLOADED)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("SessionRecord is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("SessionRecord is immutable")
+
+    @property
+    def path(self) -> str:
+        """The session directory (local layout) or date directory (repo layout)."""
+        if self.archive_member is not None:
+            return posixpath.dirname(self.conversation_path)
+        return os.path.dirname(self.conversation_path)
+
+    @property
+    def _metadata_path(self) -> Optional[str]:
+        # Only the local layout (.../[session_id]/conversation.md) has metadata
+        if self.archive_member is not None:
+            if posixpath.basename(self.archive_member) != "conversation.md":
+                return None
+            return posixpath.join(self.path, "metadata.json")
+        if os.path.basename(self.conversation_path) != "conversation.md":
+            return None
+        return os.path.join(self.path, "metadata.json")
+
+    @property
+    def has_metadata(self) -> bool:
+        """Whether the session has a metadata.json (checked on first access)."""
+        path = self._metadata_path
+        if path is None:
+            return False
+        if self._archive is not None:
+            return path in self._archive
+        return os.path.exists(path)
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        """Parsed metadata.json, read on first access; None if missing or invalid."""
+        if self._metadata is _UNLOADED:
+            object.__setattr__(self, "_metadata", self._load_metadata())
+        return self._metadata
+
+    def _load_metadata(self) -> Optional[Dict[str, Any]]:
+        path = self._metadata_path
+        if path is None:
+            return None
+        try:
+            if self._archive is not None:
+                if path not in self._archive:
+                    return None
+                return json.loads(self._archive.read_text(path))
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _keys(self) -> Iterator[str]:
+        yield from ("project", "date", "session_id", "path", "conversation_path", "has_metadata")
+        if self.archive_member is not None:
+            yield "archive_member"
+        if self.metadata is not None:
+            yield "metadata"
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "archive_member" and self.archive_member is None:
+            raise KeyError(key)
+        if key == "metadata":
+            if self.metadata is None:
+                raise KeyError(key)
+            return self.metadata
+        if key in ("project", "date", "session_id", "path", "conversation_path",
+                   "has_metadata", "archive_member"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._keys()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._keys())
+
+    def __hash__(self) -> int:
+        return hash((self.project, self.date, self.session_id, self.conversation_path))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SessionRecord):
+            return (self.project, self.date, self.session_id, self.conversation_path,
+                    self.archive_member) == (other.project, other.date, other.session_id,
+                                             other.conversation_path, other.archive_member)
+        return Mapping.__eq__(self, other)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict copy (loads metadata)."""
+        return dict(self.items())
+
+    def to_json(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __repr__(self) -> str:
+        return (f"SessionRecord(project={self.project!r}, date={self.date!r}, "
+                f"session_id={self.session_id!r})")
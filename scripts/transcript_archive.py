@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Transcript Archive Reader for AutoBlog
+
+Lets ProjectMemory read transcripts straight out of a .tar, .tar.zst or .zip
+bundle (e.g. a backup or a history copied from another machine) without
+extracting thousands of small files first.
+
+Members are indexed in a single pass when the archive is opened; content is
+streamed from the archive on demand.
+"""
+
+import shutil
+import tarfile
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# zstandard is only needed for .tar.zst bundles
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+
+ARCHIVE_SUFFIXES = ('.tar', '.tar.zst', '.tzst', '.zip')
+
+
+def is_transcript_archive(path: Path) -> bool:
+    """Check if a path points to a supported transcript bundle."""
+    name = Path(path).name.lower()
+    return name.endswith(ARCHIVE_SUFFIXES) and Path(path).is_file()
+
+
+class TranscriptArchive:
+    """Read-only, indexed view of a transcript bundle."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar_file = None
+        # member name -> (data offset, size) for tar, (0, size) for zip
+        self._members: Dict[str, Tuple[int, int]] = {}
+        self._open()
+
+    def _open(self) -> None:
+        """Open the archive and index every regular file member in one pass."""
+        name = self.path.name.lower()
+
+        if name.endswith('.zip'):
+            self._zip = zipfile.ZipFile(self.path)
+            for info in self._zip.infolist():
+                if not info.is_dir():
+                    self._members[info.filename] = (0, info.file_size)
+            return
+
+        if name.endswith(('.tar.zst', '.tzst')):
+            if not ZSTANDARD_AVAILABLE:
+                raise ImportError("zstandard is required to read .tar.zst transcript bundles")
+            # Decompress once into an anonymous temp file so members can be
+            # read with a seek instead of re-streaming the whole bundle
+            self._tar_file = tempfile.TemporaryFile()
+            with open(self.path, 'rb') as compressed:
+                reader = zstandard.ZstdDecompressor().stream_reader(compressed)
+                shutil.copyfileobj(reader, self._tar_file, 1024 * 1024)
+            self._tar_file.seek(0)
+        else:
+            self._tar_file = open(self.path, 'rb')
+
+        with tarfile.open(fileobj=self._tar_file, mode='r:') as tar:
+            for member in tar:
+                if member.isfile():
+                    self._members[member.name] = (member.offset_data, member.size)
+
+    def close(self) -> None:
+        """Release the underlying file handles."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._tar_file is not None:
+            self._tar_file.close()
+            self._tar_file = None
+
+    def names(self) -> List[str]:
+        """Names of all file members in the archive."""
+        return list(self._members.keys())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._members
+
+    def size(self, name: str) -> int:
+        """Uncompressed size of a member in bytes."""
+        return self._members[name][1]
+
+    def read_bytes(self, name: str, limit: Optional[int] = None) -> bytes:
+        """Read a member's content, optionally only the first `limit` bytes."""
+        return self.read_range(name, 0, limit)
+
+    def read_range(self, name: str, start: int, length: Optional[int] = None) -> bytes:
+        """Read up to `length` bytes of a member from byte `start` (to its end if None)."""
+        offset, size = self._members[name]
+        start = min(max(start, 0), size)
+        length = size - start if length is None else min(size - start, length)
+
+        with self._lock:
+            if self._zip is not None:
+                with self._zip.open(name) as f:
+                    if start:
+                        f.seek(start)
+                    return f.read(length)
+            self._tar_file.seek(offset + start)
+            return self._tar_file.read(length)
+
+    def read_text(self, name: str, limit: Optional[int] = None) -> str:
+        """Read a member as UTF-8 text."""
+        return self.read_bytes(name, limit).decode('utf-8', errors='replace')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,145 @@
+"""
+Tests for the synthetic corpus and the offline pipeline benchmark.
+"""
+
+import subprocess
+
+from benchmark import (SCALING_OPERATIONS, format_bench_result, format_index_format_results,
+                       format_scaling_results, run_index_format_bench, run_pipeline_bench,
+                       run_scaling_bench)
+from llm_backend import FakeLLMBackend
+from project_memory import ProjectMemory
+from sanitize_transcripts import sanitize_directory
+from synthetic_corpus import generate_corpus, generate_index, generate_sessions
+
+
+class TestSyntheticCorpus:
+    """Tests for generate_corpus()."""
+
+    def test_layout_is_readable_by_project_memory(self, tmp_path):
+        """ProjectMemory finds every generated session."""
+        stats = generate_corpus(tmp_path / "transcript", days=3, projects=2,
+                                sessions_per_day=2, turns=5, end_date="2026-01-14")
+
+        memory = ProjectMemory(index_path=tmp_path / "index.json", transcript_dir=stats.root)
+        sessions = memory.find_all_sessions()
+
+        assert stats.dates == ["2026-01-12", "2026-01-13", "2026-01-14"]
+        assert stats.sessions == 12
+        assert len(sessions) == 12
+        assert {s["project"] for s in sessions} == {"AutoBlog", "PenguinCAM"}
+
+    def test_deterministic(self, tmp_path):
+        """The same seed writes the same corpus."""
+        a = generate_corpus(tmp_path / "a", days=1, projects=1, turns=3, end_date="2026-01-14")
+        b = generate_corpus(tmp_path / "b", days=1, projects=1, turns=3, end_date="2026-01-14")
+
+        files_a = sorted(p.relative_to(a.root) for p in a.root.rglob("conversation.md"))
+        files_b = sorted(p.relative_to(b.root) for p in b.root.rglob("conversation.md"))
+        assert files_a == files_b
+        assert (a.root / files_a[0]).read_text() == (b.root / files_b[0]).read_text()
+
+    def test_repo_layout_is_readable_by_project_memory(self, tmp_path):
+        """Repo-layout files parse back into the right projects and dates."""
+        stats = generate_corpus(tmp_path / "transcripts", days=2, projects=3,
+                                end_date="2026-01-14", layout="repo")
+
+        memory = ProjectMemory(index_path=tmp_path / "index.json", transcript_dir=stats.root)
+        sessions = memory.find_all_sessions()
+
+        assert len(sessions) == stats.sessions == 12
+        assert {s["project"] for s in sessions} == set(stats.projects)
+        assert {s["date"] for s in sessions} == {"2026-01-13", "2026-01-14"}
+
+    def test_planted_secrets_are_found_by_sanitizer(self, tmp_path):
+        """Every fake secret matches one of the sanitizer's patterns."""
+        stats = generate_corpus(tmp_path / "transcripts", days=2, projects=2, turns=10,
+                                layout="repo", secret_density=0.3)
+
+        summary = sanitize_directory(stats.root, dry_run=True)
+
+        assert stats.secrets > 0
+        assert summary["total_redactions"] >= stats.secrets
+
+    def test_generate_sessions_rounds_up_to_whole_days(self, tmp_path):
+        """generate_sessions() writes at least the requested number of sessions."""
+        stats = generate_sessions(tmp_path / "t", 25, projects=2, sessions_per_day=3, turns=2)
+
+        assert len(stats.dates) == 5
+        assert stats.sessions == 30
+
+
+class TestPipelineBench:
+    """Tests for run_pipeline_bench()."""
+
+    def test_bench_generates_every_day_offline(self, tmp_path, monkeypatch):
+        """The benchmark writes one post per day without calling Claude."""
+        def forbidden(*args, **kwargs):
+            raise AssertionError("subprocess.run called")
+        monkeypatch.setattr(subprocess, "run", forbidden)
+
+        result = run_pipeline_bench(FakeLLMBackend(), days=3, projects=2, turns=5,
+                                    workers=2, work_dir=tmp_path)
+
+        assert result.posts == 3
+        assert result.failed_dates == []
+        assert result.posts_per_hour > 0
+        passes = {"summary", "draft", "review", "revise", "polish"}
+        # Rollups only run if the corpus spans a week that has already ended
+        assert passes <= set(result.llm) <= passes | {"rollup"}
+        assert "generate" in result.stages
+        assert "posts/hour" in format_bench_result(result)
+
+    def test_failed_drafts_are_reported(self, tmp_path):
+        """Dates whose draft fails show up as failures."""
+        result = run_pipeline_bench(FakeLLMBackend(failure_rate=1.0), days=2, projects=1,
+                                    turns=3, skip_summaries=True, work_dir=tmp_path)
+
+        assert result.posts == 0
+        assert len(result.failed_dates) == 2
+
+
+class TestScalingBench:
+    """Tests for run_scaling_bench()."""
+
+    def test_measures_every_operation(self, tmp_path):
+        """Each scale and layout gets one measurement per applicable operation."""
+        measurements = run_scaling_bench(scales=[10, 20], projects=2, turns=3,
+                                         work_dir=tmp_path)
+
+        local = [m.operation for m in measurements if m.layout == "local" and m.sessions == 20]
+        repo = [m.operation for m in measurements if m.layout == "repo" and m.sessions == 20]
+        assert local == list(SCALING_OPERATIONS)
+        assert "sync_transcripts" not in repo
+        assert all(m.wall >= 0 and m.peak_bytes is not None and m.retained_bytes is not None
+                   for m in measurements)
+        assert "sanitize_directory" in format_scaling_results(measurements)
+
+    def test_sync_copies_the_whole_corpus(self, tmp_path):
+        """The local-layout sync reads from the synthetic corpus, not ~/transcript."""
+        run_scaling_bench(scales=[8], layouts=["local"], projects=2, turns=2,
+                          trace_memory=False, work_dir=tmp_path)
+
+        synced = list((tmp_path / "local-8" / "repo" / "transcripts").rglob("*.md"))
+        assert len(synced) == 8
+
+
+class TestIndexFormatBench:
+    """Tests for run_index_format_bench()."""
+
+    def test_generate_index_shape(self):
+        """The synthetic index has the requested size and the real index's fields."""
+        index = generate_index(100, projects=5, end_date="2026-01-14")
+
+        assert sum(p["total_sessions"] for p in index["projects"].values()) == 100
+        log = next(iter(index["projects"]["AutoBlog"]["daily_logs"].values()))
+        assert set(log) == {"sessions", "summary", "key_topics"}
+
+    def test_measures_each_format(self, tmp_path):
+        """Every format is written, read back and compared with JSON."""
+        measurements = run_index_format_bench(scales=[40], formats=["json", "abix"],
+                                              projects=2, repeat=1, work_dir=tmp_path)
+
+        assert [m.format for m in measurements] == ["json", "abix"]
+        assert all(m.file_bytes > 0 and m.load > 0 and m.save > 0 for m in measurements)
+        assert "1.00x" in format_index_format_results(measurements)
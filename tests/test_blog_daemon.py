@@ -0,0 +1,193 @@
+"""
+Tests for the AutoBlog daemon and its job queue.
+"""
+
+import threading
+import time
+
+import pytest
+
+import blog_daemon
+import login_trigger
+from blog_daemon import BlogDaemon, DaemonServer, is_daemon_running, send_request
+from daily_blog import DailyBlogRunner
+
+
+@pytest.fixture
+def runner(tmp_path, sample_transcripts_dir):
+    """A runner over a temporary repo and the sample transcripts."""
+    repo_dir = tmp_path / "repo"
+    repo_dir.mkdir()
+    (repo_dir / "scripts" / "data").mkdir(parents=True)
+    runner = DailyBlogRunner(repo_dir=repo_dir)
+    runner.memory.transcript_dir = sample_transcripts_dir
+    return runner
+
+
+@pytest.fixture
+def server(tmp_path, runner):
+    """A daemon serving on a temporary socket in a background thread."""
+    socket_path = tmp_path / "d.sock"
+    daemon = BlogDaemon(runner, max_parallel=2)
+    server = DaemonServer(socket_path, daemon)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    daemon.shutdown()
+
+
+class TestBlogDaemon:
+    """Tests for the in-process job queue."""
+
+    def test_unknown_job(self, runner):
+        """Unknown job kinds are rejected."""
+        daemon = BlogDaemon(runner)
+
+        response = daemon.handle_request({"job": "explode"})
+
+        assert response["ok"] is False
+        daemon.shutdown()
+
+    def test_update_job(self, runner, mock_claude_cli):
+        """An update job runs against the in-memory runner."""
+        daemon = BlogDaemon(runner)
+
+        response = daemon.handle_request(
+            {"job": "update", "args": {"skip_summaries": True}, "wait": True}
+        )
+
+        assert response["ok"] is True
+        assert response["job"]["status"] == "done"
+        assert response["job"]["result"]["new_sessions"] == 3
+        daemon.shutdown()
+
+    def test_jobs_sharing_a_resource_are_serialized(self, runner):
+        """Two index-bound jobs never run at the same time."""
+        daemon = BlogDaemon(runner, max_parallel=4)
+        active = []
+        overlap = []
+
+        def slow(args):
+            active.append(1)
+            if len(active) > 1:
+                overlap.append(True)
+            time.sleep(0.05)
+            active.pop()
+            return True
+
+        daemon._handlers["update"] = slow
+        jobs = [daemon.submit("update") for _ in range(3)]
+        for job in jobs:
+            assert job.done.wait(5)
+
+        assert overlap == []
+        daemon.shutdown()
+
+    def test_disjoint_jobs_run_in_parallel(self, runner):
+        """A sync job doesn't wait behind an index-bound job."""
+        daemon = BlogDaemon(runner, max_parallel=2)
+        release = threading.Event()
+
+        daemon._handlers["update"] = lambda args: release.wait(5)
+        daemon._handlers["sync"] = lambda args: True
+
+        update = daemon.submit("update")
+        sync = daemon.submit("sync")
+
+        assert sync.done.wait(2)
+        assert not update.done.is_set()
+        release.set()
+        assert update.done.wait(5)
+        daemon.shutdown()
+
+    def test_failed_job_reports_error(self, runner):
+        """Exceptions in a job are captured on the job."""
+        daemon = BlogDaemon(runner)
+
+        def boom(args):
+            raise RuntimeError("boom")
+
+        daemon._handlers["sync"] = boom
+        response = daemon.handle_request({"job": "sync", "wait": True})
+
+        assert response["ok"] is False
+        assert response["job"]["error"] == "boom"
+        daemon.shutdown()
+
+
+    def test_only_recent_finished_jobs_are_kept(self, runner):
+        """A long-running daemon doesn't keep every job's args and result forever."""
+        daemon = BlogDaemon(runner, keep_finished=2)
+        daemon._handlers["sync"] = lambda args: {"big": "result"}
+
+        jobs = [daemon.submit("sync") for _ in range(5)]
+        for job in jobs:
+            job.done.wait(5)
+        daemon.shutdown()
+
+        assert [job["id"] for job in daemon.list_jobs()] == [jobs[3].id, jobs[4].id]
+        assert daemon.get_job(jobs[0].id) is None
+
+
+class TestDaemonServer:
+    """Tests for the Unix socket front end."""
+
+    def test_ping_and_status(self, server):
+        """The daemon answers ping and status over the socket."""
+        assert is_daemon_running(server.socket_path)
+
+        status = send_request({"job": "status"}, server.socket_path, timeout=5)
+
+        assert status["ok"] is True
+        assert "posts_generated" in status["status"]
+
+    def test_generate_over_socket(self, server, runner, mock_claude_cli):
+        """A generate job produces a post and reports success."""
+        response = send_request(
+            {"job": "generate", "args": {"date": "2026-01-14", "skip_push": True,
+                                         "skip_summaries": True}, "wait": True},
+            server.socket_path, timeout=30
+        )
+
+        assert response["ok"] is True
+        assert response["job"]["result"] is True
+        assert len(list(runner.posts_dir.glob("2026-01-14-*.md"))) == 1
+
+    def test_refuses_second_daemon(self, server, runner):
+        """A second server can't take over a live socket."""
+        with pytest.raises(RuntimeError):
+            DaemonServer(server.socket_path, BlogDaemon(runner))
+
+    def test_replaces_stale_socket(self, tmp_path, runner):
+        """A leftover socket file from a crashed daemon is removed."""
+        socket_path = tmp_path / "stale.sock"
+        socket_path.write_text("")
+
+        server = DaemonServer(socket_path, BlogDaemon(runner))
+        server.server_close()
+
+        assert not socket_path.exists()
+
+
+class TestLoginTriggerDaemon:
+    """Tests for handing the login backfill to the daemon."""
+
+    @pytest.mark.parametrize("error", [ConnectionError("daemon went away"), ValueError("bad reply")])
+    def test_daemon_failure_falls_back_to_in_process(self, monkeypatch, tmp_path, error):
+        """A daemon that dies or answers garbage mid-backfill doesn't crash the trigger."""
+        def fail(*args, **kwargs):
+            raise error
+        monkeypatch.setattr(blog_daemon, "is_daemon_running", lambda: True)
+        monkeypatch.setattr(blog_daemon, "send_request", fail)
+        monkeypatch.setattr(login_trigger, "MARKER_FILE", tmp_path / "marker")
+        monkeypatch.setattr(login_trigger, "get_missing_dates", lambda: ["2026-01-13"])
+        backfilled = []
+        monkeypatch.setattr(login_trigger, "run_backfill_in_process",
+                            lambda dates, *args: backfilled.append(dates) or False)
+
+        assert login_trigger.main([]) == 0
+
+        assert backfilled == [["2026-01-13"]]
+        assert (tmp_path / "marker").exists()
@@ -0,0 +1,174 @@
+"""
+Tests for stratified transcript sampling.
+"""
+
+import io
+import os
+import tarfile
+
+import transcript_archive
+from content_handle import ContentHandle
+from content_sampler import sample_day, sample_session
+from project_memory import ProjectMemory
+from transcript_archive import TranscriptArchive
+
+
+def long_transcript(turns: int = 400, error_at: int = 250) -> str:
+    lines = ["# Claude Code Session", "**User**: Please speed up the exporter."]
+    for i in range(turns):
+        lines.append(f"**Assistant**: Step {i}: reading module {i} and checking the output.")
+        if i == error_at:
+            lines.append("Traceback (most recent call last): KeyError: 'exporter_config'")
+    lines.append("**Assistant**: Done, the exporter now streams rows.")
+    return "\n".join(lines) + "\n"
+
+
+def counting_handle(text: str):
+    """A handle over `text` that records how many bytes were read."""
+    data = text.encode('utf-8')
+    reads = []
+
+    def range_reader(start, length):
+        chunk = data[start:start + length]
+        reads.append(len(chunk))
+        return chunk
+
+    def reader(limit):
+        raise AssertionError("sampling must not read from the start")
+
+    return ContentHandle("mem", len(data), reader, range_reader=range_reader), reads
+
+
+class TestSampleSession:
+    """Tests for sampling one transcript."""
+
+    def test_short_transcript_is_returned_whole(self):
+        handle, _ = counting_handle("**User**: hi\n")
+
+        assert sample_session(handle, 1000) == "**User**: hi\n"
+
+    def test_head_tail_and_error_turn(self):
+        """The middle of the session reaches the sample, preferring error lines."""
+        handle, _ = counting_handle(long_transcript())
+
+        sample = sample_session(handle, 4000)
+
+        assert sample.startswith("# Claude Code Session\n**User**: Please speed up the exporter.")
+        assert sample.endswith("Done, the exporter now streams rows.")
+        assert "KeyError: 'exporter_config'" in sample
+        assert "[...]" in sample
+        assert len(sample) <= 4000
+
+    def test_reads_are_bounded(self):
+        """A bounded amount is read, however long the file."""
+        handle, reads = counting_handle(long_transcript(turns=20000, error_at=-1))
+
+        sample_session(handle, 4000)
+
+        assert handle.size > 1_000_000
+        assert sum(reads) < 100_000
+
+
+class TestSampleDay:
+    """Tests for sharing the budget across a day's sessions."""
+
+    def test_every_session_is_sampled(self):
+        """Later sessions are no longer dropped."""
+        handles = [counting_handle(long_transcript())[0] for _ in range(5)]
+
+        samples = sample_day(handles, 4000)
+
+        assert len(samples) == 5
+        assert sum(len(s) for s in samples) <= 4000
+
+    def test_short_sessions_leave_budget_to_long_ones(self):
+        short, _ = counting_handle("**User**: quick question\n")
+        long, _ = counting_handle(long_transcript())
+
+        samples = sample_day([short, None, long], 4000)
+
+        assert samples[0] == "**User**: quick question\n"
+        assert len(samples[1]) > 3500
+
+    def test_many_sessions_are_subsampled(self):
+        handles = [counting_handle(long_transcript(turns=50))[0] for _ in range(30)]
+
+        samples = sample_day(handles, 4000)
+
+        assert len(samples) == 10
+        assert sum(len(s) for s in samples) <= 4000
+
+
+class TestRangedReads:
+    """Tests for the seek-based reads the sampler relies on."""
+
+    def test_file_handle_read_at(self, tmp_path):
+        path = tmp_path / "conversation.md"
+        path.write_text("0123456789")
+
+        assert ContentHandle.for_file(path).read_at(3, 4) == "3456"
+        assert ContentHandle.from_json({"path": str(path), "size": 10}).read_at(8, 10) == "89"
+
+    def test_archive_read_range(self, tmp_path):
+        bundle = tmp_path / "bundle.tar"
+        data = b"abcdefghij"
+        with tarfile.open(bundle, "w") as tar:
+            info = tarfile.TarInfo("p/2026-01-14/s/conversation.md")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+        with TranscriptArchive(bundle) as archive:
+            assert archive.read_range("p/2026-01-14/s/conversation.md", 2, 3) == b"cde"
+            assert archive.read_range("p/2026-01-14/s/conversation.md", 8, 100) == b"ij"
+        handle = ContentHandle.from_json({"path": str(bundle), "size": 10,
+                                          "member": "p/2026-01-14/s/conversation.md"})
+        assert handle.read_at(4, 2) == "ef"
+
+    def test_rebuilt_handles_share_the_open_bundle(self, tmp_path, monkeypatch):
+        """Reads through JSON-rebuilt handles open a bundle once, and again when it changes."""
+        bundle = tmp_path / "bundle.tar"
+
+        def write_bundle(data: bytes, mtime: int):
+            with tarfile.open(bundle, "w") as tar:
+                info = tarfile.TarInfo("p/2026-01-14/s/conversation.md")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+            os.utime(bundle, ns=(mtime, mtime))
+
+        opened = []
+        archive_class = transcript_archive.TranscriptArchive
+        monkeypatch.setattr(transcript_archive, "TranscriptArchive",
+                            lambda path: opened.append(path) or archive_class(path))
+        write_bundle(b"abcdefghij", 1_000_000_000)
+        data = {"path": str(bundle), "size": 10, "member": "p/2026-01-14/s/conversation.md"}
+
+        for start in range(5):
+            assert ContentHandle.from_json(data).read_at(start, 2) == "abcdefghij"[start:start + 2]
+        assert ContentHandle.from_json(data).read(3) == "abc"
+        assert len(opened) == 1
+
+        write_bundle(b"ABCDEFGHIJ", 2_000_000_000)
+        assert ContentHandle.from_json(data).read(3) == "ABC"
+        assert len(opened) == 2
+
+
+class TestMemorySampling:
+    """Tests for sampled content in day summaries."""
+
+    def test_summary_prompt_covers_all_sessions(self, tmp_path, sample_transcripts_dir):
+        day = sample_transcripts_dir / "AutoBlog" / "2026-01-14"
+        for i in range(4):
+            session = day / f"extra_{i}"
+            session.mkdir()
+            (session / "conversation.md").write_text(f"**User**: extra session {i}\n")
+        prompts = []
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=sample_transcripts_dir)
+        memory.update_index(use_claude_for_summaries=False)
+        memory._generate_summary = lambda project, date, content: prompts.append(content)
+
+        memory._update_summaries([s for s in memory.find_all_sessions()
+                                  if s["date"] == "2026-01-14" and s["project"] == "AutoBlog"])
+
+        assert all(f"extra session {i}" in prompts[0] for i in range(4))
+        assert "Help me with AutoBlog" in prompts[0]
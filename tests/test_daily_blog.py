@@ -15,14 +15,28 @@ class TestDailyBlogRunnerInit:
     """Tests for DailyBlogRunner initialization."""
 
     def test_creates_directories(self, tmp_path):
-        """Creates necessary directories on init."""
+        """Creates the posts directory once generation is set up, not on init."""
         repo_dir = tmp_path / "repo"
         repo_dir.mkdir()
 
         runner = DailyBlogRunner(repo_dir=repo_dir)
+        assert not runner.posts_dir.exists()
+
+        runner.generator
 
         assert runner.posts_dir.exists()
 
+    def test_components_are_lazy(self, tmp_path):
+        """Status doesn't build the generator or publisher."""
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+
+        runner.get_status()
+
+        assert runner._generator is None
+        assert runner._publisher is None
+
     def test_initializes_components(self, tmp_path):
         """Initializes memory and generator components."""
         repo_dir = tmp_path / "repo"
@@ -144,6 +158,293 @@ class TestIdempotency:
             mock_generate.assert_not_called()
 
 
+class TestPipelineRun:
+    """Tests for the incremental stage pipeline behind run()."""
+
+    def _runner(self, tmp_path, transcripts_dir):
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        (repo_dir / "scripts" / "data").mkdir(parents=True)
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+        runner.memory.transcript_dir = transcripts_dir
+        return runner
+
+    def test_stage_names_match_cli_choices(self, tmp_path, sample_transcripts_dir):
+        """PIPELINE_STAGES lists the pipeline's stages in order."""
+        from daily_blog import PIPELINE_STAGES
+        runner = self._runner(tmp_path, sample_transcripts_dir)
+
+        pipeline = runner._build_pipeline("2026-01-14", True, True, None)
+
+        assert pipeline.stage_names == PIPELINE_STAGES
+
+    def test_rerun_reuses_cached_passes(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """Regenerating an unchanged day doesn't call Claude again."""
+        runner = self._runner(tmp_path, sample_transcripts_dir)
+        assert runner.run(date="2026-01-14", skip_push=True, skip_summaries=True)
+
+        # Remove the post so the run isn't short-circuited by idempotency
+        for post in runner.posts_dir.glob("*.md"):
+            post.unlink()
+
+        with patch.object(runner.generator, '_call_claude') as mock_call:
+            assert runner.run(date="2026-01-14", skip_push=True, skip_summaries=True)
+
+        mock_call.assert_not_called()
+        assert len(list(runner.posts_dir.glob("2026-01-14-*.md"))) == 1
+
+    def test_until_stage_stops_early(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """--until-stage stops before writing anything."""
+        runner = self._runner(tmp_path, sample_transcripts_dir)
+
+        success = runner.run(date="2026-01-14", skip_push=True,
+                             skip_summaries=True, until_stage="draft")
+
+        assert success is True
+        assert list(runner.posts_dir.glob("*.md")) == []
+
+    def test_from_stage_reruns_later_stages(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """--from-stage re-executes that stage even when a post exists."""
+        runner = self._runner(tmp_path, sample_transcripts_dir)
+        runner.run(date="2026-01-14", skip_push=True, skip_summaries=True)
+
+        with patch.object(
+            runner.generator, 'polish_pass', wraps=runner.generator.polish_pass
+        ) as mock_polish, patch.object(runner.generator, 'draft_pass') as mock_draft:
+            success = runner.run(date="2026-01-14", skip_push=True,
+                                 skip_summaries=True, from_stage="polish")
+
+        assert success is True
+        mock_polish.assert_called_once()
+        mock_draft.assert_not_called()
+
+    def test_map_reduce_changes_the_draft_stage(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """Turning on map-reduce re-runs the draft instead of reusing the cached one."""
+        runner = self._runner(tmp_path, sample_transcripts_dir)
+        runner.run(date="2026-01-14", skip_push=True, skip_summaries=True, until_stage="draft")
+
+        runner.map_reduce = True
+        runner._generator = None
+        assert runner.generator.map_reduce is True
+        with patch.object(runner.generator, 'draft_pass', return_value="# Draft") as mock_draft:
+            runner.run(date="2026-01-14", skip_push=True, skip_summaries=True, until_stage="draft")
+
+        mock_draft.assert_called_once()
+        assert runner.generator.digest_cache.directory == runner.scripts_dir / "data" / "digest_cache"
+
+
+class TestRunLock:
+    """Tests for refusing concurrent runs."""
+
+    def test_run_exits_while_another_run_holds_the_lock(self, tmp_path):
+        """A second runner does no work while the first holds the run lock."""
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        first = DailyBlogRunner(repo_dir=repo_dir)
+        second = DailyBlogRunner(repo_dir=repo_dir)
+
+        with first._exclusive_run() as acquired:
+            assert acquired
+            with patch.object(second, '_build_pipeline') as build:
+                assert second.run(date="2026-01-14") is False
+                assert second.run_backfill(["2026-01-13"]) == {"2026-01-13": False}
+            build.assert_not_called()
+
+        assert not first.run_lock.path.exists()
+        with second._exclusive_run() as acquired:
+            assert acquired
+
+
+class TestRunHistory:
+    """Tests for the structured run records written by run() and backfill."""
+
+    def _runner(self, tmp_path, transcripts_dir):
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        (repo_dir / "scripts" / "data").mkdir(parents=True)
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+        runner.memory.transcript_dir = transcripts_dir
+        return runner
+
+    def test_run_appends_record(self, tmp_path, sample_transcripts_dir, mock_claude_cli):
+        """A run records stage timings and one entry per generation pass."""
+        runner = self._runner(tmp_path, sample_transcripts_dir)
+
+        assert runner.run(date="2026-01-14", skip_push=True, skip_summaries=True)
+
+        records = runner.history.load()
+        assert len(records) == 1
+        record = records[0]
+        assert record["command"] == "run"
+        assert record["success"] is True
+        assert "draft" in record["stages"]
+        assert [c["label"] for c in record["llm"]["calls"]] == ["draft", "review", "revise", "polish"]
+        assert record["llm"]["prompt_chars"] > 0
+        assert record["counters"]["posts_saved"] == 1
+        assert runner.generator.metrics is None
+
+    def test_rerun_records_cache_hits(self, tmp_path, sample_transcripts_dir, mock_claude_cli):
+        """Cached passes show up as cache hits in the second record."""
+        runner = self._runner(tmp_path, sample_transcripts_dir)
+        runner.run(date="2026-01-14", skip_push=True, skip_summaries=True)
+        for post in runner.posts_dir.glob("*.md"):
+            post.unlink()
+
+        runner.run(date="2026-01-14", skip_push=True, skip_summaries=True)
+
+        second = runner.history.load()[-1]
+        assert second["stages"]["draft"]["cached"] is True
+        assert second["cache"]["hits"] >= 4
+        assert second["llm"]["total_calls"] == 0
+
+    def test_status_reports_latency(self, tmp_path, sample_transcripts_dir, mock_claude_cli):
+        """Status includes p50/p95 from the history."""
+        runner = self._runner(tmp_path, sample_transcripts_dir)
+        runner.run(date="2026-01-14", skip_push=True, skip_summaries=True)
+
+        latency = runner.get_status()["latency"]
+
+        assert latency["runs"] == 1
+        assert latency["total"]["p50"] is not None
+        assert "draft" in latency["llm"]
+
+    def test_backfill_appends_record(self, tmp_path, sample_transcripts_dir, mock_claude_cli):
+        """A backfill writes a single record covering every date."""
+        runner = self._runner(tmp_path, sample_transcripts_dir)
+
+        runner.run_backfill(["2026-01-14", "2026-01-15"], skip_push=True, skip_summaries=True)
+
+        records = runner.history.load(command="backfill")
+        assert len(records) == 1
+        assert records[0]["dates"] == ["2026-01-14", "2026-01-15"]
+        assert records[0]["stages"]["generate"]["count"] == 2
+
+
+class TestBackfill:
+    """Tests for in-process multi-day backfill."""
+
+    def test_backfill_generates_each_date(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """Generates a post for every date with transcripts."""
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        (repo_dir / "scripts" / "data").mkdir(parents=True)
+
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+        runner.memory.transcript_dir = sample_transcripts_dir
+
+        results = runner.run_backfill(
+            ["2026-01-13", "2026-01-14"], skip_push=True, skip_summaries=True
+        )
+
+        assert results == {"2026-01-13": True, "2026-01-14": True}
+        assert len(list(runner.posts_dir.glob("2026-01-13-*.md"))) == 1
+        assert len(list(runner.posts_dir.glob("2026-01-14-*.md"))) == 1
+
+    def test_backfill_updates_index_once(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """The index update and transcript walk are shared across dates."""
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        (repo_dir / "scripts" / "data").mkdir(parents=True)
+
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+        runner.memory.transcript_dir = sample_transcripts_dir
+
+        with patch.object(
+            runner.memory, 'update_index', wraps=runner.memory.update_index
+        ) as mock_update, patch.object(
+            runner.memory, 'find_all_sessions', wraps=runner.memory.find_all_sessions
+        ) as mock_find:
+            runner.run_backfill(
+                ["2026-01-12", "2026-01-13", "2026-01-14"],
+                skip_push=True, skip_summaries=True
+            )
+
+        assert mock_update.call_count == 1
+        # One walk inside update_index, one shared by every date
+        assert mock_find.call_count == 2
+
+    def test_backfill_empty_date_does_not_borrow_yesterday(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """A date without transcripts is skipped rather than re-using the day before."""
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        (repo_dir / "scripts" / "data").mkdir(parents=True)
+
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+        runner.memory.transcript_dir = sample_transcripts_dir
+
+        results = runner.run_backfill(["2026-01-15"], skip_push=True, skip_summaries=True)
+
+        assert results == {"2026-01-15": True}
+        assert list(runner.posts_dir.glob("*.md")) == []
+
+    def test_backfill_concurrent_publishes_in_date_order(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """Dates generated concurrently are still saved and pushed oldest first."""
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        (repo_dir / "scripts" / "data").mkdir(parents=True)
+
+        runner = DailyBlogRunner(repo_dir=repo_dir, llm_calls_per_minute=6000)
+        runner.memory.transcript_dir = sample_transcripts_dir
+
+        with patch.object(runner, '_git_publish', return_value=True) as mock_publish:
+            results = runner.run_backfill(
+                ["2026-01-14", "2026-01-13"], skip_summaries=True, workers=2
+            )
+
+        assert results == {"2026-01-13": True, "2026-01-14": True}
+        # Every post goes out in one commit, oldest first
+        mock_publish.assert_called_once()
+        paths, message = mock_publish.call_args.args
+        assert [p.name[:10] for p in paths] == ["2026-01-13", "2026-01-14"]
+        assert message.startswith("Add 2 blog posts (2026-01-13 to 2026-01-14)")
+
+    def test_rate_limiter_shared_by_components(self, tmp_path):
+        """Memory summaries and generation passes draw from one bucket."""
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+
+        runner = DailyBlogRunner(repo_dir=repo_dir, llm_calls_per_minute=30)
+
+        assert runner.rate_limiter is not None
+        assert runner.memory.rate_limiter is runner.rate_limiter
+        assert runner.generator.rate_limiter is runner.rate_limiter
+
+    def test_backfill_skips_existing_posts(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """Dates that already have a post are not regenerated."""
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        (repo_dir / "_posts").mkdir()
+        (repo_dir / "scripts" / "data").mkdir(parents=True)
+        (repo_dir / "_posts" / "2026-01-14-existing.md").write_text("Existing")
+
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+        runner.memory.transcript_dir = sample_transcripts_dir
+
+        with patch.object(runner.generator, 'generate') as mock_generate:
+            results = runner.run_backfill(["2026-01-14"], skip_push=True)
+
+        assert results == {"2026-01-14": True}
+        mock_generate.assert_not_called()
+
+
 class TestGitOperations:
     """Tests for Git operations."""
 
@@ -182,6 +483,28 @@ class TestGitOperations:
             assert mock_run.called
 
 
+    def test_publish_stages_index_only_when_changed(self, tmp_path):
+        """The project index is committed only when its snapshot changed."""
+        from git_publisher import PublishResult
+
+        repo_dir = tmp_path / "repo"
+        repo_dir.mkdir()
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+        runner._publisher = MagicMock()
+        runner._publisher.publish.return_value = PublishResult(success=True, committed=True)
+        post = repo_dir / "_posts" / "post.md"
+
+        runner.memory.index["projects"]["AutoBlog"] = {"daily_logs": {}}
+        runner.memory._save_index()
+        assert runner._git_publish([post], "first")
+        assert runner._publisher.publish.call_args.kwargs["optional_paths"] == [
+            runner.scripts_dir / "data" / "project_index.json"
+        ]
+
+        assert runner._git_publish([post], "second")
+        assert runner._publisher.publish.call_args.kwargs["optional_paths"] == []
+
+
 class TestTranscriptSync:
     """Tests for transcript synchronization."""
 
@@ -0,0 +1,156 @@
+"""
+Tests for offline extractive daily summaries.
+"""
+
+import time
+
+from extractive import TermStats, prose, summarize, tokenize
+from llm_backend import FakeLLMBackend
+from project_memory import ProjectMemory
+
+PARSER_DAY = """# Claude Code Session
+**Project**: AutoBlog
+**Date**: 2026-01-14
+
+## User [10:00:00]
+
+The markdown parser drops footnotes when a heading follows them. Can you fix the parser?
+
+## Assistant [10:00:05]
+
+[Tool: Read]
+[Tool Result: def parse(text):
+    return footnotes and headings]
+
+```python
+footnotes = []
+```
+
+I rewrote the footnote handling so footnotes survive a following heading in the parser.
+
+## Statistics
+- Messages: 4
+"""
+
+
+class TestTokenize:
+    """Tests for the tokenizer and transcript cleanup."""
+
+    def test_stopwords_and_short_words_are_dropped(self):
+        assert tokenize("The user asked me to fix a YAML parser in CI") == ["asked", "fix", "yaml", "parser"]
+
+    def test_boilerplate_is_removed(self):
+        """Headers, tool calls, tool results and code never reach the summary."""
+        text = prose(PARSER_DAY)
+
+        assert "Project" not in text
+        assert "def parse" not in text
+        assert "footnotes = []" not in text
+        assert "Messages" not in text
+        assert "drops footnotes" in text
+
+
+class TestSummarize:
+    """Tests for TF-IDF topics and sentence extraction."""
+
+    def test_topics_and_summary(self, tmp_path):
+        stats = TermStats(tmp_path / "terms.json")
+
+        result = summarize([PARSER_DAY], stats, key="AutoBlog/2026-01-14", exclude=["AutoBlog"])
+
+        assert result["summary_source"] == "extractive"
+        assert set(result["key_topics"][:2]) == {"footnotes", "parser"}
+        assert "footnote" in result["summary"]
+        assert len(result["summary"]) <= 164
+
+    def test_common_terms_rank_below_distinctive_ones(self, tmp_path):
+        """A term in every document loses to one seen only today."""
+        stats = TermStats(tmp_path / "terms.json")
+        for day in range(20):
+            summarize([f"Refactored the pipeline for feature {day}."], stats, key=f"p/{day}")
+
+        result = summarize(["Refactored the pipeline. Refactored the pipeline. Added retries."],
+                           stats, key="p/today")
+
+        assert result["key_topics"][0] == "retries"
+
+    def test_documents_count_once_and_persist(self, tmp_path):
+        path = tmp_path / "terms.json"
+        stats = TermStats(path)
+        summarize(["parser footnotes"], stats, key="a/1")
+        summarize(["parser footnotes again"], stats, key="a/1")
+        summarize(["parser tables"], stats, key="a/2")
+        stats.save()
+
+        reloaded = TermStats(path)
+
+        assert reloaded.docs == 2
+        assert reloaded.df["parser"] == 2
+        assert reloaded.df["footnotes"] == 1
+
+    def test_empty_transcript(self, tmp_path):
+        result = summarize([""], TermStats(tmp_path / "terms.json"))
+
+        assert result["summary"] == ""
+        assert result["key_topics"] == []
+
+    def test_fast(self, tmp_path):
+        """A day of long transcripts summarizes in milliseconds."""
+        stats = TermStats(tmp_path / "terms.json")
+        texts = [PARSER_DAY * 20] * 3
+        started = time.perf_counter()
+
+        summarize(texts, stats, key="AutoBlog/2026-01-14")
+
+        assert time.perf_counter() - started < 0.5
+
+
+class TestMemoryFallback:
+    """Tests for extractive summaries in the project index."""
+
+    def test_skip_summaries_fills_daily_logs(self, tmp_path, sample_transcripts_dir):
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=sample_transcripts_dir)
+
+        memory.update_index(use_claude_for_summaries=False)
+
+        log = memory.index["projects"]["AutoBlog"]["daily_logs"]["2026-01-14"]
+        assert log["summary_source"] == "extractive"
+        assert log["summary"]
+        assert log["key_topics"]
+        assert "autoblog" not in log["key_topics"]
+        assert (tmp_path / "index.terms.json").exists()
+
+    def test_failed_llm_call_falls_back(self, tmp_path, sample_transcripts_dir):
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=sample_transcripts_dir,
+                               llm_backend=FakeLLMBackend(failure_rate=1.0))
+
+        memory.update_index(use_claude_for_summaries=True)
+
+        log = memory.index["projects"]["PenguinCAM"]["daily_logs"]["2026-01-14"]
+        assert log["summary_source"] == "extractive"
+
+    def test_llm_summary_replaces_extractive(self, tmp_path, sample_transcripts_dir):
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=sample_transcripts_dir,
+                               llm_backend=FakeLLMBackend())
+        memory.update_index(use_claude_for_summaries=False)
+
+        memory.summarize_days([("AutoBlog", "2026-01-14")])
+
+        log = memory.index["projects"]["AutoBlog"]["daily_logs"]["2026-01-14"]
+        assert log["summary"].startswith("Worked on")
+        assert "summary_source" not in log
+
+    def test_extractive_never_replaces_llm(self, tmp_path, sample_transcripts_dir):
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=sample_transcripts_dir,
+                               llm_backend=FakeLLMBackend())
+        memory.update_index(use_claude_for_summaries=True)
+        before = dict(memory.index["projects"]["AutoBlog"]["daily_logs"]["2026-01-14"])
+
+        sessions = [s for s in memory.find_all_sessions() if s["project"] == "AutoBlog"]
+        memory._update_summaries(sessions, use_claude=False)
+
+        assert memory.index["projects"]["AutoBlog"]["daily_logs"]["2026-01-14"] == before
@@ -0,0 +1,151 @@
+"""
+Tests for the index and run locks.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from file_lock import FileLock, LockTimeout, RunLock
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+
+def hold_in_subprocess(code: str) -> subprocess.Popen:
+    """Run `code` in another Python process and wait until it prints 'held'."""
+    proc = subprocess.Popen(
+        [sys.executable, "-c", f"import sys, time; sys.path.insert(0, {str(SCRIPTS_DIR)!r})\n{code}"],
+        stdout=subprocess.PIPE, stdin=subprocess.PIPE, text=True
+    )
+    assert proc.stdout.readline().strip() == "held"
+    return proc
+
+
+def release_subprocess(proc: subprocess.Popen) -> None:
+    proc.stdin.close()
+    proc.wait(timeout=10)
+
+
+class TestFileLock:
+    """Tests for the advisory index lock."""
+
+    def test_other_process_times_out_then_acquires(self, tmp_path):
+        """A second process waits for the holder and gets the lock once it is released."""
+        path = tmp_path / "index.json.lock"
+        proc = hold_in_subprocess(
+            "from file_lock import FileLock\n"
+            f"lock = FileLock({str(path)!r}); lock.acquire(); print('held', flush=True)\n"
+            "sys.stdin.read()"
+        )
+        try:
+            with pytest.raises(LockTimeout):
+                FileLock(path).acquire(timeout=0.2)
+        finally:
+            release_subprocess(proc)
+
+        with FileLock(path, timeout=1) as lock:
+            assert lock.depth == 1
+
+    def test_lock_is_released_when_holder_dies(self, tmp_path):
+        """The kernel drops the lock of a crashed holder."""
+        path = tmp_path / "index.json.lock"
+        proc = hold_in_subprocess(
+            "from file_lock import FileLock\n"
+            f"FileLock({str(path)!r}).acquire(); print('held', flush=True)\n"
+            "time.sleep(60)"
+        )
+        proc.kill()
+        proc.wait(timeout=10)
+
+        FileLock(path).acquire(timeout=1)
+
+    def test_reentrant_and_shared_by_threads(self, tmp_path):
+        """Nested use works; another thread waits for the outermost release."""
+        lock = FileLock(tmp_path / "x.lock")
+        order = []
+
+        def other():
+            with lock:
+                order.append("other")
+
+        with lock:
+            with lock:
+                assert lock.depth == 2
+            thread = threading.Thread(target=other)
+            thread.start()
+            time.sleep(0.1)
+            order.append("main")
+        thread.join(timeout=5)
+
+        assert order == ["main", "other"]
+        assert lock.depth == 0
+
+
+class TestRunLock:
+    """Tests for the run-level lock."""
+
+    def test_second_runner_is_refused(self, tmp_path):
+        """A live holder keeps the lock; the error names it."""
+        path = tmp_path / "run.lock"
+        proc = hold_in_subprocess(
+            "from file_lock import RunLock\n"
+            f"RunLock({str(path)!r}).acquire(); print('held', flush=True)\n"
+            "sys.stdin.read()"
+        )
+        try:
+            with pytest.raises(LockTimeout, match=f"pid {proc.pid}"):
+                RunLock(path).acquire()
+        finally:
+            release_subprocess(proc)
+
+    def test_lock_of_dead_process_is_broken(self, tmp_path):
+        """A lock left by a process that no longer exists is taken over."""
+        path = tmp_path / "run.lock"
+        proc = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                              capture_output=True, text=True)
+        RunLock(path).acquire()
+        record = json.loads(path.read_text())
+        record["pid"] = int(proc.stdout)
+        path.write_text(json.dumps(record))
+
+        lock = RunLock(path)
+        lock.acquire()
+
+        assert RunLock(path).holder()["token"] == lock._token
+
+    def test_old_lock_of_other_host_is_stale(self, tmp_path):
+        """A holder whose process can't be checked is judged by age."""
+        lock = RunLock(tmp_path / "run.lock", stale_after=60)
+        holder = {"pid": 1, "host": "elsewhere", "started": time.time() - 120}
+
+        assert lock.is_stale(holder)
+        assert not lock.is_stale({**holder, "started": time.time()})
+
+    def test_long_run_on_this_host_is_not_stale(self, tmp_path):
+        """A live local holder keeps the lock past stale_after."""
+        lock = RunLock(tmp_path / "run.lock", stale_after=60)
+        holder = {"pid": os.getpid(), "host": socket.gethostname(), "started": time.time() - 120}
+
+        assert not lock.is_stale(holder)
+
+    def test_release_keeps_someone_elses_lock(self, tmp_path):
+        """Releasing after the lock was broken and re-taken leaves the new owner alone."""
+        path = tmp_path / "run.lock"
+        first = RunLock(path)
+        first.acquire()
+        path.unlink()
+        second = RunLock(path)
+        second.acquire()
+
+        first.release()
+
+        assert path.exists()
+        second.release()
+        assert not path.exists()
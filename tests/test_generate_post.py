@@ -7,7 +7,8 @@ from pathlib import Path
 
 import pytest
 
-from generate_post import BlogGenerator, GenerationResult
+from content_handle import ContentHandle
+from generate_post import MAX_TRANSCRIPT_CHARS, BlogGenerator, GenerationResult
 
 
 class TestBlogGeneratorInit:
@@ -409,6 +410,22 @@ class TestTranscriptFormatting:
 
         assert "truncated" in formatted.lower()
 
+    def test_format_transcripts_reads_only_what_it_keeps(self, temp_posts_dir):
+        """Lazy handles are read no further than the truncation point."""
+        requested = []
+
+        def reader(limit):
+            requested.append(limit)
+            return ("x" * 50000)[:limit]
+
+        generator = BlogGenerator(posts_dir=temp_posts_dir)
+        handle = ContentHandle("/big/session.md", 50000, reader)
+
+        formatted = generator._format_transcripts([{"project": "Test", "content": handle}])
+
+        assert requested == [MAX_TRANSCRIPT_CHARS + 1]
+        assert "truncated" in formatted.lower()
+
 
 class TestHistoryFormatting:
     """Tests for history formatting."""
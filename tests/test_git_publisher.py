@@ -0,0 +1,144 @@
+"""
+Tests for batched git publishing.
+"""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from git_publisher import GitPublisher
+
+
+def git(cwd, *args):
+    """Run git in a directory and return stdout."""
+    return subprocess.run(
+        ['git', '-C', str(cwd), *args],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo_with_remote(tmp_path):
+    """A working clone with a bare 'origin' remote."""
+    remote = tmp_path / "remote.git"
+    subprocess.run(['git', 'init', '-q', '--bare', str(remote)], check=True)
+    repo = tmp_path / "repo"
+    subprocess.run(['git', 'clone', '-q', str(remote), str(repo)], check=True,
+                   capture_output=True)
+    git(repo, 'config', 'user.email', 'test@example.com')
+    git(repo, 'config', 'user.name', 'Test')
+    (repo / "README.md").write_text("readme")
+    git(repo, 'add', 'README.md')
+    git(repo, 'commit', '-q', '-m', 'init')
+    git(repo, 'push', '-q', 'origin', 'HEAD')
+    return repo, remote
+
+
+class TestGitPublisher:
+    """Tests for GitPublisher."""
+
+    def test_not_a_repo(self, tmp_path):
+        """Fails cleanly outside a git repository."""
+        publisher = GitPublisher(tmp_path)
+
+        result = publisher.publish([tmp_path / "post.md"], "msg")
+
+        assert result.success is False
+        assert result.error == "Not a git repository"
+
+    def test_single_commit_for_many_posts(self, repo_with_remote):
+        """All posts land in one commit and one push."""
+        repo, remote = repo_with_remote
+        posts = []
+        for day in ("13", "14", "15"):
+            post = repo / "_posts" / f"2026-01-{day}-post.md"
+            post.parent.mkdir(exist_ok=True)
+            post.write_text(f"post {day}")
+            posts.append(post)
+
+        result = GitPublisher(repo).publish(posts, "Add 3 blog posts")
+
+        assert result.success and result.committed and result.pushed
+        assert result.push_attempts == 1
+        assert git(repo, 'rev-list', '--count', 'HEAD') == "2"
+        assert git(remote, 'log', '-1', '--format=%s') == "Add 3 blog posts"
+        assert {"rev-parse", "add", "diff", "commit", "push"} <= set(result.timings)
+
+    def test_does_not_change_cwd(self, repo_with_remote):
+        """Publishing never calls chdir."""
+        repo, _ = repo_with_remote
+        post = repo / "post.md"
+        post.write_text("post")
+        cwd = Path.cwd()
+
+        GitPublisher(repo).publish([post], "Add post")
+
+        assert Path.cwd() == cwd
+
+    def test_no_changes(self, repo_with_remote):
+        """Nothing staged means nothing committed, but still success."""
+        repo, _ = repo_with_remote
+
+        result = GitPublisher(repo).publish([repo / "README.md"], "noop")
+
+        assert result.success is True
+        assert result.committed is False
+
+    def test_optional_path_ignored(self, repo_with_remote):
+        """A gitignored optional path doesn't block the commit."""
+        repo, _ = repo_with_remote
+        (repo / ".gitignore").write_text("data/\n")
+        (repo / "data").mkdir()
+        index = repo / "data" / "project_index.json"
+        index.write_text("{}")
+        post = repo / "post.md"
+        post.write_text("post")
+
+        result = GitPublisher(repo).publish([post, repo / ".gitignore"], "Add post",
+                                            optional_paths=[index])
+
+        assert result.success is True
+        assert "project_index.json" not in git(repo, 'show', '--name-only', '--format=', 'HEAD')
+
+    def test_rebases_when_remote_moved(self, repo_with_remote, tmp_path):
+        """A rejected push is rebased onto the remote and retried."""
+        repo, remote = repo_with_remote
+        other = tmp_path / "other"
+        subprocess.run(['git', 'clone', '-q', str(remote), str(other)], check=True,
+                       capture_output=True)
+        git(other, 'config', 'user.email', 'other@example.com')
+        git(other, 'config', 'user.name', 'Other')
+        (other / "other.md").write_text("from another machine")
+        git(other, 'add', 'other.md')
+        git(other, 'commit', '-q', '-m', 'other')
+        git(other, 'push', '-q')
+
+        post = repo / "post.md"
+        post.write_text("post")
+        result = GitPublisher(repo, sleep=lambda s: None).publish([post], "Add post")
+
+        assert result.success is True
+        assert result.push_attempts == 2
+        assert git(remote, 'log', '--format=%s') == "Add post\nother\ninit"
+
+    def test_gives_up_after_max_attempts(self, tmp_path):
+        """Stops retrying after max_push_attempts."""
+        publisher = GitPublisher(tmp_path, max_push_attempts=2, sleep=lambda s: None)
+
+        def fake_run(cmd, *args, **kwargs):
+            step = cmd[3]
+            if step == 'diff':
+                return MagicMock(returncode=1, stderr="")
+            if step == 'push':
+                return MagicMock(returncode=1, stderr="rejected")
+            return MagicMock(returncode=0, stderr="")
+
+        with patch('subprocess.run', side_effect=fake_run) as mock_run:
+            result = publisher.publish([tmp_path / "post.md"], "msg")
+
+        pushes = [c for c in mock_run.call_args_list if c.args[0][3] == 'push']
+        assert result.success is False
+        assert result.committed is True
+        assert len(pushes) == 2
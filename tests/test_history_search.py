@@ -0,0 +1,187 @@
+"""
+Tests for BM25 history retrieval.
+"""
+
+import sys
+import threading
+
+from generate_post import BlogGenerator
+from history_search import HistoryIndex, query_terms, relevant_logs
+from index_model import ProjectTimeline
+from project_memory import ProjectMemory
+
+LOGS = {
+    "2026-01-02": ("Added OAuth login with refresh tokens.", ["oauth", "auth"]),
+    "2026-01-05": ("Styled the settings page.", ["css"]),
+    "2026-01-07": ("Fixed flaky CSV export tests.", ["csv", "pytest"]),
+    "2026-01-09": ("Moved the login flow to OAuth device codes.", ["oauth"]),
+    "2026-01-12": ("Tuned database indexes for the dashboard.", ["postgres"]),
+    "2026-01-13": ("Renamed config keys.", ["config"]),
+}
+
+
+def projects(logs=LOGS):
+    daily = {date: {"sessions": [date], "summary": summary, "key_topics": topics}
+             for date, (summary, topics) in logs.items()}
+    return {"Webapp": {"first_seen": "2026-01-02", "last_touched": "2026-01-13",
+                       "total_sessions": len(daily), "summary": "", "daily_logs": daily},
+            "Other": {"first_seen": "2026-01-02", "last_touched": "2026-01-02",
+                      "total_sessions": 1, "summary": "",
+                      "daily_logs": {"2026-01-03": {"sessions": ["x"], "summary": "OAuth everywhere.",
+                                                    "key_topics": ["oauth"]}}}}
+
+
+class TestHistoryIndex:
+    """Tests for the inverted index and ranking."""
+
+    def test_ranks_matching_days_of_the_project(self):
+        index = HistoryIndex()
+        index.sync(projects())
+
+        ranked = index.search(["oauth", "login"], "Webapp", before="2026-01-14")
+
+        assert [date for date, _ in ranked] == ["2026-01-02", "2026-01-09"]
+
+    def test_before_excludes_today_and_later(self):
+        index = HistoryIndex()
+        index.sync(projects())
+
+        assert index.search(["oauth"], "Webapp", before="2026-01-09") == \
+            index.search(["oauth"], "Webapp", before="2026-01-03")
+
+    def test_sync_is_incremental(self):
+        data = projects()
+        index = HistoryIndex()
+        assert index.sync(data) == 7
+
+        assert index.sync(data) == 0
+
+        data["Webapp"]["daily_logs"]["2026-01-05"]["summary"] = "Added OAuth scopes."
+        del data["Webapp"]["daily_logs"]["2026-01-13"]
+        assert index.sync(data) == 2
+        assert "config" not in index.postings
+        ranked = index.search(["oauth"], "Webapp")
+        assert "2026-01-05" in [date for date, _ in ranked]
+        assert len(index) == 6
+
+    def test_concurrent_sync_and_search(self):
+        """Threads syncing and searching one index leave it consistent."""
+        data = projects()
+        changed = projects()
+        changed["Webapp"]["daily_logs"]["2026-01-05"]["summary"] = "Added OAuth scopes."
+        del changed["Webapp"]["daily_logs"]["2026-01-13"]
+        index = HistoryIndex()
+        errors = []
+
+        def worker(i):
+            try:
+                for j in range(200):
+                    index.sync(data if (i + j) % 2 else changed)
+                    index.search(["oauth", "login"], "Webapp")
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+        index.sync(data)
+        fresh = HistoryIndex()
+        fresh.sync(data)
+        assert index._total_length == fresh._total_length
+        assert index.search(["oauth", "login"], "Webapp") == fresh.search(["oauth", "login"], "Webapp")
+
+
+class TestRelevantLogs:
+    """Tests for choosing the history days for the prompt."""
+
+    def test_latest_day_then_relevant_days(self):
+        data = projects()
+        index = HistoryIndex()
+        index.sync(data)
+        timeline = ProjectTimeline("Webapp", data["Webapp"])
+
+        logs = relevant_logs(index, timeline, ["oauth", "login"], before="2026-01-14")
+
+        assert list(logs) == ["2026-01-02", "2026-01-09", "2026-01-13"]
+
+    def test_budget_limits_history(self):
+        data = projects()
+        index = HistoryIndex()
+        index.sync(data)
+        timeline = ProjectTimeline("Webapp", data["Webapp"])
+
+        logs = relevant_logs(index, timeline, ["oauth", "login"], before="2026-01-14", budget=70)
+
+        assert list(logs) == ["2026-01-02", "2026-01-13"]
+
+    def test_recent_days_without_query(self):
+        data = projects()
+        timeline = ProjectTimeline("Webapp", data["Webapp"])
+
+        logs = relevant_logs(HistoryIndex(), timeline, [], before="2026-01-14", max_days=3)
+
+        assert list(logs) == ["2026-01-09", "2026-01-12", "2026-01-13"]
+
+    def test_query_terms_ignore_boilerplate(self):
+        text = "**User**: The OAuth login broke again\n[Tool: Read]\n**Assistant**: Checking OAuth.\n"
+
+        assert query_terms([text])[:2] == ["oauth", "login"]
+
+
+class TestContextHistory:
+    """Tests for relevance-ranked history in the blog context."""
+
+    def test_history_follows_todays_transcript(self, tmp_path, sample_index_file):
+        transcript = tmp_path / "conversation.md"
+        transcript.write_text("**User**: The OAuth device login fails on refresh.\n")
+        memory = ProjectMemory(index_path=sample_index_file, transcript_dir=tmp_path)
+        memory.index["projects"]["Webapp"] = projects()["Webapp"]
+        session = {"project": "Webapp", "date": "2026-01-14", "session_id": "s",
+                   "conversation_path": str(transcript)}
+
+        context = memory.get_context_for_blog("2026-01-14", sessions=[session])
+
+        assert list(context["history"][0]["recent_sessions"]) == ["2026-01-02", "2026-01-09", "2026-01-13"]
+
+    def test_prompt_lists_every_chosen_day(self, tmp_path):
+        history = [{"project": "Webapp", "recent_sessions": {
+            date: {"summary": summary} for date, (summary, _) in LOGS.items()
+        }}]
+
+        text = BlogGenerator(posts_dir=tmp_path)._format_history(history)
+
+        assert text.count("\n  - 2026-01-") == len(LOGS)
+
+    def test_context_does_not_sync_once_synced(self, tmp_path, sample_index_file, monkeypatch):
+        """Backfill workers read the history index; only index changes trigger a sync."""
+        memory = ProjectMemory(index_path=sample_index_file, transcript_dir=tmp_path)
+        memory.index["projects"]["Webapp"] = projects()["Webapp"]
+        memory.sync_history_index()
+        syncs = []
+        sync = HistoryIndex.sync
+        monkeypatch.setattr(HistoryIndex, "sync", lambda self, data: syncs.append(1) or sync(self, data))
+        session = {"project": "Webapp", "date": "2026-01-14", "session_id": "s",
+                   "conversation_path": str(tmp_path / "missing.md")}
+
+        threads = [threading.Thread(target=memory.get_context_for_blog,
+                                    args=("2026-01-14",), kwargs={"sessions": [session]})
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert syncs == []
+
+        with memory.locked():
+            pass
+        memory.get_context_for_blog("2026-01-14", sessions=[session])
+        assert syncs == [1]
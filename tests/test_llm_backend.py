@@ -0,0 +1,138 @@
+"""
+Tests for the pluggable LLM backends.
+"""
+
+import json
+import subprocess
+
+import pytest
+
+from generate_post import BlogGenerator
+from llm_backend import (
+    ClaudeBackend, ClaudeCLIBackend, FakeLLMBackend, backend_from_spec
+)
+from project_memory import ProjectMemory
+from run_metrics import LLMCall, RunMetrics
+
+
+class TestFakeLLMBackend:
+    """Tests for the deterministic offline backend."""
+
+    def test_deterministic(self):
+        """The same prompt and seed always give the same response."""
+        first = FakeLLMBackend(seed=1).complete("Write a post")
+        second = FakeLLMBackend(seed=1).complete("Write a post")
+
+        assert first == second
+        assert first.startswith("# ")
+        assert FakeLLMBackend(seed=2).complete("Write a post") != first
+
+    def test_output_size(self):
+        """Responses are about output_words long."""
+        text = FakeLLMBackend(output_words=200).complete("Write a post")
+        body = [line for line in text.splitlines() if line and not line.startswith("#")]
+
+        assert sum(len(line.split()) for line in body) == 200
+
+    def test_summary_prompt_gets_json(self):
+        """Summary prompts get a JSON summary."""
+        text = FakeLLMBackend().complete("Summarize this. Respond with only valid JSON, no other text.")
+
+        data = json.loads(text)
+        assert data["summary"]
+        assert len(data["key_topics"]) == 3
+
+    def test_failure_rate(self):
+        """With failure_rate=1 every call fails."""
+        assert FakeLLMBackend(failure_rate=1.0).complete("Write a post") == ""
+
+    def test_latency_and_jitter(self):
+        """Simulated latency stays within latency +/- jitter."""
+        delays = []
+        backend = FakeLLMBackend(latency=1.0, jitter=0.25, sleep=delays.append)
+
+        for i in range(20):
+            backend.complete(f"prompt {i}")
+
+        assert all(0.75 <= d <= 1.25 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_records_attempt(self):
+        """The call record names the backend."""
+        call = LLMCall(label="draft", prompt_chars=5)
+
+        FakeLLMBackend().complete("hello", call=call)
+
+        assert call.backend == "fake"
+        assert call.attempts == 1
+
+
+class TestClaudeBackends:
+    """Tests for the real backends (with the CLI mocked)."""
+
+    def test_cli_backend(self, mock_claude_cli):
+        """The CLI backend returns the CLI's stdout."""
+        assert ClaudeCLIBackend().complete("Write the draft").startswith("# Building")
+
+    def test_cli_failure_returns_empty(self, monkeypatch):
+        """A missing CLI is a failed call, not an exception."""
+        def missing(*args, **kwargs):
+            raise FileNotFoundError()
+        monkeypatch.setattr(subprocess, "run", missing)
+
+        assert ClaudeBackend().complete("anything") == ""
+
+
+class TestSpecs:
+    """Tests for backend_from_spec()."""
+
+    def test_fake_with_options(self):
+        """Options are parsed into the fake backend."""
+        backend = backend_from_spec("fake:latency=0.5,jitter=0.1,failure_rate=0.2,words=50,seed=3")
+
+        assert isinstance(backend, FakeLLMBackend)
+        assert (backend.latency, backend.jitter, backend.failure_rate,
+                backend.output_words, backend.seed) == (0.5, 0.1, 0.2, 50, 3)
+
+    def test_named_backends(self):
+        """Real backends are selected by name."""
+        assert isinstance(backend_from_spec("claude"), ClaudeBackend)
+        assert isinstance(backend_from_spec("claude-cli"), ClaudeCLIBackend)
+
+    def test_unknown(self):
+        """Unknown backends and options are rejected."""
+        with pytest.raises(ValueError):
+            backend_from_spec("gpt")
+        with pytest.raises(ValueError):
+            backend_from_spec("fake:speed=3")
+
+
+class TestBackendInjection:
+    """Generator and memory both route calls through the backend."""
+
+    def test_generator_uses_backend(self, tmp_path, sample_context, monkeypatch):
+        """Generation with the fake backend never runs a subprocess."""
+        def forbidden(*args, **kwargs):
+            raise AssertionError("subprocess.run called")
+        monkeypatch.setattr(subprocess, "run", forbidden)
+
+        generator = BlogGenerator(posts_dir=tmp_path / "_posts", llm_backend=FakeLLMBackend())
+        generator.metrics = RunMetrics("test")
+        result = generator.generate(sample_context)
+
+        assert result.success is True
+        assert result.title
+        record = generator.metrics.finish(True)
+        assert [c["backend"] for c in record["llm"]["calls"]] == ["fake"] * 4
+
+    def test_memory_summaries_use_backend(self, tmp_path, sample_transcripts_dir):
+        """Summaries go through the injected backend."""
+        backend = FakeLLMBackend()
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=sample_transcripts_dir, llm_backend=backend)
+
+        memory.update_index(use_claude_for_summaries=True)
+
+        assert backend.calls > 0
+        log = memory.index["projects"]["AutoBlog"]["daily_logs"]["2026-01-14"]
+        assert log["summary"].startswith("Worked on")
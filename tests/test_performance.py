@@ -0,0 +1,162 @@
+"""
+Performance regression gates for the hot paths.
+
+Each test times one path on a synthetic input and fails if it is more than
+AUTOBLOG_PERF_THRESHOLD times slower than tests/perf_baselines.json (see
+scripts/perf_gate.py). After an intentional change in cost, re-record with:
+
+    AUTOBLOG_PERF_UPDATE=1 python -m pytest tests/test_performance.py
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from daily_blog import process_transcript
+from generate_post import BlogGenerator
+from llm_backend import FakeLLMBackend
+from perf_gate import IO_SLACK, PerfBaselines, PerfCheck, time_call
+from project_memory import ProjectMemory
+from sanitize_transcripts import sanitize_content
+from synthetic_corpus import generate_corpus, generate_sessions
+
+BASELINES_PATH = Path(__file__).parent / "perf_baselines.json"
+
+perf = pytest.mark.skipif(os.environ.get("AUTOBLOG_PERF_SKIP") == "1",
+                          reason="AUTOBLOG_PERF_SKIP=1")
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    return PerfBaselines(BASELINES_PATH)
+
+
+@pytest.fixture(scope="module")
+def corpus_root(tmp_path_factory):
+    return tmp_path_factory.mktemp("perf")
+
+
+@pytest.fixture(scope="module")
+def transcript(corpus_root):
+    """One long session with tool output and a few leaked secrets."""
+    stats = generate_corpus(corpus_root / "long", days=1, projects=1, sessions_per_day=1,
+                            turns=200, secret_density=0.05, end_date="2026-01-14")
+    return next(stats.root.rglob("conversation.md")).read_text()
+
+
+@pytest.fixture(scope="module")
+def claude_output():
+    """A long post wrapped the way Claude sometimes returns it."""
+    post = FakeLLMBackend(output_words=2000).complete("Write about the python api tests")
+    return ("Here's the polished blog post:\n\n```markdown\n" + post +
+            "\n```\n\nThis version tightens the intro and fixes the flow.")
+
+
+@pytest.fixture(scope="module")
+def generator(corpus_root):
+    return BlogGenerator(posts_dir=corpus_root / "_posts")
+
+
+def assert_within_baseline(check: PerfCheck) -> None:
+    assert check.passed, f"Performance regression: {check.describe()}"
+
+
+@perf
+class TestTextPaths:
+    """Gates for the per-transcript and per-post text processing."""
+
+    def test_sanitize_content(self, baselines, transcript):
+        assert_within_baseline(baselines.check("sanitize_content",
+                                               lambda: sanitize_content(transcript)))
+
+    def test_process_transcript(self, baselines, transcript):
+        assert_within_baseline(baselines.check("process_transcript",
+                                               lambda: process_transcript(transcript)))
+
+    def test_clean_claude_output(self, baselines, generator, claude_output):
+        assert_within_baseline(baselines.check(
+            "clean_claude_output", lambda: generator._clean_claude_output(claude_output)
+        ))
+
+    def test_extract_tags(self, baselines, generator, claude_output):
+        assert_within_baseline(baselines.check("extract_tags",
+                                               lambda: generator._extract_tags(claude_output)))
+
+
+@perf
+class TestIndexPaths:
+    """Gates for session discovery and index persistence."""
+
+    @pytest.mark.parametrize("layout", ["local", "repo"])
+    def test_find_all_sessions(self, baselines, corpus_root, layout):
+        stats = generate_sessions(corpus_root / f"find-{layout}", 300, turns=1,
+                                  layout=layout, end_date="2026-01-14")
+        memory = ProjectMemory(index_path=corpus_root / "unused.json", transcript_dir=stats.root)
+
+        assert_within_baseline(baselines.check(f"find_all_sessions_{layout}",
+                                               memory.find_all_sessions, io_bound=True))
+
+    def test_index_load_and_save(self, baselines, corpus_root):
+        stats = generate_sessions(corpus_root / "index", 1000, turns=1, layout="repo",
+                                  end_date="2026-01-14")
+        memory = ProjectMemory(index_path=corpus_root / "index.json", transcript_dir=stats.root)
+        memory.update_index(use_claude_for_summaries=False)
+
+        project = next(iter(memory.index["projects"].values()))
+        day = next(iter(project["daily_logs"].values()))
+        edits = iter(range(10**9))
+
+        def save_changed_index():
+            """Journal one changed day, then fold the journal into the snapshot."""
+            day["summary"] = f"Edited summary {next(edits)}"
+            assert memory._save_index() == 1
+            assert memory.compact_index()
+
+        assert_within_baseline(baselines.check("index_save", save_changed_index, io_bound=True))
+        assert_within_baseline(baselines.check("index_load", memory._load_index, io_bound=True))
+
+
+class TestPerfGate:
+    """Tests for the gate itself."""
+
+    def test_time_call_batches_fast_operations(self):
+        """Sub-microsecond calls still get a sensible per-call time."""
+        seconds = time_call(lambda: None, repeat=2)
+        assert 0 < seconds < 0.001
+
+    def test_regression_beyond_threshold_fails(self, tmp_path):
+        """A path much slower than its baseline fails the check."""
+        baselines = PerfBaselines(tmp_path / "baselines.json", threshold=2.0, update=False)
+        baselines.baselines["noop"] = 1e-9
+
+        check = baselines.check("noop", lambda: sum(range(1000)), repeat=1)
+
+        assert not check.passed
+        assert "x baseline" in check.describe()
+
+    def test_io_bound_checks_get_extra_slack(self, tmp_path):
+        """Filesystem-bound paths are allowed IO_SLACK times the threshold."""
+        baselines = PerfBaselines(tmp_path / "baselines.json", threshold=2.0, update=False)
+
+        check = baselines.check("io", lambda: None, repeat=1, io_bound=True)
+
+        assert check.threshold == 2.0 * IO_SLACK
+
+    def test_missing_baseline_passes(self, tmp_path):
+        """A path without a baseline is reported but not gated."""
+        baselines = PerfBaselines(tmp_path / "baselines.json", update=False)
+
+        check = baselines.check("new_path", lambda: None, repeat=1)
+
+        assert check.passed
+        assert check.ratio is None
+
+    def test_update_records_baseline(self, tmp_path):
+        """Update mode writes the relative timing to disk."""
+        path = tmp_path / "baselines.json"
+        PerfBaselines(path, update=True).check("path", lambda: sum(range(100)), repeat=1)
+
+        reloaded = PerfBaselines(path, update=False)
+        assert reloaded.baselines["path"] > 0
+        assert reloaded.check("path", lambda: sum(range(100)), repeat=3).passed
@@ -0,0 +1,192 @@
+"""
+Tests for the incremental stage pipeline.
+"""
+
+import json
+
+import pytest
+
+from content_handle import ContentHandle
+from pipeline import NoCache, Pipeline, PipelineStop, Stage, StageError, fingerprint
+
+
+class Recorder:
+    """Builds stages that record when they execute."""
+
+    def __init__(self):
+        self.calls = []
+
+    def stage(self, name, value, **kwargs):
+        def func(inputs):
+            self.calls.append(name)
+            return value(inputs) if callable(value) else value
+        return Stage(name, func, **kwargs)
+
+
+class TestPipeline:
+    """Tests for Pipeline."""
+
+    def test_runs_all_stages_first_time(self, tmp_path):
+        """Every stage executes on a cold cache."""
+        rec = Recorder()
+        pipeline = Pipeline([
+            rec.stage("a", 1),
+            rec.stage("b", lambda i: i["a"] + 1, inputs=["a"]),
+        ], cache_dir=tmp_path)
+
+        result = pipeline.run()
+
+        assert result.success is True
+        assert result.outputs == {"a": 1, "b": 2}
+        assert rec.calls == ["a", "b"]
+
+    def test_unchanged_inputs_are_cached(self, tmp_path):
+        """A second run with the same inputs executes nothing cacheable."""
+        rec = Recorder()
+        stages = [rec.stage("a", 1), rec.stage("b", 2, inputs=["a"])]
+
+        Pipeline(stages, cache_dir=tmp_path).run()
+        rec.calls.clear()
+        result = Pipeline(stages, cache_dir=tmp_path).run()
+
+        assert rec.calls == []
+        assert result.cached == ["a", "b"]
+        assert result.outputs == {"a": 1, "b": 2}
+
+    def test_early_cutoff(self, tmp_path):
+        """A non-cacheable stage with unchanged output doesn't invalidate downstream."""
+        rec = Recorder()
+        stages = [
+            rec.stage("scan", {"files": 3}, cacheable=False),
+            rec.stage("expensive", "result", inputs=["scan"]),
+        ]
+
+        Pipeline(stages, cache_dir=tmp_path).run()
+        rec.calls.clear()
+        Pipeline(stages, cache_dir=tmp_path).run()
+
+        assert rec.calls == ["scan"]
+
+    def test_changed_input_reruns_downstream(self, tmp_path):
+        """Changing an upstream output re-runs dependent stages."""
+        rec = Recorder()
+        value = {"n": 1}
+        stages = [
+            rec.stage("scan", lambda i: dict(value), cacheable=False),
+            rec.stage("expensive", lambda i: i["scan"]["n"] * 10, inputs=["scan"]),
+        ]
+
+        Pipeline(stages, cache_dir=tmp_path).run()
+        value["n"] = 2
+        rec.calls.clear()
+        result = Pipeline(stages, cache_dir=tmp_path).run()
+
+        assert rec.calls == ["scan", "expensive"]
+        assert result.outputs["expensive"] == 20
+
+    def test_params_and_version_in_key(self, tmp_path):
+        """Declared params and the stage version are part of the cache key."""
+        rec = Recorder()
+        pipeline = Pipeline([rec.stage("a", 1, params=["date"])], cache_dir=tmp_path)
+
+        pipeline.run(params={"date": "2026-01-13", "other": 1})
+        pipeline.run(params={"date": "2026-01-13", "other": 2})
+        assert rec.calls == ["a"]
+
+        pipeline.run(params={"date": "2026-01-14"})
+        assert rec.calls == ["a", "a"]
+
+        Pipeline([rec.stage("a", 1, params=["date"], version="v2")],
+                 cache_dir=tmp_path).run(params={"date": "2026-01-14"})
+        assert rec.calls == ["a", "a", "a"]
+
+    def test_from_and_until_stage(self, tmp_path):
+        """Partial reruns reuse stored outputs and stop where asked."""
+        rec = Recorder()
+        stages = [
+            rec.stage("a", 1),
+            rec.stage("b", lambda i: i["a"] + 1, inputs=["a"]),
+            rec.stage("c", lambda i: i["b"] + 1, inputs=["b"]),
+        ]
+        Pipeline(stages, cache_dir=tmp_path).run()
+        rec.calls.clear()
+
+        result = Pipeline(stages, cache_dir=tmp_path).run(from_stage="b", until_stage="b")
+
+        assert rec.calls == ["b"]
+        assert "c" not in result.outputs
+
+    def test_from_stage_requires_stored_outputs(self, tmp_path):
+        """Resuming without stored upstream outputs fails clearly."""
+        pipeline = Pipeline([Stage("a", lambda i: 1), Stage("b", lambda i: 2, inputs=["a"])],
+                            cache_dir=tmp_path)
+
+        result = pipeline.run(from_stage="b")
+
+        assert result.success is False
+        assert "a" in result.error
+
+    def test_stop_and_error(self, tmp_path):
+        """PipelineStop ends successfully; StageError reports failure."""
+        def stop(inputs):
+            raise PipelineStop("nothing to do")
+
+        def fail(inputs):
+            raise StageError("boom")
+
+        stopped = Pipeline([Stage("a", stop), Stage("b", lambda i: 1, inputs=["a"])]).run()
+        failed = Pipeline([Stage("a", fail)]).run()
+
+        assert stopped.success is True and stopped.stopped_at == "a"
+        assert failed.success is False and failed.error == "boom"
+
+    def test_nocache_output_is_not_persisted(self, tmp_path):
+        """Fallback outputs are used but retried on the next run."""
+        rec = Recorder()
+        stages = [rec.stage("a", lambda i: NoCache("fallback"))]
+
+        first = Pipeline(stages, cache_dir=tmp_path).run()
+        Pipeline(stages, cache_dir=tmp_path).run()
+
+        assert first.outputs["a"] == "fallback"
+        assert rec.calls == ["a", "a"]
+
+    def test_records_timings_for_executed_stages(self, tmp_path):
+        """Executed and failed stages are timed; cached stages are not."""
+        rec = Recorder()
+        stages = [rec.stage("a", 1), rec.stage("b", 2, inputs=["a"], cacheable=False)]
+        Pipeline(stages, cache_dir=tmp_path).run()
+
+        result = Pipeline(stages, cache_dir=tmp_path).run()
+        def fail(inputs):
+            raise StageError("boom")
+        failed = Pipeline([Stage("x", fail)]).run()
+
+        assert set(result.timings) == {"b"}
+        assert set(result.timings["b"]) == {"wall", "cpu"}
+        assert "x" in failed.timings
+
+    def test_rejects_unknown_dependency(self):
+        """Stages may only depend on earlier stages."""
+        with pytest.raises(ValueError):
+            Pipeline([Stage("a", lambda i: 1, inputs=["b"]), Stage("b", lambda i: 2)])
+
+    def test_fingerprint_is_order_independent(self):
+        """Dict key order doesn't change the fingerprint."""
+        assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+
+    def test_content_handles_fingerprint_by_stat_not_text(self, tmp_path):
+        """Handles are hashed and stored by path/size/mtime without being read."""
+        def unread(limit):
+            raise AssertionError("handle was read")
+
+        handle = ContentHandle("/t/a.md", 100, unread, mtime_ns=1)
+        changed = ContentHandle("/t/a.md", 100, unread, mtime_ns=2)
+
+        stages = [Stage("context", lambda inputs: {"today": [{"content": handle}]})]
+        result = Pipeline(stages, cache_dir=tmp_path).run()
+
+        assert result.success
+        assert fingerprint({"c": handle}) != fingerprint({"c": changed})
+        stored = json.loads((tmp_path / "context.json").read_text())
+        assert stored["output"]["today"][0]["content"]["path"] == "/t/a.md"
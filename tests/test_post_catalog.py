@@ -0,0 +1,108 @@
+"""
+Tests for the existing-post catalog.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from post_catalog import PostCatalog
+
+
+@pytest.fixture
+def blog_dirs(tmp_path):
+    """_posts and _drafts with a few existing files."""
+    posts_dir = tmp_path / "_posts"
+    drafts_dir = tmp_path / "_drafts"
+    posts_dir.mkdir()
+    drafts_dir.mkdir()
+    (posts_dir / "2026-01-13-first-post.md").write_text('---\ntitle: "First Post"\n---\nBody')
+    (posts_dir / "2026-01-14-daily-development-log-january-14-2026.md").write_text("Body")
+    (posts_dir / "notes.txt").write_text("not a post")
+    (drafts_dir / "2026-01-15-a-draft.md").write_text("---\ntitle: A Draft\n---\n")
+    return posts_dir, drafts_dir
+
+
+class TestPostCatalog:
+    """Tests for PostCatalog."""
+
+    def test_lookup_by_date(self, blog_dirs):
+        """Finds posts and drafts by date."""
+        posts_dir, drafts_dir = blog_dirs
+        catalog = PostCatalog(posts_dir, drafts_dir)
+
+        assert catalog.find("2026-01-13") == posts_dir / "2026-01-13-first-post.md"
+        assert catalog.find("2026-01-15") == drafts_dir / "2026-01-15-a-draft.md"
+        assert catalog.find("2026-01-16") is None
+        assert catalog.has_date("2026-01-14")
+
+    def test_counts_and_dates(self, blog_dirs):
+        """Counts only published posts; dates cover both directories."""
+        catalog = PostCatalog(*blog_dirs)
+
+        assert catalog.post_count() == 2
+        assert catalog.dates() == ["2026-01-13", "2026-01-14", "2026-01-15"]
+
+    def test_single_scan_for_many_lookups(self, blog_dirs):
+        """Repeated lookups don't re-list unchanged directories."""
+        catalog = PostCatalog(*blog_dirs)
+
+        with patch("post_catalog.os.scandir", wraps=os.scandir) as mock_scandir:
+            for day in range(1, 31):
+                catalog.has_date(f"2026-01-{day:02d}")
+
+        assert mock_scandir.call_count == 2  # _posts and _drafts once each
+
+    def test_refreshes_when_directory_changes(self, blog_dirs):
+        """Files created by another process are picked up via mtime."""
+        posts_dir, drafts_dir = blog_dirs
+        catalog = PostCatalog(posts_dir, drafts_dir)
+        assert not catalog.has_date("2026-01-20")
+
+        new_post = posts_dir / "2026-01-20-new.md"
+        new_post.write_text("Body")
+        stat = posts_dir.stat()
+        os.utime(posts_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert catalog.find("2026-01-20") == new_post
+
+    def test_add_records_written_file(self, blog_dirs):
+        """add() makes a new file visible without a rescan."""
+        posts_dir, drafts_dir = blog_dirs
+        catalog = PostCatalog(posts_dir, drafts_dir)
+        catalog.refresh()
+
+        new_post = posts_dir / "2026-01-21-added.md"
+        new_post.write_text("Body")
+        catalog.add(new_post)
+
+        with patch("post_catalog.os.scandir") as mock_scandir:
+            assert catalog.find("2026-01-21") == new_post
+        mock_scandir.assert_not_called()
+
+    def test_find_by_slug(self, blog_dirs):
+        """Matches against the slug part of the filename."""
+        posts_dir, drafts_dir = blog_dirs
+        catalog = PostCatalog(posts_dir, drafts_dir)
+
+        found = catalog.find_by_slug("daily-development-log")
+
+        assert found == [posts_dir / "2026-01-14-daily-development-log-january-14-2026.md"]
+        assert catalog.find_by_slug("a-draft", drafts=True) == [drafts_dir / "2026-01-15-a-draft.md"]
+
+    def test_title_from_front_matter(self, blog_dirs):
+        """Reads the front matter title."""
+        posts_dir, drafts_dir = blog_dirs
+        catalog = PostCatalog(posts_dir, drafts_dir)
+
+        assert catalog.title(posts_dir / "2026-01-13-first-post.md") == "First Post"
+        assert catalog.title(drafts_dir / "2026-01-15-a-draft.md") == "A Draft"
+        assert catalog.title(posts_dir / "2026-01-14-daily-development-log-january-14-2026.md") is None
+
+    def test_missing_directories(self, tmp_path):
+        """Missing directories behave as empty."""
+        catalog = PostCatalog(tmp_path / "_posts", tmp_path / "_drafts")
+
+        assert catalog.find("2026-01-13") is None
+        assert catalog.post_count() == 0
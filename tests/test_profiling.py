@@ -0,0 +1,96 @@
+"""
+Tests for per-stage profiling.
+"""
+
+import pstats
+import time
+
+from profiling import StageProfiler
+from daily_blog import DailyBlogRunner
+
+
+def busy(seconds):
+    """Burn CPU for a while so the sampler sees it."""
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+
+class TestStageProfiler:
+    """Tests for StageProfiler."""
+
+    def test_writes_profile_and_collapsed_stacks(self, tmp_path):
+        """A stage produces a pstats file, collapsed stacks and a summary."""
+        profiler = StageProfiler(tmp_path, sample_interval=0.001)
+
+        with profiler.profile("work"):
+            busy(0.1)
+
+        stats = pstats.Stats(str(tmp_path / "work.prof"))
+        assert any(func[2] == "busy" for func in stats.stats)
+
+        lines = (tmp_path / "work.collapsed").read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any(line.startswith("busy (test_profiling.py") for line in lines)
+
+        assert all(line.startswith("work;")
+                   for line in (tmp_path / "all.collapsed").read_text().splitlines())
+        assert "===== work =====" in (tmp_path / "summary.txt").read_text()
+
+    def test_repeated_stage_gets_numbered_files(self, tmp_path):
+        """Running a stage twice doesn't overwrite the first profile."""
+        profiler = StageProfiler(tmp_path)
+
+        for _ in range(2):
+            with profiler.profile("step"):
+                busy(0.01)
+
+        assert (tmp_path / "step.prof").exists()
+        assert (tmp_path / "step-2.prof").exists()
+
+    def test_nested_stage_is_part_of_outer(self, tmp_path):
+        """A stage opened inside another isn't profiled separately."""
+        profiler = StageProfiler(tmp_path)
+
+        with profiler.profile("outer"):
+            with profiler.profile("inner"):
+                busy(0.01)
+
+        assert (tmp_path / "outer.prof").exists()
+        assert not (tmp_path / "inner.prof").exists()
+
+
+class TestRunnerProfiling:
+    """Tests for --profile on the runner."""
+
+    def test_run_profiles_each_executed_stage(
+        self, tmp_path, sample_transcripts_dir, mock_claude_cli
+    ):
+        """Every pipeline stage that runs gets its own profile."""
+        repo_dir = tmp_path / "repo"
+        (repo_dir / "scripts" / "data").mkdir(parents=True)
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+        runner.memory.transcript_dir = sample_transcripts_dir
+        runner.enable_profiling(tmp_path / "profiles")
+
+        assert runner.run(date="2026-01-14", skip_push=True, skip_summaries=True)
+
+        for stage in ("update_index", "context", "draft", "save"):
+            assert (tmp_path / "profiles" / f"{stage}.prof").exists()
+
+    def test_update_profiles_index_steps(self, tmp_path, sample_transcripts_dir):
+        """A standalone index update is split into its own steps."""
+        repo_dir = tmp_path / "repo"
+        (repo_dir / "scripts" / "data").mkdir(parents=True)
+        runner = DailyBlogRunner(repo_dir=repo_dir)
+        runner.memory.transcript_dir = sample_transcripts_dir
+        runner.enable_profiling(tmp_path / "profiles")
+
+        runner.memory.update_index(use_claude_for_summaries=False)
+
+        assert (tmp_path / "profiles" / "find_sessions.prof").exists()
+        assert (tmp_path / "profiles" / "save_index.prof").exists()
@@ -8,7 +8,12 @@ from pathlib import Path
 
 import pytest
 
+from content_handle import ContentHandle, read_content
+import index_format
+import index_store
+from index_model import IndexModel
 from project_memory import ProjectMemory
+from session_record import SessionRecord
 
 
 class TestProjectMemoryInit:
@@ -30,6 +35,243 @@ class TestProjectMemoryInit:
         assert "AutoBlog" in memory.index["projects"]
         assert "PenguinCAM" in memory.index["projects"]
 
+    def test_index_loaded_on_first_access(self, tmp_path, sample_index):
+        """Constructing ProjectMemory doesn't read the index file."""
+        index_path = tmp_path / "data" / "project_index.json"
+        memory = ProjectMemory(index_path=index_path)
+
+        index_path.parent.mkdir(parents=True)
+        index_path.write_text(json.dumps(sample_index))
+
+        assert "AutoBlog" in memory.index["projects"]
+
+    def test_refresh_index_reloads_changed_file(self, sample_index_file, sample_index):
+        """refresh_index picks up changes written by another process."""
+        memory = ProjectMemory(index_path=sample_index_file)
+        assert memory.refresh_index() is False
+        memory.index
+
+        sample_index["projects"]["NewProject"] = {"daily_logs": {}}
+        sample_index_file.write_text(json.dumps(sample_index))
+        memory._loaded_mtime = -1  # mtime resolution can hide a fast rewrite
+
+        assert memory.refresh_index() is True
+        assert "NewProject" in memory.index["projects"]
+
+
+class TestIndexJournal:
+    """Tests for the journaled index storage."""
+
+    def _add_log(self, memory, project="AutoBlog", date="2026-01-20"):
+        memory.index["projects"][project]["daily_logs"][date] = {
+            "sessions": ["new1"], "summary": "", "key_topics": []
+        }
+
+    def test_save_appends_only_the_change(self, sample_index_file):
+        """A save journals the changed daily log; the snapshot is untouched."""
+        snapshot = sample_index_file.read_text()
+        memory = ProjectMemory(index_path=sample_index_file)
+        self._add_log(memory)
+
+        changes = memory._save_index()
+
+        journal = sample_index_file.with_name("project_index.json.journal")
+        assert changes == 1
+        assert sample_index_file.read_text() == snapshot
+        assert len(journal.read_text().splitlines()) == 1
+        assert "2026-01-20" in journal.read_text()
+        assert "PenguinCAM" not in journal.read_text()
+
+    def test_load_replays_journal(self, sample_index_file):
+        """A fresh instance sees snapshot plus journal."""
+        memory = ProjectMemory(index_path=sample_index_file)
+        self._add_log(memory)
+        del memory.index["projects"]["PenguinCAM"]
+        memory._save_index()
+
+        reloaded = ProjectMemory(index_path=sample_index_file).index
+
+        assert reloaded == memory.index
+
+    def test_unchanged_save_writes_nothing(self, sample_index_file):
+        """Saving without changes neither journals nor rewrites."""
+        memory = ProjectMemory(index_path=sample_index_file)
+        memory.index
+
+        assert memory._save_index() == 0
+        assert not sample_index_file.with_name("project_index.json.journal").exists()
+
+    def test_corrupt_snapshot_is_moved_aside(self, sample_index_file, caplog):
+        """An unreadable snapshot is kept for inspection, logged, and never overwritten."""
+        sample_index_file.write_text("not valid json {{{")
+
+        with caplog.at_level("ERROR", logger="autoblog"):
+            memory = ProjectMemory(index_path=sample_index_file)
+            assert memory.index["projects"] == {}
+
+        moved = list(sample_index_file.parent.glob("project_index.json.corrupt-*"))
+        assert len(moved) == 1
+        assert moved[0].read_text() == "not valid json {{{"
+        assert not sample_index_file.exists()
+        assert "damaged" in caplog.text
+
+        memory.compact_index()
+        assert moved[0].read_text() == "not valid json {{{"
+
+    def test_read_error_leaves_snapshot_in_place(self, sample_index_file, monkeypatch):
+        """A snapshot that can't be read right now fails the load instead of being moved."""
+        def unreadable(path):
+            raise PermissionError(13, "Permission denied", str(path))
+        monkeypatch.setattr(index_store, "read_index", unreadable)
+
+        with pytest.raises(PermissionError):
+            ProjectMemory(index_path=sample_index_file).index
+
+        assert sample_index_file.exists()
+        assert list(sample_index_file.parent.glob("*.corrupt-*")) == []
+
+    def test_torn_journal_line_is_ignored_and_cut(self, sample_index_file):
+        """A partial line from a crash is skipped, then overwritten by the next save."""
+        memory = ProjectMemory(index_path=sample_index_file)
+        self._add_log(memory)
+        memory._save_index()
+        journal = sample_index_file.with_name("project_index.json.journal")
+        with open(journal, "a") as f:
+            f.write('{"changes": [{"set": ["last_upd')
+
+        memory = ProjectMemory(index_path=sample_index_file)
+        assert "2026-01-20" in memory.index["projects"]["AutoBlog"]["daily_logs"]
+        self._add_log(memory, date="2026-01-21")
+        memory._save_index()
+
+        lines = journal.read_text().splitlines()
+        assert len(lines) == 2
+        assert all(json.loads(line) for line in lines)
+        reloaded = ProjectMemory(index_path=sample_index_file).index
+        assert "2026-01-21" in reloaded["projects"]["AutoBlog"]["daily_logs"]
+
+    def test_compact_folds_journal_into_snapshot(self, sample_index_file):
+        """compact_index() rewrites the snapshot atomically and drops the journal."""
+        memory = ProjectMemory(index_path=sample_index_file)
+        self._add_log(memory)
+        memory._save_index()
+
+        assert memory.compact_index() is True
+
+        assert not sample_index_file.with_name("project_index.json.journal").exists()
+        assert not sample_index_file.with_name("project_index.json.tmp").exists()
+        assert json.loads(sample_index_file.read_text()) == memory.index
+        assert memory.compact_index() is False
+
+    def test_journal_is_compacted_when_large(self, sample_index_file, monkeypatch):
+        """Saves compact automatically once the journal passes the thresholds."""
+        monkeypatch.setattr(index_store, "COMPACT_MIN_BYTES", 0)
+        monkeypatch.setattr(index_store, "COMPACT_RATIO", 0.0)
+        memory = ProjectMemory(index_path=sample_index_file)
+        self._add_log(memory)
+
+        memory._save_index()
+
+        assert not sample_index_file.with_name("project_index.json.journal").exists()
+        assert "2026-01-20" in json.loads(sample_index_file.read_text())["projects"]["AutoBlog"]["daily_logs"]
+
+    def test_locked_cycles_build_on_each_other(self, sample_index_file):
+        """A writer that loaded earlier reloads under the lock instead of overwriting."""
+        first = ProjectMemory(index_path=sample_index_file)
+        second = ProjectMemory(index_path=sample_index_file)
+        first.index, second.index
+
+        with second.locked() as index:
+            index["projects"]["AutoBlog"]["daily_logs"]["2026-01-20"] = {"sessions": ["b"]}
+            second._save_index()
+        with first.locked() as index:
+            index["projects"]["AutoBlog"]["daily_logs"]["2026-01-21"] = {"sessions": ["a"]}
+            first._save_index()
+
+        logs = ProjectMemory(index_path=sample_index_file).index["projects"]["AutoBlog"]["daily_logs"]
+        assert {"2026-01-20", "2026-01-21"} <= set(logs)
+
+    def test_refresh_index_sees_journal_appends(self, sample_index_file):
+        """Another process's journaled save triggers a reload."""
+        reader = ProjectMemory(index_path=sample_index_file)
+        reader.index
+        writer = ProjectMemory(index_path=sample_index_file)
+        self._add_log(writer)
+        writer._save_index()
+
+        assert reader.refresh_index() is True
+        assert "2026-01-20" in reader.index["projects"]["AutoBlog"]["daily_logs"]
+
+
+class TestIndexFormats:
+    """Tests for the binary snapshot formats."""
+
+    def test_abix_round_trip_with_journal(self, tmp_path, sample_index):
+        """A .abix index is saved, journaled and reloaded like a JSON one."""
+        path = tmp_path / "project_index.abix"
+        memory = ProjectMemory(index_path=path)
+        memory.index = sample_index
+        memory._save_index()
+        assert path.read_bytes().startswith(index_format.ABIX_MAGIC)
+
+        memory = ProjectMemory(index_path=path)
+        memory.index["projects"]["AutoBlog"]["summary"] = "changed"
+        memory._save_index()
+
+        reloaded = ProjectMemory(index_path=path).index
+        assert reloaded["projects"]["AutoBlog"]["summary"] == "changed"
+        assert reloaded["projects"]["PenguinCAM"] == sample_index["projects"]["PenguinCAM"]
+
+    def test_convert_both_directions(self, tmp_path, sample_index_file, sample_index):
+        """JSON converts to binary and back without loss, journal included."""
+        memory = ProjectMemory(index_path=sample_index_file)
+        memory.index["projects"]["AutoBlog"]["summary"] = "journaled"
+        memory._save_index()
+        expected = memory.index
+
+        binary = index_format.convert_index(sample_index_file, tmp_path / "i.abix")
+        back = index_format.convert_index(tmp_path / "i.abix", tmp_path / "back.json")
+
+        assert binary == back == expected
+        assert json.loads((tmp_path / "back.json").read_text()) == expected
+
+    def test_convert_missing_index_fails(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            index_format.convert_index(tmp_path / "missing.json", tmp_path / "out.abix")
+
+    @pytest.mark.parametrize("mangle", [
+        lambda data: data[:-3],
+        lambda data: b"JUNK" + data[4:],
+        lambda data: data[:4] + bytes([index_format.ABIX_VERSION + 1]) + data[5:],
+    ], ids=["truncated", "bad-magic", "newer-version"])
+    def test_invalid_abix_is_rejected(self, tmp_path, sample_index, mangle):
+        """Damaged or newer-version files raise IndexFormatError instead of loading garbage."""
+        data = index_format.dumps_index(sample_index, "abix")
+        path = tmp_path / "bad.abix"
+        path.write_bytes(mangle(data))
+
+        with pytest.raises(index_format.IndexFormatError):
+            index_format.read_index(path)
+
+    def test_newer_abix_is_not_quarantined(self, tmp_path, sample_index):
+        """An index from a newer AutoBlog fails the load and stays where it is."""
+        path = tmp_path / "project_index.abix"
+        data = index_format.dumps_index(sample_index, "abix")
+        path.write_bytes(data[:4] + bytes([index_format.ABIX_VERSION + 1]) + data[5:])
+
+        with pytest.raises(index_format.IndexVersionError):
+            index_store.IndexStore(path).load()
+
+        assert path.exists()
+        assert list(tmp_path.glob("*.corrupt-*")) == []
+
+    @pytest.mark.skipif(not index_format.MSGPACK_AVAILABLE, reason="msgpack not installed")
+    def test_msgpack_round_trip(self, tmp_path, sample_index):
+        path = tmp_path / "project_index.msgpack"
+        index_store.IndexStore(path).compact(sample_index)
+
+        assert index_format.read_index(path) == sample_index
+
 
 class TestFindSessions:
     """Tests for session discovery."""
@@ -166,6 +408,49 @@ class TestIndexUpdate:
         assert memory.index["last_updated"] is not None
 
 
+    def test_noop_update_leaves_index_untouched(
+        self, sample_transcripts_dir, tmp_path, mock_claude_cli
+    ):
+        """A scan that finds nothing new writes neither journal nor snapshot."""
+        index_path = tmp_path / "data" / "project_index.json"
+        memory = ProjectMemory(index_path=index_path, transcript_dir=sample_transcripts_dir)
+        memory.update_index(use_claude_for_summaries=False)
+        memory.compact_index()
+        snapshot = index_path.read_text()
+        last_updated = memory.index["last_updated"]
+
+        stats = ProjectMemory(
+            index_path=index_path, transcript_dir=sample_transcripts_dir
+        ).update_index(use_claude_for_summaries=False)
+
+        assert stats["new_sessions"] == 0
+        assert index_path.read_text() == snapshot
+        assert not index_path.with_name("project_index.json.journal").exists()
+        reloaded = ProjectMemory(index_path=index_path)
+        assert reloaded.index["last_updated"] == last_updated
+        assert reloaded.last_scan > last_updated
+
+    def test_last_scan_falls_back_to_last_updated(self, sample_index_file, sample_index):
+        """Indexes written before the state file use last_updated."""
+        memory = ProjectMemory(index_path=sample_index_file)
+
+        assert memory.last_scan == sample_index["last_updated"]
+
+    def test_index_published_flag(self, sample_index_file):
+        """Rewriting the snapshot marks it unpublished until it is committed."""
+        memory = ProjectMemory(index_path=sample_index_file)
+        memory.mark_index_published()
+        assert not memory.index_unpublished
+
+        assert not memory.compact_index()
+        assert not memory.index_unpublished
+
+        memory.index["projects"]["AutoBlog"]["description"] = "changed"
+        memory._save_index()
+        assert memory.compact_index()
+        assert memory.index_unpublished
+
+
 class TestProjectHistory:
     """Tests for retrieving project history."""
 
@@ -235,6 +520,169 @@ class TestBlogContext:
         assert len(context["today"]) == 0
 
 
+class TestLazyContent:
+    """Tests for lazy content handles in the blog context."""
+
+    def test_context_carries_handles_not_text(self, sample_transcripts_dir, tmp_path):
+        """Context entries hold handles that read the transcript on demand."""
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=sample_transcripts_dir)
+
+        context = memory.get_context_for_blog("2026-01-14")
+        handle = context["today"][0]["content"]
+
+        assert isinstance(handle, ContentHandle)
+        assert handle.size > 0
+        assert "Claude Code Session" in handle.read()
+        assert len(handle.read(limit=10)) == 10
+
+    def test_empty_transcripts_are_skipped(self, tmp_path):
+        """Empty files get no handle, like empty content before."""
+        day = tmp_path / "transcripts" / "2026-01-14"
+        day.mkdir(parents=True)
+        (day / "AutoBlog_abc.md").write_text("")
+        (day / "AutoBlog_def.md").write_text("# Session def")
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=tmp_path / "transcripts")
+
+        context = memory.get_context_for_blog("2026-01-14")
+
+        assert [t["session_id"] for t in context["today"]] == ["def"]
+
+    def test_handle_round_trips_through_json(self, tmp_path):
+        """A stored context can be read again after a restart."""
+        path = tmp_path / "session.md"
+        path.write_text("hello world")
+        handle = ContentHandle.for_file(path)
+
+        data = json.loads(json.dumps(handle.to_json()))
+
+        assert read_content(data) == "hello world"
+        assert read_content(data, limit=5) == "hello"
+        assert read_content("plain text", limit=5) == "plain"
+
+    def test_session_content_limit(self, sample_transcripts_dir, tmp_path):
+        """get_session_content() can stop after a prefix."""
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=sample_transcripts_dir)
+        session = memory.find_all_sessions()[0]
+
+        assert memory.get_session_content(session, limit=20) == \
+            memory.get_session_content(session)[:20]
+
+
+class TestSessionRecords:
+    """Tests for the compact session records returned by find_all_sessions()."""
+
+    def test_records_read_like_session_dicts(self, sample_transcripts_dir, tmp_path):
+        """The dict view has the keys and values the old dicts had."""
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=sample_transcripts_dir)
+
+        session = memory.find_all_sessions()[0]
+
+        assert isinstance(session, SessionRecord)
+        assert set(session) == {"project", "date", "session_id", "path",
+                                "conversation_path", "has_metadata", "metadata"}
+        assert session["path"] == str(Path(session["conversation_path"]).parent)
+        assert session["has_metadata"] is True
+        assert session.get("archive_member") is None
+        assert session.to_dict()["metadata"] == session.metadata
+
+    def test_records_are_immutable_and_share_strings(self, tmp_path):
+        """Records can't be modified and reuse one string per project and date."""
+        a = SessionRecord("Auto" + "Blog", "2026-01-14", "a", "/t/2026-01-14/AutoBlog_a.md")
+        b = SessionRecord("AutoBl" + "og", "2026-01-" + "14", "b", "/t/2026-01-14/AutoBlog_b.md")
+
+        with pytest.raises(AttributeError):
+            a.project = "Other"
+        assert a.project is b.project
+        assert a.date is b.date
+        assert not hasattr(a, "__dict__")
+
+    def test_metadata_is_loaded_lazily(self, tmp_path):
+        """metadata.json is only read when asked for."""
+        session_dir = tmp_path / "transcript" / "AutoBlog" / "2026-01-14" / "abc"
+        session_dir.mkdir(parents=True)
+        (session_dir / "conversation.md").write_text("# Session")
+        (session_dir / "metadata.json").write_text('{"session_id": "abc"}')
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=tmp_path / "transcript")
+
+        session = memory.find_all_sessions()[0]
+        (session_dir / "metadata.json").write_text('{"session_id": "changed"}')
+
+        assert session["metadata"] == {"session_id": "changed"}
+
+    def test_invalid_metadata_is_left_out(self, tmp_path):
+        """A corrupt metadata.json leaves no "metadata" key, as before."""
+        session_dir = tmp_path / "transcript" / "AutoBlog" / "2026-01-14" / "abc"
+        session_dir.mkdir(parents=True)
+        (session_dir / "conversation.md").write_text("# Session")
+        (session_dir / "metadata.json").write_text("{not json")
+        memory = ProjectMemory(index_path=tmp_path / "index.json",
+                               transcript_dir=tmp_path / "transcript")
+
+        session = memory.find_all_sessions()[0]
+
+        assert session["has_metadata"] is True
+        assert "metadata" not in session
+
+
+class TestIndexModel:
+    """Tests for the in-memory index model."""
+
+    def test_add_session_writes_through(self, sample_index):
+        """New projects, days and sessions land in the index dict and the counters."""
+        model = IndexModel(sample_index)
+
+        assert model.add_session("AutoBlog", "2026-01-13", "session_002") == (False, False)
+        assert model.add_session("AutoBlog", "2026-01-15", "s9") == (False, True)
+        assert model.add_session("NewProj", "2026-01-15", "s10") == (True, True)
+
+        autoblog = sample_index["projects"]["AutoBlog"]
+        assert autoblog["daily_logs"]["2026-01-15"]["sessions"] == ["s9"]
+        assert autoblog["total_sessions"] == 4
+        assert autoblog["last_touched"] == "2026-01-15"
+        assert sample_index["projects"]["NewProj"]["first_seen"] == "2026-01-15"
+        assert model.total_sessions == 10
+
+    def test_recent_dates_use_sorted_order(self, sample_index):
+        """Recent days come back in date order, limited and cut at `before`."""
+        model = IndexModel(sample_index)
+        timeline = model.project("AutoBlog")
+        for date in ["2026-01-20", "2026-01-05", "2026-01-16", "2026-01-14"]:
+            timeline.add_session(date, f"s-{date}")
+
+        assert timeline.dates == sorted(timeline.dates)
+        assert timeline.recent_dates(count=2) == ["2026-01-16", "2026-01-20"]
+        assert timeline.recent_dates(before="2026-01-14", count=5) == [
+            "2026-01-05", "2026-01-12", "2026-01-13"
+        ]
+        assert list(timeline.recent_logs(before="2026-01-13")) == ["2026-01-05", "2026-01-12"]
+
+    def test_direct_dict_edits_are_picked_up(self, sample_index):
+        """Days and sessions added to the dict directly still count as present."""
+        model = IndexModel(sample_index)
+        timeline = model.project("AutoBlog")
+        timeline.dates
+        logs = sample_index["projects"]["AutoBlog"]["daily_logs"]
+        logs["2026-01-14"] = {"sessions": ["x"], "summary": "", "key_topics": []}
+        logs["2026-01-13"]["sessions"].append("y")
+
+        assert timeline.dates[-1] == "2026-01-14"
+        assert model.add_session("AutoBlog", "2026-01-13", "y") == (False, False)
+
+    def test_memory_model_follows_reloads(self, sample_index_file):
+        """Replacing the index (e.g. a reload under the lock) rebuilds the model."""
+        memory = ProjectMemory(index_path=sample_index_file)
+        assert memory.get_stats()["total_sessions"] == 8
+
+        memory.index = {"last_updated": None, "projects": {}}
+
+        assert memory.get_stats()["total_sessions"] == 0
+
+
 class TestStats:
     """Tests for statistics retrieval."""
 
@@ -257,3 +705,90 @@ class TestStats:
 
         assert "AutoBlog" in projects
         assert "PenguinCAM" in projects
+
+
+class TestTranscriptArchive:
+    """Tests for reading sessions straight from transcript bundles."""
+
+    def _make_tar(self, source_dir, archive_path, arcname="transcript"):
+        import tarfile
+        with tarfile.open(archive_path, "w") as tar:
+            tar.add(source_dir, arcname=arcname)
+        return archive_path
+
+    def test_find_sessions_in_tar(self, sample_transcripts_dir, tmp_path):
+        """Sessions in a .tar bundle are discovered without extraction."""
+        archive = self._make_tar(sample_transcripts_dir, tmp_path / "backup.tar")
+        memory = ProjectMemory(
+            index_path=tmp_path / "data" / "project_index.json",
+            transcript_dir=archive
+        )
+
+        sessions = memory.find_all_sessions()
+
+        assert len(sessions) == 3
+        assert {s["project"] for s in sessions} == {"AutoBlog", "PenguinCAM"}
+        assert all(s["has_metadata"] for s in sessions)
+        assert sessions[0]["metadata"]["session_id"] == sessions[0]["session_id"]
+
+    def test_find_sessions_in_tar_of_dot(self, sample_transcripts_dir, tmp_path):
+        """A bundle made with `tar -C dir -cf backup.tar .` ("./" member names) is read."""
+        archive = self._make_tar(sample_transcripts_dir, tmp_path / "backup.tar", arcname=".")
+        memory = ProjectMemory(
+            index_path=tmp_path / "data" / "project_index.json",
+            transcript_dir=archive
+        )
+
+        sessions = memory.find_all_sessions()
+
+        assert len(sessions) == 3
+        assert all(s["archive_member"].startswith("./") for s in sessions)
+        assert all(s["has_metadata"] for s in sessions)
+        assert "Claude Code Session" in memory.get_session_content(sessions[0])
+
+    def test_read_content_from_tar(self, sample_transcripts_dir, tmp_path):
+        """Session content is streamed from the bundle."""
+        archive = self._make_tar(sample_transcripts_dir, tmp_path / "backup.tar")
+        memory = ProjectMemory(
+            index_path=tmp_path / "data" / "project_index.json",
+            transcript_dir=archive
+        )
+
+        session = memory.find_all_sessions()[0]
+        content = memory.get_session_content(session)
+
+        assert "Claude Code Session" in content
+        assert session["session_id"] in content
+
+    def test_zip_repo_structure(self, tmp_path):
+        """Repo-layout transcripts inside a .zip bundle are recognized."""
+        import zipfile
+        archive = tmp_path / "transcripts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("2026-01-14/AutoBlog_abc123.md", "# Session abc123")
+            zf.writestr("2026-01-14/PenguinCAM_def456.md", "# Session def456")
+
+        memory = ProjectMemory(
+            index_path=tmp_path / "data" / "project_index.json",
+            transcript_dir=archive
+        )
+
+        context = memory.get_context_for_blog("2026-01-14")
+
+        assert sorted(context["projects_worked_on"]) == ["AutoBlog", "PenguinCAM"]
+        assert any("abc123" in t["content"] for t in context["today"])
+
+    def test_update_index_from_tar_zst(self, sample_transcripts_dir, tmp_path):
+        """Index updates work from a zstd-compressed tar bundle."""
+        zstandard = pytest.importorskip("zstandard")
+        tar_path = self._make_tar(sample_transcripts_dir, tmp_path / "backup.tar")
+        archive = tmp_path / "backup.tar.zst"
+        archive.write_bytes(zstandard.ZstdCompressor().compress(tar_path.read_bytes()))
+
+        memory = ProjectMemory(
+            index_path=tmp_path / "data" / "project_index.json",
+            transcript_dir=archive
+        )
+        stats = memory.update_index(use_claude_for_summaries=False)
+
+        assert stats["new_sessions"] == 3
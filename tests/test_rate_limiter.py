@@ -0,0 +1,84 @@
+"""
+Tests for the shared LLM rate limiter.
+"""
+
+import threading
+
+import pytest
+
+from rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """Manually advanced clock; sleeping advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_up_to_capacity(self):
+        """Allows `capacity` immediate acquisitions, then refuses."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=3, clock=clock, sleep=clock.sleep)
+
+        assert all(bucket.try_acquire() for _ in range(3))
+        assert bucket.try_acquire() is False
+
+    def test_refills_over_time(self):
+        """Tokens come back at the configured rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=1, clock=clock, sleep=clock.sleep)
+
+        assert bucket.try_acquire() is True
+        assert bucket.try_acquire() is False
+
+        clock.now += 0.5
+        assert bucket.try_acquire() is True
+
+    def test_acquire_waits_for_token(self):
+        """Blocking acquire sleeps just long enough for the next token."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=0.5, capacity=1, clock=clock, sleep=clock.sleep)
+
+        assert bucket.acquire() == 0.0
+        waited = bucket.acquire()
+
+        assert waited == pytest.approx(2.0)
+        assert clock.now == pytest.approx(2.0)
+
+    def test_per_minute(self):
+        """per_minute converts calls per minute to a per-second rate."""
+        bucket = TokenBucket.per_minute(30)
+
+        assert bucket.rate == pytest.approx(0.5)
+        assert bucket.capacity == 1.0
+
+    def test_rejects_invalid_rate(self):
+        """Rate must be positive."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_thread_safe(self):
+        """Concurrent callers never take more tokens than exist."""
+        bucket = TokenBucket(rate=0.001, capacity=5)
+        taken = []
+
+        def worker():
+            taken.append(bucket.try_acquire())
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert taken.count(True) == 5
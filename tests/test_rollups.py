@@ -0,0 +1,228 @@
+"""
+Tests for weekly and monthly project rollups.
+"""
+
+import json
+from datetime import date, timedelta
+
+from generate_post import BlogGenerator
+from project_memory import ProjectMemory
+from rollups import (fallback_rollup, history_rollups, month_end, month_of_week,
+                     update_rollups, week_of)
+
+
+def project_with_days(start: str, days: int) -> dict:
+    """A project entry with one summarized session per day."""
+    first = date.fromisoformat(start)
+    logs = {}
+    for offset in range(days):
+        day = (first + timedelta(days=offset)).isoformat()
+        logs[day] = {"sessions": [f"s-{day}"], "summary": f"Work on {day}.",
+                     "key_topics": ["python", f"topic-{offset % 3}"]}
+    return {"first_seen": start, "last_touched": day, "total_sessions": days,
+            "summary": "", "daily_logs": logs}
+
+
+class RecordingSummarizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, level, period, children):
+        self.calls.append((level, period, [label for label, _, _ in children]))
+        text = " | ".join(summary for _, summary, _ in children)
+        return {"summary": f"{level} {period}: {text}", "key_topics": ["rolled"]}
+
+
+class TestPeriods:
+    """Tests for the ISO week and month helpers."""
+
+    def test_week_straddling_months_belongs_to_its_thursday(self):
+        # Mon 2025-12-29 .. Sun 2026-01-04; Thursday is 2026-01-01
+        assert week_of("2025-12-31") == "2026-W01"
+        assert month_of_week("2026-W01") == "2026-01"
+        # Mon 2026-01-26 .. Sun 2026-02-01; Thursday is 2026-01-29
+        assert month_of_week(week_of("2026-02-01")) == "2026-01"
+
+    def test_month_ends_with_its_last_week(self):
+        assert month_end("2026-01") == date(2026, 2, 1)
+        assert month_end("2025-12") == date(2025, 12, 28)
+
+
+class TestUpdateRollups:
+    """Tests for building rollups incrementally."""
+
+    def test_only_closed_periods_are_rolled_up(self):
+        """Weeks roll up once they end; the month once its last week ends."""
+        project = project_with_days("2026-01-05", 30)  # Mon Jan 5 .. Tue Feb 3
+        summarize = RecordingSummarizer()
+
+        built = update_rollups(project, "2026-02-01", summarize)
+
+        assert sorted(project["rollups"]) == ["2026-W02", "2026-W03", "2026-W04"]
+        assert built == 3
+        assert summarize.calls[-1] == ("week", "2026-W02", [
+            "2026-01-05", "2026-01-06", "2026-01-07", "2026-01-08",
+            "2026-01-09", "2026-01-10", "2026-01-11"
+        ])
+
+        update_rollups(project, "2026-02-02", summarize)
+
+        month = project["rollups"]["2026-01"]
+        assert month["level"] == "month"
+        assert month["summary"].startswith("month 2026-01: week 2026-W02: Work on 2026-01-05.")
+        assert summarize.calls[-1] == ("month", "2026-01",
+                                       ["2026-W02", "2026-W03", "2026-W04", "2026-W05"])
+        assert month["sessions"] == 28
+
+    def test_unchanged_periods_are_not_rebuilt(self):
+        """A second update with nothing new makes no summary calls."""
+        project = project_with_days("2026-01-05", 28)
+        update_rollups(project, "2026-03-01", RecordingSummarizer())
+        summarize = RecordingSummarizer()
+
+        assert update_rollups(project, "2026-03-01", summarize) == 0
+        assert summarize.calls == []
+
+    def test_late_change_rebuilds_week_and_month(self):
+        """A summary filled in later re-rolls its week and then its month."""
+        project = project_with_days("2026-01-05", 28)
+        update_rollups(project, "2026-03-01", RecordingSummarizer())
+        project["daily_logs"]["2026-01-14"]["summary"] = "Rewrote the parser."
+        summarize = RecordingSummarizer()
+
+        update_rollups(project, "2026-03-01", summarize)
+
+        assert [(level, period) for level, period, _ in summarize.calls] == [
+            ("week", "2026-W03"), ("month", "2026-01")
+        ]
+
+    def test_fallback_without_summarizer(self):
+        """Without the LLM, child summaries are run together and topics counted."""
+        project = project_with_days("2026-01-05", 7)
+
+        update_rollups(project, "2026-01-20")
+
+        week = project["rollups"]["2026-W02"]
+        assert week["summary"].startswith("Work on 2026-01-05. Work on 2026-01-06.")
+        assert week["key_topics"][0] == "python"
+
+    def test_fallback_is_rebuilt_with_summarizer(self):
+        """Rollups built without the LLM are rewritten once it is available."""
+        project = project_with_days("2026-01-05", 14)
+        update_rollups(project, "2026-01-20")
+        assert project["rollups"]["2026-W02"]["summary_source"] == "fallback"
+        summarize = RecordingSummarizer()
+
+        assert update_rollups(project, "2026-01-20", summarize) == 2
+
+        assert [period for _, period, _ in summarize.calls] == ["2026-W03", "2026-W02"]
+        assert "summary_source" not in project["rollups"]["2026-W02"]
+        assert update_rollups(project, "2026-01-20", RecordingSummarizer()) == 0
+
+    def test_failed_summary_keeps_fallback_for_later(self):
+        """A rollup the summarizer can't write stays a fallback, retried next time."""
+        project = project_with_days("2026-01-05", 7)
+
+        assert update_rollups(project, "2026-01-20", lambda *args: None) == 1
+        assert project["rollups"]["2026-W02"]["summary_source"] == "fallback"
+        assert update_rollups(project, "2026-01-20", lambda *args: None) == 0
+
+        update_rollups(project, "2026-01-20", RecordingSummarizer())
+        assert project["rollups"]["2026-W02"]["summary"].startswith("week 2026-W02:")
+
+    def test_llm_calls_are_capped_newest_first(self):
+        """Beyond max_calls, rollups fall back and are upgraded by later updates."""
+        project = project_with_days("2026-01-05", 35)  # five whole weeks
+        summarize = RecordingSummarizer()
+
+        assert update_rollups(project, "2026-03-01", summarize, max_calls=2) == 6
+
+        assert [period for _, period, _ in summarize.calls] == ["2026-W06", "2026-W05"]
+        fallback = sorted(k for k, r in project["rollups"].items() if r.get("summary_source"))
+        assert fallback == ["2026-01", "2026-W02", "2026-W03", "2026-W04"]
+
+        for _ in range(3):
+            update_rollups(project, "2026-03-01", summarize, max_calls=2)
+
+        assert not any(r.get("summary_source") for r in project["rollups"].values())
+
+    def test_fallback_summary_is_bounded(self):
+        children = [(str(i), "word " * 100, []) for i in range(10)]
+
+        assert len(fallback_rollup(children)["summary"]) <= 410
+
+
+class TestHistory:
+    """Tests for choosing rollups for the prompt."""
+
+    def test_history_is_capped_and_does_not_overlap(self):
+        """Recent weeks, then only months that ended before those weeks."""
+        project = project_with_days("2024-01-01", 800)
+        update_rollups(project, "2026-03-20")
+
+        weekly, monthly = history_rollups(project, before="2026-03-12", weeks=4, months=12)
+
+        assert list(weekly) == ["2026-W07", "2026-W08", "2026-W09", "2026-W10"]
+        assert len(monthly) == 12
+        assert list(monthly)[-1] == "2026-01"
+
+    def test_prompt_includes_rollups(self, tmp_path):
+        """The draft prompt's history shows monthly and weekly rollups."""
+        history = [{"project": "AutoBlog", "first_worked": "2024-01-01", "total_sessions": 9,
+                    "summary": "s", "recent_sessions": {},
+                    "weekly": {"2026-W09": {"summary": "Shipped locking."}},
+                    "monthly": {"2026-01": {"summary": "Built the journal."}}}]
+
+        text = BlogGenerator(posts_dir=tmp_path)._format_history(history)
+
+        assert "Earlier months:\n  - 2026-01: Built the journal." in text
+        assert "Recent weeks:\n  - 2026-W09: Shipped locking." in text
+
+
+class TestMemoryRollups:
+    """Tests for rollups kept in the project index."""
+
+    def test_context_history_carries_rollups(self, sample_index_file):
+        memory = ProjectMemory(index_path=sample_index_file)
+        memory.index["projects"]["AutoBlog"] = project_with_days("2025-12-01", 60)
+        memory.update_rollups(use_claude=False, today="2026-02-10")
+        session = {"project": "AutoBlog", "date": "2026-02-10", "session_id": "today",
+                   "conversation_path": str(sample_index_file.parent / "missing.md")}
+
+        context = memory.get_context_for_blog("2026-02-10", sessions=[session])
+
+        history = context["history"][0]
+        assert list(history["monthly"]) == ["2025-12"]
+        assert list(history["weekly"]) == ["2026-W02", "2026-W03", "2026-W04", "2026-W05"]
+        assert len(history["recent_sessions"]) == 5
+
+    def test_rollups_are_journaled_one_by_one(self, sample_index_file):
+        """Adding a rollup journals that rollup, not the whole project."""
+        memory = ProjectMemory(index_path=sample_index_file)
+        memory.index["projects"]["AutoBlog"] = project_with_days("2026-01-05", 21)
+        memory.update_rollups(use_claude=False, today="2026-01-20")
+        memory.compact_index()
+
+        memory.update_rollups(use_claude=False, today="2026-01-26")
+        memory._save_index()
+
+        journal = sample_index_file.with_name("project_index.json.journal")
+        changes = json.loads(journal.read_text())["changes"]
+        assert [c["set"] for c in changes] == [["projects", "AutoBlog", "rollups", "2026-W04"]]
+        reloaded = ProjectMemory(index_path=sample_index_file).index
+        assert set(reloaded["projects"]["AutoBlog"]["rollups"]) == {"2026-W02", "2026-W03", "2026-W04"}
+
+    def test_llm_calls_are_capped_across_projects(self, sample_index_file, monkeypatch):
+        """One update sends at most ROLLUP_LLM_CALLS rollups to the LLM in total."""
+        monkeypatch.setattr("project_memory.ROLLUP_LLM_CALLS", 3)
+        memory = ProjectMemory(index_path=sample_index_file)
+        memory.index["projects"]["AutoBlog"] = project_with_days("2026-01-05", 28)
+        memory.index["projects"]["Webapp"] = project_with_days("2026-01-05", 28)
+        calls = []
+        monkeypatch.setattr(memory, "_generate_rollup", lambda project, level, period, children:
+                            calls.append(period) or {"summary": "LLM", "key_topics": []})
+
+        built = memory.update_rollups(today="2026-03-01")
+
+        assert len(calls) == 3
+        assert built >= 10
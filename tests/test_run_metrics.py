@@ -0,0 +1,119 @@
+"""
+Tests for run telemetry and the run-history file.
+"""
+
+import json
+
+import pytest
+
+from run_metrics import LLMCall, RunHistory, RunMetrics, percentile
+
+
+class TestPercentile:
+    """Tests for percentile()."""
+
+    def test_empty(self):
+        """No values gives None."""
+        assert percentile([], 50) is None
+
+    def test_interpolates(self):
+        """Percentiles interpolate between neighbouring values."""
+        values = [4.0, 1.0, 3.0, 2.0]
+
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4.0
+
+
+class TestRunMetrics:
+    """Tests for RunMetrics."""
+
+    def test_stage_timing_accumulates(self):
+        """Repeated stages add up and count each occurrence."""
+        metrics = RunMetrics("backfill")
+
+        with metrics.stage("generate"):
+            pass
+        with metrics.stage("generate"):
+            pass
+
+        record = metrics.finish(True)
+        assert record["stages"]["generate"]["count"] == 2
+        assert record["stages"]["generate"]["wall"] >= 0
+
+    def test_llm_totals(self):
+        """LLM calls are totalled, with retries counted past the first attempt."""
+        metrics = RunMetrics("run", date="2026-01-14")
+        metrics.record_llm_call(LLMCall("draft", prompt_chars=100, response_chars=40,
+                                        backend="cli", attempts=1, ok=True))
+        metrics.record_llm_call(LLMCall("review", prompt_chars=50, response_chars=0,
+                                        backend="api", attempts=2))
+
+        record = metrics.finish(True)
+
+        assert record["date"] == "2026-01-14"
+        assert record["llm"]["total_calls"] == 2
+        assert record["llm"]["failed_calls"] == 1
+        assert record["llm"]["retries"] == 1
+        assert record["llm"]["prompt_chars"] == 150
+        assert record["llm"]["response_chars"] == 40
+
+    def test_cache_hit_rate(self):
+        """Cached stages count as hits."""
+        metrics = RunMetrics("run")
+        metrics.add_stage("draft", 0.0, 0.0, cached=True)
+        metrics.add_stage("save", 0.1, 0.05)
+
+        record = metrics.finish(True)
+
+        assert record["cache"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_record_is_json_serializable(self):
+        """Records can be written to the history file."""
+        metrics = RunMetrics("run")
+        metrics.count("push_attempts", 2)
+
+        json.dumps(metrics.finish(False))
+
+
+class TestRunHistory:
+    """Tests for RunHistory."""
+
+    def _record(self, wall, draft_wall, success=True, cached=False):
+        return {
+            "command": "run", "success": success, "wall": wall,
+            "stages": {"draft": {"wall": draft_wall, "cpu": 0.0, "count": 1, "cached": cached}},
+            "llm": {"calls": [{"label": "draft", "wall": draft_wall}]},
+        }
+
+    def test_append_and_load(self, tmp_path):
+        """Records round-trip and malformed lines are skipped."""
+        history = RunHistory(tmp_path / "data" / "history.jsonl")
+        history.append(self._record(1.0, 0.5))
+        with open(history.path, 'a') as f:
+            f.write("not json\n")
+        history.append(self._record(2.0, 1.0))
+
+        records = history.load()
+
+        assert [r["wall"] for r in records] == [1.0, 2.0]
+        assert [r["wall"] for r in history.load(limit=1)] == [2.0]
+
+    def test_load_missing_file(self, tmp_path):
+        """A missing history file is empty."""
+        assert RunHistory(tmp_path / "none.jsonl").load() == []
+
+    def test_latency_summary(self, tmp_path):
+        """p50/p95 come from successful runs only, excluding cached stages."""
+        history = RunHistory(tmp_path / "history.jsonl")
+        for wall in (1.0, 2.0, 3.0):
+            history.append(self._record(wall, wall / 2))
+        history.append(self._record(100.0, 50.0, success=False))
+        history.append(self._record(0.1, 0.0, cached=True))
+
+        summary = history.latency_summary("run")
+
+        assert summary["runs"] == 4
+        assert summary["stages"]["draft"]["count"] == 3
+        assert summary["stages"]["draft"]["p50"] == pytest.approx(1.0)
+        assert summary["total"]["p95"] < 100.0
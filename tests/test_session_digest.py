@@ -0,0 +1,126 @@
+"""
+Tests for map-reduce drafting from cached session digests.
+"""
+
+from content_handle import ContentHandle
+from generate_post import MAX_TRANSCRIPT_CHARS, BlogGenerator
+from llm_backend import FakeLLMBackend
+from run_metrics import RunMetrics
+from session_digest import DigestCache, content_hash
+
+
+def long_session(topic: str, turns: int = 400) -> str:
+    return "\n".join(f"**User**: step {i} of the {topic} work" for i in range(turns)) + "\n"
+
+
+def big_day(tmp_path, count: int = 3, turns: int = 400):
+    for i in range(count):
+        (tmp_path / f"session_{i}.md").write_text(long_session(f"topic-{i}", turns))
+    return day_context(tmp_path, count)
+
+
+def day_context(tmp_path, count: int):
+    return [{"project": "AutoBlog", "session_id": f"s{i}",
+             "content": ContentHandle.for_file(tmp_path / f"session_{i}.md")}
+            for i in range(count)]
+
+
+def make_generator(tmp_path, backend=None) -> BlogGenerator:
+    generator = BlogGenerator(posts_dir=tmp_path / "_posts", llm_backend=backend or FakeLLMBackend())
+    generator.map_reduce = True
+    generator.digest_cache = DigestCache(tmp_path / "digests")
+    generator.metrics = RunMetrics("test")
+    return generator
+
+
+class TestMapReduce:
+    """Tests for digesting large days before the draft."""
+
+    def test_large_day_is_digested_per_session(self, tmp_path):
+        generator = make_generator(tmp_path)
+
+        text = generator._format_transcripts(big_day(tmp_path))
+
+        assert generator.llm_backend.calls == 3
+        assert text.count("### Project: AutoBlog (session digest)") == 3
+        record = generator.metrics.finish(True)
+        assert [c["label"] for c in record["llm"]["calls"]] == ["digest"] * 3
+
+    def test_digest_sees_the_whole_session(self, tmp_path):
+        """The map prompt samples the session instead of cutting it off."""
+        prompts = []
+        backend = FakeLLMBackend()
+        complete = backend.complete
+        backend.complete = lambda prompt, *args, **kw: prompts.append(prompt) or complete(prompt, *args, **kw)
+        generator = make_generator(tmp_path, backend)
+
+        generator._format_transcripts(big_day(tmp_path, count=1, turns=1000))
+
+        assert "step 999 of the topic-0 work" in prompts[0]
+
+    def test_rerun_only_digests_changed_sessions(self, tmp_path):
+        make_generator(tmp_path)._format_transcripts(big_day(tmp_path))
+
+        (tmp_path / "session_1.md").write_text(long_session("changed"))
+        generator = make_generator(tmp_path)
+        generator._format_transcripts(day_context(tmp_path, 3))
+
+        assert generator.llm_backend.calls == 1
+
+    def test_failed_digest_falls_back_and_is_not_cached(self, tmp_path):
+        generator = make_generator(tmp_path, FakeLLMBackend(failure_rate=1.0))
+
+        text = generator._format_transcripts(big_day(tmp_path, count=1, turns=1000))
+
+        assert "[... transcript truncated ...]" in text
+        assert len(text) < MAX_TRANSCRIPT_CHARS + 200
+        assert not (tmp_path / "digests").exists()
+
+    def test_failed_digest_marks_only_cut_sessions(self, tmp_path):
+        """A fallback session that fits whole gets no truncation marker."""
+        generator = make_generator(tmp_path, FakeLLMBackend(failure_rate=1.0))
+        big_day(tmp_path, count=1, turns=1000)
+        (tmp_path / "session_1.md").write_text(long_session("short", turns=80))
+
+        text = generator._format_transcripts(day_context(tmp_path, 2))
+
+        assert text.count("[... transcript truncated ...]") == 1
+        assert text.endswith(long_session("short", turns=80))
+
+    def test_small_days_and_sessions_are_not_digested(self, tmp_path):
+        generator = make_generator(tmp_path)
+        small = [{"project": "AutoBlog", "content": "**User**: quick fix"}]
+
+        text = generator._format_transcripts(small)
+
+        assert text == "### Project: AutoBlog\n\n**User**: quick fix"
+        assert generator.llm_backend.calls == 0
+
+    def test_off_by_default(self, tmp_path):
+        generator = BlogGenerator(posts_dir=tmp_path / "_posts", llm_backend=FakeLLMBackend())
+
+        text = generator._format_transcripts(big_day(tmp_path))
+
+        assert generator.llm_backend.calls == 0
+        assert text.count("[... transcript truncated ...]") == 3
+
+
+class TestDigestCache:
+    """Tests for the content-hash digest cache."""
+
+    def test_key_follows_content(self, tmp_path):
+        cache = DigestCache(tmp_path)
+        first = cache.key("AutoBlog", content_hash(ContentHandle.for_text("a" * 3_000_000)))
+        same = cache.key("AutoBlog", content_hash(ContentHandle.for_text("a" * 3_000_000)))
+        other = cache.key("AutoBlog", content_hash(ContentHandle.for_text("a" * 2_999_999 + "b")))
+
+        assert first == same
+        assert first != other
+
+    def test_round_trip(self, tmp_path):
+        cache = DigestCache(tmp_path / "digests")
+        assert cache.get("k") is None
+
+        cache.put("k", "**Goal:** ship it")
+
+        assert DigestCache(tmp_path / "digests").get("k") == "**Goal:** ship it"
@@ -0,0 +1,72 @@
+"""
+Startup-time benchmarks for the CLI entry points.
+
+Quick commands (status, sync, submit) must not import the generator, the
+anthropic SDK or the archive readers. Each check runs in a fresh
+interpreter so module caching in the test process can't hide a regression.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+# Modules that only generation, publishing or bundle reading need
+HEAVY_MODULES = [
+    "anthropic", "generate_post", "git_publisher", "llm_backend", "pipeline",
+    "sanitize_transcripts", "transcript_archive", "tarfile", "zipfile",
+    "concurrent.futures",
+]
+
+# Generous ceiling on the median time to import daily_blog, in seconds.
+# Today it takes a few milliseconds on top of interpreter startup; this only
+# trips on a real regression such as an eager import of the anthropic SDK.
+IMPORT_BUDGET = 0.15
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r})\n{code}"],
+        capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+class TestStartup:
+    """Import-time checks for daily_blog.py."""
+
+    def test_import_does_not_load_heavy_modules(self):
+        """Importing daily_blog leaves the heavy modules unimported."""
+        loaded = run_python(
+            "import daily_blog\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        assert loaded == ""
+
+    def test_status_does_not_load_heavy_modules(self, tmp_path):
+        """get_status() only needs the index and the post catalog."""
+        loaded = run_python(
+            "from pathlib import Path\n"
+            "import daily_blog\n"
+            f"runner = daily_blog.DailyBlogRunner(repo_dir=Path({str(tmp_path)!r}))\n"
+            "runner.get_status()\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        assert loaded == ""
+
+    def test_import_time_budget(self):
+        """Importing daily_blog stays within IMPORT_BUDGET."""
+        timings = [
+            float(run_python(
+                "import time\n"
+                "start = time.perf_counter()\n"
+                "import daily_blog\n"
+                "print(time.perf_counter() - start)"
+            ))
+            for _ in range(3)
+        ]
+        median = sorted(timings)[1]
+        assert median < IMPORT_BUDGET, f"daily_blog import took {median:.3f}s"